@@ -0,0 +1,98 @@
+"""Esquema inicial: times e partidas
+
+Bancos criados anteriormente com ``Base.metadata.create_all`` já possuem
+estas tabelas; nesse caso marque a revisão com ``alembic stamp 0001``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "teams",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("external_id", sa.String(length=50), nullable=True),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("short_name", sa.String(length=10), nullable=True),
+        sa.Column("logo_url", sa.String(length=255), nullable=True),
+        sa.Column("league_id", sa.Integer(), nullable=True),
+        sa.Column("league_name", sa.String(length=100), nullable=True),
+        sa.Column("country", sa.String(length=50), nullable=True),
+        sa.Column("founded", sa.Integer(), nullable=True),
+        sa.Column("games_played", sa.Integer(), nullable=False),
+        sa.Column("wins", sa.Integer(), nullable=False),
+        sa.Column("draws", sa.Integer(), nullable=False),
+        sa.Column("losses", sa.Integer(), nullable=False),
+        sa.Column("goals_for", sa.Integer(), nullable=False),
+        sa.Column("goals_against", sa.Integer(), nullable=False),
+        sa.Column("avg_goals_scored", sa.Float(), nullable=False),
+        sa.Column("avg_goals_conceded", sa.Float(), nullable=False),
+        sa.Column("win_percentage", sa.Float(), nullable=False),
+        sa.Column("home_wins", sa.Integer(), nullable=False),
+        sa.Column("home_draws", sa.Integer(), nullable=False),
+        sa.Column("home_losses", sa.Integer(), nullable=False),
+        sa.Column("away_wins", sa.Integer(), nullable=False),
+        sa.Column("away_draws", sa.Integer(), nullable=False),
+        sa.Column("away_losses", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("external_id"),
+    )
+    op.create_index("ix_teams_id", "teams", ["id"])
+
+    op.create_table(
+        "matches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("external_id", sa.String(length=50), nullable=True),
+        sa.Column("home_team_id", sa.Integer(), nullable=False),
+        sa.Column("away_team_id", sa.Integer(), nullable=False),
+        sa.Column("league_id", sa.Integer(), nullable=True),
+        sa.Column("league_name", sa.String(length=100), nullable=True),
+        sa.Column("season", sa.String(length=10), nullable=True),
+        sa.Column("round", sa.String(length=50), nullable=True),
+        sa.Column("match_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("home_goals", sa.Integer(), nullable=True),
+        sa.Column("away_goals", sa.Integer(), nullable=True),
+        sa.Column("winner", sa.String(length=10), nullable=True),
+        sa.Column("total_goals", sa.Integer(), nullable=False),
+        sa.Column("both_teams_scored", sa.Boolean(), nullable=False),
+        sa.Column("home_odds", sa.Float(), nullable=True),
+        sa.Column("draw_odds", sa.Float(), nullable=True),
+        sa.Column("away_odds", sa.Float(), nullable=True),
+        sa.Column("over_2_5_odds", sa.Float(), nullable=True),
+        sa.Column("under_2_5_odds", sa.Float(), nullable=True),
+        sa.Column("btts_yes_odds", sa.Float(), nullable=True),
+        sa.Column("btts_no_odds", sa.Float(), nullable=True),
+        sa.Column("statistics", sa.JSON(), nullable=True),
+        sa.Column("prediction_confidence", sa.Float(), nullable=True),
+        sa.Column("predicted_result", sa.String(length=20), nullable=True),
+        sa.Column("analysis_notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["home_team_id"], ["teams.id"]),
+        sa.ForeignKeyConstraint(["away_team_id"], ["teams.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("external_id"),
+    )
+    op.create_index("ix_matches_id", "matches", ["id"])
+
+
+def downgrade():
+    op.drop_index("ix_matches_id", table_name="matches")
+    op.drop_table("matches")
+    op.drop_index("ix_teams_id", table_name="teams")
+    op.drop_table("teams")
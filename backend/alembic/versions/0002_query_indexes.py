@@ -0,0 +1,70 @@
+"""Índices para os padrões de consulta de partidas e times
+
+No PostgreSQL os índices são criados com CONCURRENTLY (sem bloquear
+escritas em tabelas grandes) e os filtros ILIKE '%x%' usam índices GIN
+com pg_trgm.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (nome, tabela, colunas, opções)
+BTREE_INDEXES = [
+    ("ix_matches_match_date_id", "matches", ["match_date", "id"], {}),
+    ("ix_matches_status_match_date", "matches", ["status", "match_date"], {}),
+    ("ix_matches_home_team_status_date", "matches", ["home_team_id", "status", "match_date"], {}),
+    ("ix_matches_away_team_status_date", "matches", ["away_team_id", "status", "match_date"], {}),
+    ("ix_matches_changed_at", "matches", [sa.text("coalesce(updated_at, created_at)")], {}),
+    ("ix_teams_active_name_id", "teams", ["name", "id"], {"postgresql_where": sa.text("is_active")}),
+]
+
+TRIGRAM_INDEXES = [
+    ("ix_matches_league_name_trgm", "matches", "league_name"),
+    ("ix_teams_country_trgm", "teams", "country"),
+    ("ix_teams_league_name_trgm", "teams", "league_name"),
+]
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if not _is_postgresql():
+        for name, table, columns, _ in BTREE_INDEXES:
+            op.create_index(name, table, columns)
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(name, table, [column])
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in BTREE_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **options)
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name, table, [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    concurrently = {"postgresql_concurrently": True} if _is_postgresql() else {}
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TRIGRAM_INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, **concurrently)
+        for name, table, _, _ in reversed(BTREE_INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, **concurrently)
@@ -0,0 +1,47 @@
+"""Tabela de trends materializados
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "trends",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("scope", sa.String(length=10), nullable=False),
+        sa.Column("scope_key", sa.String(length=120), nullable=False),
+        sa.Column("league_name", sa.String(length=100), nullable=True),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("trend_type", sa.String(length=30), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=False),
+        sa.Column("matches_count", sa.Integer(), nullable=False),
+        sa.Column("successes", sa.Integer(), nullable=False),
+        sa.Column("success_rate", sa.Float(), nullable=False),
+        sa.Column("confidence", sa.Float(), nullable=False),
+        sa.Column("streak", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("scope_key", "trend_type", name="uq_trends_scope_key_type"),
+    )
+    op.create_index("ix_trends_id", "trends", ["id"])
+    op.create_index("ix_trends_scope_league_confidence", "trends", ["scope", "league_name", "confidence"])
+    op.create_index("ix_trends_team_id", "trends", ["team_id"])
+
+
+def downgrade():
+    op.drop_index("ix_trends_team_id", table_name="trends")
+    op.drop_index("ix_trends_scope_league_confidence", table_name="trends")
+    op.drop_index("ix_trends_id", table_name="trends")
+    op.drop_table("trends")
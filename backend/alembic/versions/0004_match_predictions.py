@@ -0,0 +1,41 @@
+"""Previsões persistidas nas partidas
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("matches", sa.Column("prediction", sa.JSON(), nullable=True))
+    op.add_column("matches", sa.Column("predicted_at", sa.DateTime(timezone=True), nullable=True))
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_matches_status_league_date", "matches", ["status", "league_name", "match_date"],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+    else:
+        op.create_index("ix_matches_status_league_date", "matches", ["status", "league_name", "match_date"])
+
+
+def downgrade():
+    op.drop_index("ix_matches_status_league_date", table_name="matches")
+    with op.batch_alter_table("matches") as batch_op:
+        batch_op.drop_column("predicted_at")
+        batch_op.drop_column("prediction")
+    if op.get_bind().dialect.name == "sqlite":
+        # O batch recria a tabela no SQLite e perde o índice de expressão da 0002
+        op.create_index(
+            "ix_matches_changed_at", "matches", [sa.text("coalesce(updated_at, created_at)")],
+            if_not_exists=True,
+        )
@@ -0,0 +1,39 @@
+"""Histórico de odds (apenas inserção)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "odds_snapshots",
+        sa.Column("match_id", sa.Integer(), nullable=False),
+        sa.Column("market", sa.String(length=20), nullable=False),
+        sa.Column("selection", sa.String(length=10), nullable=False),
+        sa.Column("bookmaker", sa.String(length=50), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["match_id"], ["matches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("match_id", "market", "selection", "bookmaker", "recorded_at"),
+    )
+    # Linhas chegam em ordem de tempo: no PostgreSQL um BRIN ocupa poucas
+    # páginas e permite limpar o histórico antigo por intervalo de datas
+    op.create_index(
+        "ix_odds_snapshots_recorded_at", "odds_snapshots", ["recorded_at"], postgresql_using="brin"
+    )
+
+
+def downgrade():
+    op.drop_index("ix_odds_snapshots_recorded_at", table_name="odds_snapshots")
+    op.drop_table("odds_snapshots")
@@ -1,121 +1,267 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
 from typing import List, Optional
 from app.core.database import get_db
-from app.models.match import Match
+from app.core.serialization import json_list_response, streaming_json_list
+from app.crud import match as crud_match
+from app.crud import team as crud_team
+from app.crud import team_form as crud_team_form
+from app.crud import trend as crud_trend
 from app.models.team import Team
-from app.schemas.analysis import AnalysisResponse, TrendResponse
+from app.models.trend import Trend
+from app.schemas.analysis import (
+    AnalysisResponse, BatchAnalysisRequest, TeamAnalysis, TeamFormSummary, TrendResponse, ValueBet
+)
+from app.services import match_analysis, match_store, prediction, team_form, value_bets
 
 router = APIRouter()
 
+# Times por requisição em /analysis/form
+MAX_FORM_TEAMS = 500
+
+# Partidas por requisição em /analysis/matches e por bloco enviado em streaming
+MAX_BATCH_MATCHES = 5000
+BATCH_CHUNK_SIZE = 200
+
+# Colunas dos times lidas na análise em lote
+TEAM_ANALYSIS_COLUMNS = list(TeamAnalysis.model_fields)
+
+def _team_analysis(team: Team) -> dict:
+    """Montar o bloco de estatísticas de um time para a análise"""
+    return {
+        "name": team.name,
+        "avg_goals_scored": team.avg_goals_scored,
+        "avg_goals_conceded": team.avg_goals_conceded,
+        "win_percentage": team.win_percentage,
+        "home_wins": team.home_wins,
+        "home_draws": team.home_draws,
+        "home_losses": team.home_losses,
+        "away_wins": team.away_wins,
+        "away_draws": team.away_draws,
+        "away_losses": team.away_losses
+    }
+
+def _trend_response(trend: Trend) -> dict:
+    """Converter um trend materializado para a resposta da API"""
+    return {
+        "type": trend.trend_type,
+        "description": trend.description,
+        "confidence": trend.confidence,
+        "matches_count": trend.matches_count,
+        "success_rate": trend.success_rate,
+        "league": trend.league_name,
+        "team_id": trend.team_id,
+        "streak": trend.streak
+    }
+
+async def _match_store(db: AsyncSession) -> match_store.MatchStore:
+    """Partidas finalizadas em memória (leitura incremental se desatualizado)"""
+    return await db.run_sync(match_store.get_match_store)
+
+async def _fit_strengths(db: AsyncSession) -> prediction.TeamStrengths:
+    """Estimar forças dos times a partir das partidas finalizadas"""
+    store = await _match_store(db)
+    return prediction.fit_team_strengths(*store.results())
+
 @router.get("/match/{match_id}", response_model=AnalysisResponse)
-async def analyze_match(match_id: int, db: Session = Depends(get_db)):
+async def analyze_match(match_id: int, db: AsyncSession = Depends(get_db)):
     """Analisar uma partida específica"""
-    match = db.query(Match).filter(Match.id == match_id).first()
+    # Partida e times em uma única consulta
+    match = await crud_match.get_match_with_teams(db, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Partida não encontrada")
     
-    # Buscar estatísticas dos times
-    home_team = db.query(Team).filter(Team.id == match.home_team_id).first()
-    away_team = db.query(Team).filter(Team.id == match.away_team_id).first()
+    # Previsão gravada pela tarefa analyze_upcoming_matches; sem ela, calcular na hora
+    if match.prediction:
+        predictions = match.prediction
+    else:
+        strengths = await _fit_strengths(db)
+        batch = prediction.predict_fixtures(strengths, [match.home_team_id], [match.away_team_id])
+        predictions = prediction.prediction_at(batch, 0)
     
-    # Análise básica
     analysis = {
         "match_id": match_id,
-        "home_team": {
-            "name": home_team.name,
-            "avg_goals_scored": home_team.avg_goals_scored,
-            "avg_goals_conceded": home_team.avg_goals_conceded,
-            "win_percentage": home_team.win_percentage,
-            "home_wins": home_team.home_wins,
-            "home_draws": home_team.home_draws,
-            "home_losses": home_team.home_losses
-        },
-        "away_team": {
-            "name": away_team.name,
-            "avg_goals_scored": away_team.avg_goals_scored,
-            "avg_goals_conceded": away_team.avg_goals_conceded,
-            "win_percentage": away_team.win_percentage,
-            "away_wins": away_team.away_wins,
-            "away_draws": away_team.away_draws,
-            "away_losses": away_team.away_losses
-        },
-        "predictions": {
-            "total_goals_prediction": home_team.avg_goals_scored + away_team.avg_goals_scored,
-            "btts_probability": 0.5,  # Placeholder
-            "home_win_probability": 0.33,  # Placeholder
-            "draw_probability": 0.33,  # Placeholder
-            "away_win_probability": 0.33  # Placeholder
-        },
-        "trends": [
+        "home_team": _team_analysis(match.home_team),
+        "away_team": _team_analysis(match.away_team),
+        "predictions": predictions,
+        "trends": prediction.prediction_trends(predictions),
+        "predicted_at": match.predicted_at if match.prediction else None
+    }
+    
+    return analysis
+
+@router.post("/matches", response_model=List[AnalysisResponse])
+async def analyze_matches(request: BatchAnalysisRequest, db: AsyncSession = Depends(get_db)):
+    """Analisar várias partidas de uma vez (ex.: a lista de jogos de uma rodada)
+
+    Recebe ``match_ids`` ou um filtro (janela padrão: próximos
+    ANALYSIS_WINDOW_DAYS dias). Partidas e times são lidos em duas consultas
+    e as previsões que faltam são calculadas em um único lote; listas grandes
+    são enviadas em streaming. IDs inexistentes são ignorados.
+    """
+    if request.match_ids is not None:
+        if len(request.match_ids) > MAX_BATCH_MATCHES:
+            raise HTTPException(status_code=400, detail=f"Máximo de {MAX_BATCH_MATCHES} partidas por requisição")
+        rows = await crud_match.get_matches_for_analysis(db, match_ids=request.match_ids)
+        # Mesma ordem dos IDs recebidos
+        by_id = {row.id: row for row in rows}
+        rows = [by_id[match_id] for match_id in dict.fromkeys(request.match_ids) if match_id in by_id]
+    else:
+        date_from, date_to = match_analysis.analysis_window(request.date_from, request.date_to)
+        rows = await crud_match.get_matches_for_analysis(
+            db, date_from=date_from, date_to=date_to, league=request.league,
+            status=request.status, limit=request.limit
+        )
+    if not rows:
+        return json_list_response(AnalysisResponse, [])
+    
+    teams = await crud_team.get_teams_by_ids(
+        db, {team_id for row in rows for team_id in (row.home_team_id, row.away_team_id)}, TEAM_ANALYSIS_COLUMNS
+    )
+    
+    # Previsões gravadas; as que faltam são calculadas em um único lote
+    predictions = [row.prediction for row in rows]
+    missing = [i for i, stored in enumerate(predictions) if not stored]
+    if missing:
+        strengths = await _fit_strengths(db)
+        batch = prediction.predict_fixtures(
+            strengths, [rows[i].home_team_id for i in missing], [rows[i].away_team_id for i in missing]
+        )
+        for position, i in enumerate(missing):
+            predictions[i] = prediction.prediction_at(batch, position)
+    
+    def build(items):
+        # Os times vão como linhas: o TypeAdapter lê os atributos direto
+        return [
             {
-                "type": "over_2_5",
-                "confidence": 0.6,
-                "description": "Tendência para mais de 2.5 gols"
+                "match_id": row.id,
+                "home_team": teams[row.home_team_id],
+                "away_team": teams[row.away_team_id],
+                "predictions": predictions[i],
+                "trends": prediction.prediction_trends(predictions[i]),
+                "predicted_at": row.predicted_at if row.prediction else None
             }
+            for i, row in items
         ]
-    }
     
-    return analysis
+    return streaming_json_list(AnalysisResponse, list(enumerate(rows)), build, BATCH_CHUNK_SIZE)
 
 @router.get("/trends", response_model=List[TrendResponse])
 async def get_trends(
     league: Optional[str] = Query(None, description="Filtrar por liga"),
     trend_type: Optional[str] = Query(None, description="Tipo de trend"),
-    db: Session = Depends(get_db)
+    team_id: Optional[int] = Query(None, description="Trends de um time"),
+    limit: int = Query(50, ge=1, le=200, description="Número máximo de trends"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Buscar trends gerais, por liga ou por time
+
+    Os trends são pré-calculados pela tarefa ``refresh_trends``; aqui
+    apenas lemos a tabela materializada.
+    """
+    trends = await crud_trend.get_trends(db, league=league, trend_type=trend_type, team_id=team_id, limit=limit)
+    return json_list_response(TrendResponse, [_trend_response(trend) for trend in trends])
+
+@router.get("/value-bets", response_model=List[ValueBet])
+async def get_value_bets(
+    league: Optional[str] = Query(None, description="Filtrar por liga"),
+    date_from: Optional[datetime] = Query(None, description="Início da janela (padrão: agora)"),
+    date_to: Optional[datetime] = Query(None, description="Fim da janela (padrão: ANALYSIS_WINDOW_DAYS)"),
+    market: Optional[str] = Query(None, description="Mercado: 1x2, over_under_2_5 ou btts"),
+    min_edge: float = Query(0.02, description="Valor esperado mínimo por unidade apostada"),
+    margin_method: str = Query("proportional", description="Remoção da margem: proportional ou power"),
+    kelly_fraction: float = Query(0.25, gt=0, le=1, description="Fração do critério de Kelly"),
+    max_stake: float = Query(0.05, gt=0, le=1, description="Fração máxima da banca por aposta"),
+    limit: int = Query(50, ge=1, le=500, description="Número máximo de apostas"),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Buscar trends gerais"""
-    # Implementação básica de trends
-    trends = [
-        {
-            "type": "over_2_5",
-            "description": "Jogos com mais de 2.5 gols",
-            "confidence": 0.75,
-            "matches_count": 15,
-            "success_rate": 0.8
-        },
-        {
-            "type": "btts",
-            "description": "Ambos os times marcam",
-            "confidence": 0.65,
-            "matches_count": 12,
-            "success_rate": 0.7
-        }
-    ]
-    
-    return trends
+    """Buscar value bets nas partidas agendadas
+
+    Remove a margem da casa das odds gravadas e compara com as
+    probabilidades do modelo (previsões gravadas ou calculadas em lote),
+    avaliando todas as partidas e mercados de uma vez.
+    """
+    if market is not None and market not in value_bets.MARKETS:
+        raise HTTPException(status_code=400, detail="Mercado inválido")
+    if margin_method not in value_bets.MARGIN_METHODS:
+        raise HTTPException(status_code=400, detail="Método de remoção de margem inválido")
+    
+    date_from, date_to = match_analysis.analysis_window(date_from, date_to)
+    fixtures = await crud_match.get_upcoming_with_odds(
+        db, date_from, date_to, league=league, odds_columns=value_bets.ODDS_COLUMNS
+    )
+    if not fixtures:
+        return json_list_response(ValueBet, [])
+    
+    # Previsões gravadas; as que faltam são calculadas em um único lote
+    predictions = [fixture.prediction for fixture in fixtures]
+    missing = [i for i, stored in enumerate(predictions) if not stored]
+    if missing:
+        strengths = await _fit_strengths(db)
+        batch = prediction.predict_fixtures(
+            strengths,
+            [fixtures[i].home_team_id for i in missing],
+            [fixtures[i].away_team_id for i in missing]
+        )
+        for position, i in enumerate(missing):
+            predictions[i] = prediction.prediction_at(batch, position)
+    
+    odds = [[getattr(fixture, column) for column in value_bets.ODDS_COLUMNS] for fixture in fixtures]
+    bets = value_bets.ranked_value_bets(
+        odds,
+        value_bets.model_probabilities(predictions),
+        min_edge=min_edge,
+        markets=[market] if market else None,
+        limit=limit,
+        margin_method=margin_method,
+        kelly_fraction=kelly_fraction,
+        max_stake=max_stake
+    )
+    
+    team_ids = {team_id for bet in bets for team_id in (
+        fixtures[bet["row"]].home_team_id, fixtures[bet["row"]].away_team_id
+    )}
+    names = await crud_team.get_team_names(db, team_ids)
+    
+    response = []
+    for bet in bets:
+        fixture = fixtures[bet.pop("row")]
+        response.append({
+            "match_id": fixture.id,
+            "match_date": fixture.match_date,
+            "league_name": fixture.league_name,
+            "home_team": names.get(fixture.home_team_id),
+            "away_team": names.get(fixture.away_team_id),
+            **bet
+        })
+    return json_list_response(ValueBet, response)
 
 @router.get("/team/{team_id}/form")
-async def get_team_form(team_id: int, db: Session = Depends(get_db)):
+async def get_team_form(team_id: int, db: AsyncSession = Depends(get_db)):
     """Buscar forma recente de um time"""
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await crud_team.get_team(db, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Time não encontrado")
     
-    # Buscar últimos jogos
-    recent_matches = db.query(Match).filter(
-        (Match.home_team_id == team_id) | (Match.away_team_id == team_id),
-        Match.status == "finished"
-    ).order_by(Match.match_date.desc()).limit(5).all()
+    # Últimos jogos a partir do armazenamento colunar; só os nomes dos adversários vêm do banco
+    store = await _match_store(db)
+    recent = store.team_results(team_id, limit=5)
+    opponents = await crud_team.get_team_names(db, recent["opponent_id"].tolist())
     
     form = []
-    for match in recent_matches:
-        if match.home_team_id == team_id:
-            result = "W" if match.winner == "home" else "D" if match.winner == "draw" else "L"
-            goals_for = match.home_goals
-            goals_against = match.away_goals
-        else:
-            result = "W" if match.winner == "away" else "D" if match.winner == "draw" else "L"
-            goals_for = match.away_goals
-            goals_against = match.home_goals
+    for i in range(recent["match_id"].size):
+        goals_for = int(recent["goals_for"][i])
+        goals_against = int(recent["goals_against"][i])
+        result = "W" if goals_for > goals_against else "D" if goals_for == goals_against else "L"
         
         form.append({
-            "match_id": match.id,
-            "date": match.match_date,
+            "match_id": int(recent["match_id"][i]),
+            "date": recent["match_date"][i].item().replace(tzinfo=timezone.utc),
             "result": result,
             "goals_for": goals_for,
             "goals_against": goals_against,
-            "opponent": match.away_team.name if match.home_team_id == team_id else match.home_team.name
+            "opponent": opponents.get(int(recent["opponent_id"][i]))
         })
     
     return {
@@ -123,4 +269,58 @@ async def get_team_form(team_id: int, db: Session = Depends(get_db)):
         "team_name": team.name,
         "recent_form": form,
         "form_string": "".join([f["result"] for f in form])
-    } 
\ No newline at end of file
+    } 
+
+@router.get("/form", response_model=List[TeamFormSummary])
+async def get_teams_form(
+    team_ids: List[int] = Query(..., description="IDs dos times (repetível)"),
+    window: Optional[int] = Query(None, description="Janela: 5, 10 ou 20 partidas"),
+    venue: Optional[str] = Query(None, description="Mando: all, home ou away"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Buscar a forma de vários times de uma vez (ex.: todos os times de uma rodada)
+
+    Lê a forma pré-calculada (tabela ``team_form``), atualizada quando as
+    partidas dos times são finalizadas.
+    """
+    if len(team_ids) > MAX_FORM_TEAMS:
+        raise HTTPException(status_code=400, detail=f"Máximo de {MAX_FORM_TEAMS} times por requisição")
+    if window is not None and window not in team_form.FORM_WINDOWS:
+        raise HTTPException(status_code=400, detail="Janela inválida")
+    if venue is not None and venue not in team_form.VENUES:
+        raise HTTPException(status_code=400, detail="Mando inválido")
+    
+    names = await crud_team.get_team_names(db, team_ids)
+    rows_by_team = {}
+    for row in await crud_team_form.get_team_forms(db, names):
+        rows_by_team.setdefault(row.team_id, []).append(row)
+    
+    response = []
+    for team_id in dict.fromkeys(team_ids):
+        if team_id not in names:
+            continue
+        rows = rows_by_team.get(team_id, [])
+        overall = next((row for row in rows if row.venue == "all"), None)
+        response.append({
+            "team_id": team_id,
+            "team_name": names[team_id],
+            "form_string": overall.form[:5] if overall else "",
+            "last_match_date": overall.last_match_date if overall else None,
+            "windows": [
+                {
+                    "venue": row.venue,
+                    "window": row.window_size,
+                    "matches": row.matches,
+                    "wins": row.wins,
+                    "draws": row.draws,
+                    "losses": row.losses,
+                    "goals_for": row.goals_for,
+                    "goals_against": row.goals_against,
+                    "points_per_game": row.points_per_game,
+                    "form": row.form
+                }
+                for row in rows
+                if (window is None or row.window_size == window) and (venue is None or row.venue == venue)
+            ]
+        })
+    return json_list_response(TeamFormSummary, response)
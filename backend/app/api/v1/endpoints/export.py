@@ -0,0 +1,119 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from typing import Optional
+from datetime import datetime
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.match import Match
+from app.models.team import Team
+from app.schemas.analysis import MatchPrediction
+from app.services import export
+
+router = APIRouter()
+
+# Campos da previsão exportados como colunas (formato de MatchPrediction)
+PREDICTION_FIELDS = [
+    (name, "str" if name == "most_likely_score" else "float") for name in MatchPrediction.model_fields
+]
+
+async def _batches(query):
+    """Lotes de linhas de um cursor no servidor
+
+    A sessão é aberta pelo próprio gerador: ela precisa viver enquanto a
+    resposta é enviada, depois que o endpoint já retornou.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            yield partition
+
+def _check_format(format: str):
+    if format not in export.FORMATS:
+        raise HTTPException(status_code=400, detail="Formato inválido (ndjson, csv ou parquet)")
+    if format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Exportação Parquet requer o pacote pyarrow")
+
+def _response(name: str, format: str, columns, batches) -> StreamingResponse:
+    media_type, extension = export.FORMATS[format]
+    return StreamingResponse(
+        export.encode(format, columns, batches),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'}
+    )
+
+def _match_filters(query, date_from, date_to, status, league, updated_since):
+    if date_from:
+        query = query.where(Match.match_date >= date_from)
+    if date_to:
+        query = query.where(Match.match_date <= date_to)
+    if status:
+        query = query.where(Match.status == status)
+    if league:
+        query = query.where(Match.league_name.ilike(f"%{league}%"))
+    if updated_since:
+        query = query.where(func.coalesce(Match.updated_at, Match.created_at) >= updated_since)
+    return query
+
+@router.get("/matches")
+async def export_matches(
+    format: str = Query("ndjson", description="Formato: ndjson, csv ou parquet"),
+    date_from: Optional[datetime] = Query(None, description="Data inicial"),
+    date_to: Optional[datetime] = Query(None, description="Data final"),
+    status: Optional[str] = Query(None, description="Status da partida"),
+    league: Optional[str] = Query(None, description="Filtrar por liga"),
+    updated_since: Optional[datetime] = Query(None, description="Apenas partidas alteradas desde (exportação incremental)")
+):
+    """Exportar partidas (todas as colunas) em streaming"""
+    _check_format(format)
+    query = select(*Match.__table__.columns).order_by(Match.id)
+    query = _match_filters(query, date_from, date_to, status, league, updated_since)
+    return _response("matches", format, export.query_columns(query), _batches(query))
+
+@router.get("/teams")
+async def export_teams(
+    format: str = Query("ndjson", description="Formato: ndjson, csv ou parquet"),
+    league: Optional[str] = Query(None, description="Filtrar por liga"),
+    country: Optional[str] = Query(None, description="Filtrar por país")
+):
+    """Exportar times com as estatísticas em streaming"""
+    _check_format(format)
+    query = select(*Team.__table__.columns).order_by(Team.id)
+    if league:
+        query = query.where(Team.league_name.ilike(f"%{league}%"))
+    if country:
+        query = query.where(Team.country.ilike(f"%{country}%"))
+    return _response("teams", format, export.query_columns(query), _batches(query))
+
+@router.get("/predictions")
+async def export_predictions(
+    format: str = Query("ndjson", description="Formato: ndjson, csv ou parquet"),
+    date_from: Optional[datetime] = Query(None, description="Data inicial"),
+    date_to: Optional[datetime] = Query(None, description="Data final"),
+    status: Optional[str] = Query(None, description="Status da partida"),
+    league: Optional[str] = Query(None, description="Filtrar por liga"),
+    updated_since: Optional[datetime] = Query(None, description="Apenas partidas alteradas desde")
+):
+    """Exportar as previsões gravadas (uma coluna por campo) com o resultado real"""
+    _check_format(format)
+    query = select(
+        Match.id.label("match_id"), Match.match_date, Match.league_name,
+        Match.home_team_id, Match.away_team_id, Match.status, Match.home_goals, Match.away_goals,
+        Match.predicted_result, Match.prediction_confidence, Match.predicted_at, Match.prediction
+    ).where(Match.prediction.isnot(None)).order_by(Match.id)
+    query = _match_filters(query, date_from, date_to, status, league, updated_since)
+
+    # A previsão (JSON) vira colunas
+    columns = export.query_columns(query)[:-1] + PREDICTION_FIELDS
+
+    async def flattened():
+        async for batch in _batches(query):
+            yield [
+                (*row[:-1], *[(row[-1] or {}).get(name) for name, _ in PREDICTION_FIELDS])
+                for row in batch
+            ]
+
+    return _response("predictions", format, columns, flattened())
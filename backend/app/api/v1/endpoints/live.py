@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Query, Request, WebSocket
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import asyncio
+import json
+from app.services import live
+
+router = APIRouter()
+
+@router.get("/matches")
+async def match_feed(
+    request: Request,
+    league: Optional[List[str]] = Query(None, description="Ligas acompanhadas (repetível)"),
+    match_id: Optional[List[int]] = Query(None, description="Partidas acompanhadas (repetível)")
+):
+    """Alterações de placar, status e odds em tempo real (Server-Sent Events)
+
+    Sem filtros, recebe todas as partidas. Cada evento ``matches`` traz a
+    lista com o último estado das partidas alteradas no intervalo.
+    """
+    subscription = live.feed.subscribe(league, match_id)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            async for events in subscription.batches():
+                if await request.is_disconnected():
+                    break
+                if events:
+                    yield f"event: matches\ndata: {json.dumps(events)}\n\n"
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            live.feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/matches/ws")
+async def match_feed_ws(
+    websocket: WebSocket,
+    league: Optional[List[str]] = Query(None),
+    match_id: Optional[List[int]] = Query(None)
+):
+    """Alterações de partidas em tempo real (WebSocket), com os mesmos filtros do SSE
+
+    O cliente não envia mensagens; a leitura do socket só detecta o
+    fechamento da conexão, que encerra o envio imediatamente.
+    """
+    await websocket.accept()
+    subscription = live.feed.subscribe(league, match_id)
+
+    async def send():
+        async for events in subscription.batches():
+            if events:
+                await websocket.send_text(json.dumps({"type": "matches", "events": events}))
+            else:
+                await websocket.send_text(json.dumps({"type": "keep-alive"}))
+
+    async def receive():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        live.feed.unsubscribe(subscription)
@@ -1,13 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, date
+from app.core import cache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import decode_cursor, encode_cursor, set_next_cursor
+from app.core.serialization import json_list_response
+from app.crud import match as crud_match
+from app.crud import odds as crud_odds
 from app.models.match import Match
-from app.schemas.match import MatchCreate, MatchResponse, MatchUpdate
+from app.schemas.bulk import BulkUpsertResponse
+from app.schemas.match import MatchBulkItem, MatchCreate, MatchResponse, MatchUpdate
+from app.schemas.odds import OddsAppendResponse, OddsCandle, OddsSnapshotCreate
+from app.services import fixtures, ingest, live, odds, statistics, team_form
 
 router = APIRouter()
 
+# Colunas lidas pela listagem (apenas as da resposta)
+MATCH_COLUMNS = list(MatchResponse.model_fields)
+
+async def _refresh_team_form(db: AsyncSession, team_ids: List[int]):
+    """Recalcular a forma dos times após uma mudança de resultado"""
+    await db.run_sync(team_form.refresh_team_form, team_ids)
+    await db.commit()
+
 @router.get("/", response_model=List[MatchResponse])
 async def get_matches(
     skip: int = Query(0, ge=0, description="Número de registros para pular"),
@@ -16,67 +33,197 @@ async def get_matches(
     date_to: Optional[date] = Query(None, description="Data final (YYYY-MM-DD)"),
     status: Optional[str] = Query(None, description="Status da partida"),
     league: Optional[str] = Query(None, description="Filtrar por liga"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Listar partidas com filtros opcionais"""
-    query = db.query(Match)
-    
-    if date_from:
-        query = query.filter(Match.match_date >= date_from)
-    
-    if date_to:
-        query = query.filter(Match.match_date <= date_to)
-    
-    if status:
-        query = query.filter(Match.status == status)
-    
-    if league:
-        query = query.filter(Match.league_name.ilike(f"%{league}%"))
-    
-    matches = query.order_by(Match.match_date.desc()).offset(skip).limit(limit).all()
-    return matches
+    matches = await crud_match.get_matches(
+        db,
+        skip=skip,
+        limit=limit,
+        date_from=date_from,
+        date_to=date_to,
+        status=status,
+        league=league,
+        after=decode_cursor(cursor, datetime, int) if cursor else None,
+        columns=MATCH_COLUMNS
+    )
+    response = json_list_response(MatchResponse, matches)
+    if len(matches) == limit:
+        set_next_cursor(response, encode_cursor(matches[-1].match_date, matches[-1].id))
+    return response
+
+async def _fixtures_response(db: AsyncSession, day: Optional[date], offset_days: int, league: Optional[str], tz: Optional[str]):
+    """Partidas de um dia local (cache por dia em app/services/fixtures.py)"""
+    try:
+        zone = fixtures.get_timezone(tz)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Fuso horário inválido")
+    day = day or fixtures.local_today(zone, offset_days)
+    return Response(content=await fixtures.get_day(db, day, zone, league), media_type="application/json")
+
+@router.get("/today", response_model=List[MatchResponse])
+async def get_today_matches(
+    league: Optional[str] = Query(None, description="Filtrar por liga"),
+    tz: Optional[str] = Query(None, description="Fuso horário IANA do dia (padrão FIXTURES_TIMEZONE)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Buscar partidas de hoje (dia civil no fuso ``tz``)"""
+    return await _fixtures_response(db, None, 0, league, tz)
+
+@router.get("/tomorrow", response_model=List[MatchResponse])
+async def get_tomorrow_matches(
+    league: Optional[str] = Query(None, description="Filtrar por liga"),
+    tz: Optional[str] = Query(None, description="Fuso horário IANA do dia (padrão FIXTURES_TIMEZONE)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Buscar partidas de amanhã (dia civil no fuso ``tz``)"""
+    return await _fixtures_response(db, None, 1, league, tz)
+
+@router.get("/day/{day}", response_model=List[MatchResponse])
+async def get_day_matches(
+    day: date,
+    league: Optional[str] = Query(None, description="Filtrar por liga"),
+    tz: Optional[str] = Query(None, description="Fuso horário IANA do dia (padrão FIXTURES_TIMEZONE)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Buscar partidas de um dia (YYYY-MM-DD, dia civil no fuso ``tz``)"""
+    return await _fixtures_response(db, day, 0, league, tz)
 
 @router.get("/{match_id}", response_model=MatchResponse)
-async def get_match(match_id: int, db: Session = Depends(get_db)):
+async def get_match(match_id: int, db: AsyncSession = Depends(get_db)):
     """Buscar uma partida específica por ID"""
-    match = db.query(Match).filter(Match.id == match_id).first()
+    match = await crud_match.get_match(db, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Partida não encontrada")
     return match
 
-@router.get("/today", response_model=List[MatchResponse])
-async def get_today_matches(db: Session = Depends(get_db)):
-    """Buscar partidas de hoje"""
-    today = date.today()
-    matches = db.query(Match).filter(
-        Match.match_date >= today,
-        Match.match_date < today.replace(day=today.day + 1)
-    ).all()
-    return matches
+@router.get("/{match_id}/odds", response_model=List[OddsCandle])
+async def get_match_odds_history(
+    match_id: int,
+    interval: str = Query("1h", description="Intervalo de agregação: 1m, 5m, 15m, 1h, 6h ou 1d"),
+    market: Optional[str] = Query(None, description="Mercado (ex.: 1x2)"),
+    selection: Optional[str] = Query(None, description="Seleção (ex.: home)"),
+    bookmaker: Optional[str] = Query(None, description="Casa de apostas"),
+    date_from: Optional[datetime] = Query(None, description="Início do período"),
+    date_to: Optional[datetime] = Query(None, description="Fim do período"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Movimento das odds de uma partida (abertura, máxima, mínima e fechamento por intervalo)"""
+    if interval not in odds.INTERVALS:
+        raise HTTPException(status_code=400, detail="Intervalo inválido")
+    
+    candles = await crud_odds.get_odds_candles(
+        db,
+        match_id,
+        odds.INTERVALS[interval],
+        market=market,
+        selection=selection,
+        bookmaker=bookmaker,
+        date_from=date_from,
+        date_to=date_to
+    )
+    if not candles and not await crud_match.get_match(db, match_id):
+        raise HTTPException(status_code=404, detail="Partida não encontrada")
+    return candles
 
 @router.post("/", response_model=MatchResponse)
-async def create_match(match: MatchCreate, db: Session = Depends(get_db)):
+async def create_match(match: MatchCreate, db: AsyncSession = Depends(get_db)):
     """Criar uma nova partida"""
     db_match = Match(**match.dict())
+    statistics.apply_result_fields(db_match)
     db.add(db_match)
-    db.commit()
-    db.refresh(db_match)
+    await db.flush()
+    
+    stats_statements = statistics.transition_statements(
+        (None, None, None, None, None), statistics.result_state(db_match)
+    )
+    for statement in stats_statements:
+        await db.execute(statement, execution_options=statistics.EXECUTION_OPTIONS)
+    
+    live.record(db, [db_match.id])
+    await db.commit()
+    await db.refresh(db_match)
+    if stats_statements:
+        await _refresh_team_form(db, [db_match.home_team_id, db_match.away_team_id])
+    await cache.invalidate(*(("matches", "teams") if stats_statements else ("matches",)))
+    await fixtures.invalidate()
+    await live.publish(db)
     return db_match
 
+@router.post("/bulk", response_model=BulkUpsertResponse)
+async def bulk_upsert_matches(matches: List[MatchBulkItem], db: AsyncSession = Depends(get_db)):
+    """Criar/atualizar partidas em lote (chave: external_id)"""
+    if len(matches) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Máximo de {settings.BULK_MAX_ITEMS} partidas por requisição"
+        )
+    
+    result = await db.run_sync(ingest.bulk_upsert_matches, matches)
+    await db.commit()
+    if result["team_ids"]:
+        await _refresh_team_form(db, result["team_ids"])
+    await cache.invalidate("matches", "teams")
+    await fixtures.invalidate()
+    await live.publish(db)
+    return {"received": result["received"], "upserted": result["upserted"]}
+
+@router.post("/odds", response_model=OddsAppendResponse)
+async def append_odds(snapshots: List[OddsSnapshotCreate], db: AsyncSession = Depends(get_db)):
+    """Gravar odds no histórico em lote (e atualizar a odd atual das partidas)"""
+    if len(snapshots) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Máximo de {settings.BULK_MAX_ITEMS} odds por requisição"
+        )
+    
+    try:
+        result = await db.run_sync(odds.append_snapshots, snapshots)
+    except odds.UnknownMatchesError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    await db.commit()
+    # Só invalida o cache quando alguma odd atual mudou (o histórico é
+    # lido pelas velas, em cache por CACHE_TTL_MATCHES)
+    if result["updated"]:
+        await cache.invalidate("matches")
+        await live.publish(db)
+    return result
+
 @router.put("/{match_id}", response_model=MatchResponse)
 async def update_match(
     match_id: int, 
     match_update: MatchUpdate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Atualizar uma partida existente"""
-    db_match = db.query(Match).filter(Match.id == match_id).first()
+    """Atualizar uma partida existente
+    
+    A linha fica bloqueada até o commit: PUTs simultâneos na mesma partida
+    leem o estado anterior um de cada vez, e a diferença nas estatísticas
+    dos times é aplicada uma única vez.
+    """
+    db_match = await crud_match.get_match(db, match_id, for_update=True)
     if not db_match:
         raise HTTPException(status_code=404, detail="Partida não encontrada")
     
-    for field, value in match_update.dict(exclude_unset=True).items():
+    old_state = statistics.result_state(db_match)
+    changes = match_update.dict(exclude_unset=True)
+    for field, value in changes.items():
         setattr(db_match, field, value)
+    statistics.apply_result_fields(db_match)
+    
+    # Aplicar a diferença nas estatísticas dos times na mesma transação
+    stats_statements = statistics.transition_statements(old_state, statistics.result_state(db_match))
+    for statement in stats_statements:
+        await db.execute(statement, execution_options=statistics.EXECUTION_OPTIONS)
     
-    db.commit()
-    db.refresh(db_match)
+    live.record(db, [db_match.id])
+    await db.commit()
+    await db.refresh(db_match)
+    if stats_statements:
+        await _refresh_team_form(db, [db_match.home_team_id, db_match.away_team_id])
+    await cache.invalidate(*(("matches", "teams") if stats_statements else ("matches",)))
+    if fixtures.FIXTURE_FIELDS.intersection(changes):
+        await fixtures.invalidate()
+    await live.publish(db)
     return db_match 
\ No newline at end of file
@@ -1,74 +1,105 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from app.core import cache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import decode_cursor, encode_cursor, set_next_cursor
+from app.core.serialization import json_list_response
+from app.crud import team as crud_team
 from app.models.team import Team
+from app.schemas.bulk import BulkUpsertResponse
 from app.schemas.team import TeamCreate, TeamResponse, TeamUpdate
+from app.services import ingest
 
 router = APIRouter()
 
+# Colunas lidas pela listagem (apenas as da resposta)
+TEAM_COLUMNS = list(TeamResponse.model_fields)
+
 @router.get("/", response_model=List[TeamResponse])
 async def get_teams(
     skip: int = Query(0, ge=0, description="Número de registros para pular"),
     limit: int = Query(10, ge=1, le=100, description="Limite de registros"),
     country: Optional[str] = Query(None, description="Filtrar por país"),
     league: Optional[str] = Query(None, description="Filtrar por liga"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Listar todos os times com filtros opcionais"""
-    query = db.query(Team).filter(Team.is_active == True)
-    
-    if country:
-        query = query.filter(Team.country.ilike(f"%{country}%"))
-    
-    if league:
-        query = query.filter(Team.league_name.ilike(f"%{league}%"))
-    
-    teams = query.offset(skip).limit(limit).all()
-    return teams
+    teams = await crud_team.get_teams(
+        db,
+        skip=skip,
+        limit=limit,
+        country=country,
+        league=league,
+        after=decode_cursor(cursor, str, int) if cursor else None,
+        columns=TEAM_COLUMNS
+    )
+    response = json_list_response(TeamResponse, teams)
+    if len(teams) == limit:
+        set_next_cursor(response, encode_cursor(teams[-1].name, teams[-1].id))
+    return response
 
 @router.get("/{team_id}", response_model=TeamResponse)
-async def get_team(team_id: int, db: Session = Depends(get_db)):
+async def get_team(team_id: int, db: AsyncSession = Depends(get_db)):
     """Buscar um time específico por ID"""
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await crud_team.get_team(db, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Time não encontrado")
     return team
 
 @router.post("/", response_model=TeamResponse)
-async def create_team(team: TeamCreate, db: Session = Depends(get_db)):
+async def create_team(team: TeamCreate, db: AsyncSession = Depends(get_db)):
     """Criar um novo time"""
     db_team = Team(**team.dict())
     db.add(db_team)
-    db.commit()
-    db.refresh(db_team)
+    await db.commit()
+    await db.refresh(db_team)
+    await cache.invalidate("teams")
     return db_team
 
+@router.post("/bulk", response_model=BulkUpsertResponse)
+async def bulk_upsert_teams(teams: List[TeamCreate], db: AsyncSession = Depends(get_db)):
+    """Criar/atualizar times em lote (chave: external_id)"""
+    if len(teams) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Máximo de {settings.BULK_MAX_ITEMS} times por requisição"
+        )
+    
+    result = await db.run_sync(ingest.bulk_upsert_teams, teams)
+    await db.commit()
+    await cache.invalidate("teams")
+    return {"received": result["received"], "upserted": result["upserted"]}
+
 @router.put("/{team_id}", response_model=TeamResponse)
 async def update_team(
     team_id: int, 
     team_update: TeamUpdate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Atualizar um time existente"""
-    db_team = db.query(Team).filter(Team.id == team_id).first()
+    db_team = await crud_team.get_team(db, team_id)
     if not db_team:
         raise HTTPException(status_code=404, detail="Time não encontrado")
     
     for field, value in team_update.dict(exclude_unset=True).items():
         setattr(db_team, field, value)
     
-    db.commit()
-    db.refresh(db_team)
+    await db.commit()
+    await db.refresh(db_team)
+    await cache.invalidate("teams")
     return db_team
 
 @router.delete("/{team_id}")
-async def delete_team(team_id: int, db: Session = Depends(get_db)):
+async def delete_team(team_id: int, db: AsyncSession = Depends(get_db)):
     """Deletar um time (soft delete)"""
-    db_team = db.query(Team).filter(Team.id == team_id).first()
+    db_team = await crud_team.get_team(db, team_id)
     if not db_team:
         raise HTTPException(status_code=404, detail="Time não encontrado")
     
     db_team.is_active = False
-    db.commit()
+    await db.commit()
+    await cache.invalidate("teams")
     return {"message": "Time deletado com sucesso"} 
\ No newline at end of file
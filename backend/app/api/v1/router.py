@@ -1,9 +1,11 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import teams, matches, analysis
+from app.api.v1.endpoints import teams, matches, analysis, export, live
 
 api_router = APIRouter()
 
 # Incluir rotas
 api_router.include_router(teams.router, prefix="/teams", tags=["teams"])
 api_router.include_router(matches.router, prefix="/matches", tags=["matches"])
-api_router.include_router(analysis.router, prefix="/analysis", tags=["analysis"]) 
\ No newline at end of file
+api_router.include_router(analysis.router, prefix="/analysis", tags=["analysis"]) 
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(live.router, prefix="/live", tags=["live"])
@@ -0,0 +1,162 @@
+"""
+Cache de respostas HTTP em Redis
+
+As respostas GET de /teams, /matches e /analysis são armazenadas com chave
+baseada no caminho + parâmetros de query. Cada recurso tem um número de
+versão em Redis; a invalidação apenas incrementa a versão, o que torna todas
+as chaves antigas inacessíveis (elas expiram pelo TTL).
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1"
+
+# TTL (segundos) por recurso
+CACHE_TTLS: Dict[str, int] = {
+    "teams": settings.CACHE_TTL_TEAMS,
+    "matches": settings.CACHE_TTL_MATCHES,
+    "analysis": settings.CACHE_TTL_ANALYSIS,
+}
+
+# Recursos que também precisam ser invalidados quando um recurso muda
+# (as análises dependem de times e partidas)
+DEPENDENT_NAMESPACES: Dict[str, Tuple[str, ...]] = {
+    "teams": ("analysis",),
+    "matches": ("analysis",),
+}
+
+# Rotas com cache próprio, fora do cache de respostas (partidas por dia:
+# app/services/fixtures.py)
+UNCACHED_PATHS = ("/matches/today", "/matches/tomorrow")
+UNCACHED_PREFIXES = ("/matches/day/",)
+
+# Headers da resposta original que também são guardados no cache
+CACHED_HEADERS = ("x-next-cursor",)
+
+_async_client: Optional[aioredis.Redis] = None
+_sync_client: Optional[redis.Redis] = None
+
+def get_cache_client() -> aioredis.Redis:
+    """Cliente Redis assíncrono usado pela API"""
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.from_url(settings.REDIS_URL)
+    return _async_client
+
+def get_sync_cache_client() -> redis.Redis:
+    """Cliente Redis síncrono usado pelas tarefas do Celery"""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _sync_client
+
+def set_cache_client(client: Optional[aioredis.Redis] = None, sync_client: Optional[redis.Redis] = None):
+    """Substituir os clientes Redis (ex.: fakeredis em testes)"""
+    global _async_client, _sync_client
+    _async_client = client
+    _sync_client = sync_client
+
+def _version_key(namespace: str) -> str:
+    return f"{settings.CACHE_PREFIX}:{namespace}:version"
+
+def _expand(namespaces) -> set:
+    expanded = set()
+    for namespace in namespaces:
+        expanded.add(namespace)
+        expanded.update(DEPENDENT_NAMESPACES.get(namespace, ()))
+    return expanded
+
+def resolve_namespace(path: str) -> Optional[str]:
+    """Descobrir o recurso em cache a partir do caminho da requisição"""
+    if not path.startswith(API_PREFIX + "/"):
+        return None
+    route = path[len(API_PREFIX):].rstrip("/")
+    if route in UNCACHED_PATHS or route.startswith(UNCACHED_PREFIXES):
+        return None
+    namespace = path[len(API_PREFIX) + 1:].split("/", 1)[0]
+    return namespace if namespace in CACHE_TTLS else None
+
+def build_cache_key(namespace: str, version: int, path: str, query_params) -> str:
+    """Chave do cache: recurso + versão + caminho + query ordenada"""
+    query = "&".join(f"{key}={value}" for key, value in sorted(query_params.multi_items()))
+    digest = hashlib.sha1(f"{path}?{query}".encode()).hexdigest()
+    return f"{settings.CACHE_PREFIX}:{namespace}:v{version}:{digest}"
+
+async def invalidate(*namespaces: str):
+    """Invalidar o cache dos recursos informados (e dos dependentes)"""
+    if not settings.CACHE_ENABLED:
+        return
+    try:
+        pipe = get_cache_client().pipeline()
+        for namespace in _expand(namespaces):
+            pipe.incr(_version_key(namespace))
+        await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Falha ao invalidar cache {namespaces}: {str(e)}")
+
+def invalidate_sync(*namespaces: str):
+    """Versão síncrona de ``invalidate`` para tarefas e scripts"""
+    if not settings.CACHE_ENABLED:
+        return
+    try:
+        pipe = get_sync_cache_client().pipeline()
+        for namespace in _expand(namespaces):
+            pipe.incr(_version_key(namespace))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Falha ao invalidar cache {namespaces}: {str(e)}")
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Servir respostas GET do cache Redis quando disponíveis"""
+
+    async def dispatch(self, request: Request, call_next):
+        namespace = resolve_namespace(request.url.path)
+        if request.method != "GET" or namespace is None:
+            return await call_next(request)
+
+        client = get_cache_client()
+        try:
+            version = int(await client.get(_version_key(namespace)) or 0)
+            key = build_cache_key(namespace, version, request.url.path, request.query_params)
+            cached = await client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache indisponível: {str(e)}")
+            metrics.CACHE_REQUESTS.inc((namespace, "error"))
+            return await call_next(request)
+
+        metrics.CACHE_REQUESTS.inc((namespace, "miss" if cached is None else "hit"))
+        if cached is not None:
+            raw_headers, body = cached.split(b"\n", 1)
+            headers = json.loads(raw_headers)
+            headers["X-Cache"] = "HIT"
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        response = await call_next(request)
+        content_type = response.headers.get("content-type", "")
+        if response.status_code != 200 or not content_type.startswith("application/json"):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        cached_headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        try:
+            await client.set(key, json.dumps(cached_headers).encode() + b"\n" + body, ex=CACHE_TTLS[namespace])
+        except redis.RedisError as e:
+            logger.warning(f"Falha ao gravar cache: {str(e)}")
+
+        headers = dict(response.headers)
+        headers["X-Cache"] = "MISS"
+        return Response(content=body, status_code=response.status_code, headers=headers)
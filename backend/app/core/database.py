@@ -1,25 +1,77 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
-# Criar engine do banco
+# Drivers assíncronos equivalentes aos drivers síncronos
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Converter a DATABASE_URL para o driver assíncrono correspondente"""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+def pool_options(name: str, pool_size: int, max_overflow: int, asynchronous: bool = False) -> dict:
+    """Parâmetros do pool de conexões (SQLite usa o pool padrão do dialeto)"""
+    if make_url(settings.DATABASE_URL).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if asynchronous else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+# Criar engine do banco (síncrona: criação de tabelas, scripts e migrations)
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True
+    echo=settings.DB_ECHO,
+    pool_pre_ping=True,
+    **pool_options("api_sync", pool_size=1, max_overflow=settings.DB_MAX_OVERFLOW)
 )
 
 # Criar sessão
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrona usada pelos endpoints da API
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    echo=settings.DB_ECHO,
+    pool_pre_ping=True,
+    **pool_options("api", settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, asynchronous=True)
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Engine dos workers do Celery (pool pequeno por processo filho)
+worker_engine = create_engine(
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    pool_pre_ping=True,
+    **pool_options("worker", settings.WORKER_DB_POOL_SIZE, settings.WORKER_DB_MAX_OVERFLOW)
+)
+
+WorkerSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=worker_engine)
+
 # Base para os modelos
 Base = declarative_base()
 
-# Dependency para obter sessão do banco
-def get_db():
-    db = SessionLocal()
-    try:
+# Dependency para obter sessão assíncrona do banco
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close() 
\ No newline at end of file
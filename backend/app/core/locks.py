@@ -0,0 +1,102 @@
+"""
+Locks distribuídos das tarefas periódicas
+
+Cada execução de uma tarefa periódica segura um lock em Redis (SET NX com
+expiração, liberado apenas pelo dono). Se o lock já existe, a execução é
+descartada: uma execução lenta não se sobrepõe à seguinte e dois workers não
+fazem o mesmo trabalho ao mesmo tempo. A expiração é o limite de tempo da
+tarefa, então o lock de um worker que morreu não fica preso.
+
+Sem Redis (testes), ``LocalLockBackend`` faz o mesmo em memória. Se o Redis
+estiver indisponível, a tarefa roda sem lock (como o cache de respostas).
+"""
+
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import redis
+
+from app.core.cache import get_sync_cache_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class RedisLockBackend:
+    """Locks em Redis (redis-py ``Lock``: token por dono, liberação atômica em Lua)"""
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+
+    def acquire(self, key: str, ttl: int):
+        lock = self.client.lock(key, timeout=ttl, blocking=False)
+        return lock if lock.acquire() else None
+
+    def release(self, lock):
+        try:
+            lock.release()
+        except redis.exceptions.LockNotOwnedError:
+            logger.warning(f"Lock {lock.name} expirou antes do fim da tarefa")
+
+class LocalLockBackend:
+    """Locks em memória (testes e execução sem Redis)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owners: Dict[str, Tuple[str, float]] = {}
+
+    def acquire(self, key: str, ttl: int):
+        token = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            owner = self._owners.get(key)
+            if owner is not None and owner[1] > now:
+                return None
+            self._owners[key] = (token, now + ttl)
+        return key, token
+
+    def release(self, lock):
+        key, token = lock
+        with self._lock:
+            if self._owners.get(key, (None,))[0] == token:
+                del self._owners[key]
+
+_backend = None
+
+def get_lock_backend():
+    global _backend
+    if _backend is None:
+        _backend = RedisLockBackend(get_sync_cache_client())
+    return _backend
+
+def set_lock_backend(backend=None):
+    """Substituir o backend dos locks (ex.: ``LocalLockBackend()`` em testes)"""
+    global _backend
+    _backend = backend
+
+@contextmanager
+def job_lock(name: str, ttl: int) -> Iterator[bool]:
+    """Tentar obter o lock da tarefa ``name``; produz False se outra execução o tem"""
+    backend = get_lock_backend()
+    key = f"{settings.JOB_LOCK_PREFIX}:{name}"
+    lock: Optional[object] = None
+    try:
+        lock = backend.acquire(key, ttl)
+    except redis.RedisError as e:
+        logger.warning(f"Lock indisponível para {name}, executando sem lock: {str(e)}")
+        yield True
+        return
+
+    if lock is None:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        try:
+            backend.release(lock)
+        except redis.RedisError as e:
+            logger.warning(f"Falha ao liberar o lock de {name}: {str(e)}")
@@ -0,0 +1,379 @@
+"""
+Métricas da API no formato do Prometheus (GET /metrics)
+
+- latência por rota (histograma), com o número de consultas e o tempo de
+  banco de cada requisição (eventos do SQLAlchemy acumulados em um
+  contextvar da requisição);
+- acertos/erros do cache de respostas por recurso;
+- duração das tarefas do Celery: os workers rodam em outros processos,
+  então as durações são acumuladas em Redis e lidas pelo /metrics da API;
+- estado dos pools de conexão (mesmos valores de /metrics/pool); o pool
+  ``worker`` de cada processo do Celery também é publicado em Redis.
+
+Latência, cache e pools são acumulados no processo: com vários workers do
+uvicorn cada scrape cai em um deles. Essas séries levam o rótulo ``worker``
+(PID do processo; nos pools do Celery, ``host:PID`` do processo filho), então cada worker é uma série própria e a soma fica com
+o Prometheus (``sum without (worker) (...)``); um worker reiniciado começa
+uma série nova, tratada como reset do contador. As durações do Celery já
+são agregadas em Redis e não têm o rótulo.
+
+As respostas também recebem o header ``Server-Timing`` (tempo até o envio
+dos headers, tempo de banco e número de consultas), exibido nas
+ferramentas de desenvolvedor do navegador.
+"""
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import redis
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+TASK_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0)
+
+# Valores de pool_status() que só crescem (expostos como counter); os demais são gauges
+POOL_COUNTERS = {
+    "checkouts": "bet_db_pool_checkouts_total",
+    "overflow_events": "bet_db_pool_overflow_events_total",
+    "timeouts": "bet_db_pool_timeouts_total",
+    "wait_time_total_ms": "bet_db_pool_wait_time_ms_total",
+}
+
+# Rótulo das séries acumuladas no processo
+WORKER_LABEL = "worker"
+
+# Série de um histograma: (contagem por bucket, não acumulada, com +Inf no fim; soma; total)
+HistogramSeries = Tuple[List[int], float, int]
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def worker_id() -> str:
+    """Identificador deste processo nas séries (PID; lido a cada scrape, vale após fork)"""
+    return str(os.getpid())
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def render_histogram(
+    name: str,
+    help: str,
+    label_names: Sequence[str],
+    series: Dict[tuple, HistogramSeries],
+    buckets: Sequence[float],
+) -> List[str]:
+    """Linhas de um histograma no formato texto do Prometheus"""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} histogram"]
+    for labels, (counts, total, count) in sorted(series.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(list(buckets) + ["+Inf"], counts):
+            cumulative += bucket_count
+            le = f'le="{bound if bound == "+Inf" else float(bound)}"'
+            lines.append(f"{name}_bucket{_format_labels(label_names, labels, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(label_names, labels)} {total}")
+        lines.append(f"{name}_count{_format_labels(label_names, labels)} {count}")
+    return lines
+
+class Counter:
+    """Contador com rótulos (acumulado no processo)"""
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, labels: tuple, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def values(self) -> Dict[tuple, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        names, worker = self.label_names + (WORKER_LABEL,), worker_id()
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(names, labels + (worker,))} {value}")
+        return lines
+
+class Histogram:
+    """Histograma com rótulos (acumulado no processo)"""
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        worker = worker_id()
+        with self._lock:
+            series = {
+                labels + (worker,): (list(counts), total, count)
+                for labels, (counts, total, count) in self._series.items()
+            }
+        return render_histogram(self.name, self.help, self.label_names + (WORKER_LABEL,), series, self.buckets)
+
+REQUEST_LATENCY = Histogram(
+    "bet_http_request_duration_seconds", "Latência das requisições por rota",
+    ("method", "route", "status"), LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "bet_http_request_db_queries", "Consultas ao banco por requisição",
+    ("method", "route"), QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Counter(
+    "bet_http_request_db_seconds_total", "Tempo total de banco das requisições por rota",
+    ("method", "route")
+)
+CACHE_REQUESTS = Counter(
+    "bet_cache_requests_total", "Consultas ao cache de respostas (hit, miss ou error)",
+    ("namespace", "result")
+)
+
+# Consultas ao banco
+
+class RequestStats:
+    """Consultas e tempo de banco da requisição atual"""
+
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None:
+        context._metrics_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    start = getattr(context, "_metrics_start", None)
+    if stats is not None and start is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - start
+
+def instrument_engine(engine):
+    """Contar consultas e tempo de banco (síncrona ou assíncrona) por requisição"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+# Requisições
+
+def route_label(scope) -> str:
+    """Modelo da rota (ex.: /api/v1/matches/{match_id}) para limitar a cardinalidade"""
+    route = scope.get("route")
+    if route is None:
+        # Respostas servidas pelo cache não passam pelo roteador
+        app = scope.get("app")
+        for candidate in getattr(getattr(app, "router", None), "routes", []):
+            if candidate.matches(scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+def server_timing(elapsed: float, stats: RequestStats) -> str:
+    return (
+        f"app;dur={elapsed * 1000:.1f}, "
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"'
+    )
+
+class MetricsMiddleware:
+    """Latência, consultas e tempo de banco por rota + header Server-Timing
+
+    Middleware ASGI puro: a latência inclui o envio do corpo (respostas em
+    streaming) e o header é acrescentado na mensagem de início da resposta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(time.perf_counter() - start, stats))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            labels = (scope["method"], route_label(scope))
+            REQUEST_LATENCY.observe(labels + (str(status),), time.perf_counter() - start)
+            REQUEST_QUERIES.observe(labels, stats.queries)
+            REQUEST_DB_TIME.inc(labels, stats.db_time)
+
+# Tarefas do Celery (acumuladas em Redis)
+
+def _task_index_key() -> str:
+    return f"{settings.METRICS_PREFIX}:celery"
+
+def _task_key(task: str, state: str) -> str:
+    return f"{settings.METRICS_PREFIX}:celery:{task}:{state}"
+
+def record_task_duration(client: redis.Redis, task: str, state: str, seconds: float):
+    """Somar a duração de uma execução de tarefa (chamado pelo worker)"""
+    key = _task_key(task, state)
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.sadd(_task_index_key(), f"{task}|{state}")
+        pipe.hincrby(key, f"b{bisect_left(TASK_BUCKETS, seconds)}", 1)
+        pipe.hincrbyfloat(key, "sum", seconds)
+        pipe.hincrby(key, "count", 1)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Falha ao gravar métricas da tarefa {task}: {str(e)}")
+
+async def task_duration_series(client) -> Dict[tuple, HistogramSeries]:
+    """Durações das tarefas gravadas pelos workers (vazio se o Redis estiver indisponível)"""
+    try:
+        members = sorted(member.decode() for member in await client.smembers(_task_index_key()))
+        pipe = client.pipeline(transaction=False)
+        for member in members:
+            pipe.hgetall(_task_key(*member.split("|", 1)))
+        values = await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Métricas do Celery indisponíveis: {str(e)}")
+        return {}
+
+    series = {}
+    for member, fields in zip(members, values):
+        fields = {name.decode(): value for name, value in fields.items()}
+        counts = [int(fields.get(f"b{i}", 0)) for i in range(len(TASK_BUCKETS) + 1)]
+        series[tuple(member.split("|", 1))] = (counts, float(fields.get("sum", 0)), int(fields.get("count", 0)))
+    return series
+
+# Pools dos workers do Celery (publicados em Redis)
+
+def _pool_index_key() -> str:
+    return f"{settings.METRICS_PREFIX}:pools"
+
+def _pool_key(process: str) -> str:
+    return f"{settings.METRICS_PREFIX}:pool:{process}"
+
+def record_worker_pool(client: redis.Redis, process: str, status: Dict[str, object]):
+    """Publicar o estado do pool de um processo do Celery (expira sem novas tarefas)"""
+    key = _pool_key(process)
+    values = {name: value for name, value in status.items() if isinstance(value, (int, float))}
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.sadd(_pool_index_key(), process)
+        pipe.delete(key)
+        if values:
+            pipe.hset(key, mapping=values)
+        pipe.expire(key, settings.METRICS_WORKER_POOL_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Falha ao gravar métricas do pool do worker: {str(e)}")
+
+async def worker_pool_series(client) -> Dict[str, Dict[str, float]]:
+    """Estado do pool de cada processo do Celery ativo (vazio se o Redis estiver indisponível)"""
+    try:
+        processes = sorted(member.decode() for member in await client.smembers(_pool_index_key()))
+        pipe = client.pipeline(transaction=False)
+        for process in processes:
+            pipe.hgetall(_pool_key(process))
+        values = await pipe.execute()
+        expired = [process for process, fields in zip(processes, values) if not fields]
+        if expired:
+            await client.srem(_pool_index_key(), *expired)
+    except redis.RedisError as e:
+        logger.warning(f"Métricas dos pools dos workers indisponíveis: {str(e)}")
+        return {}
+    return {
+        process: {name.decode(): float(value) for name, value in fields.items()}
+        for process, fields in zip(processes, values) if fields
+    }
+
+# Exposição
+
+def _cache_hit_ratio() -> List[str]:
+    name = "bet_cache_hit_ratio"
+    lines = [f"# HELP {name} Fração das consultas ao cache servidas pelo cache", f"# TYPE {name} gauge"]
+    totals: Dict[str, Dict[str, float]] = {}
+    for (namespace, result), value in CACHE_REQUESTS.values().items():
+        totals.setdefault(namespace, {})[result] = value
+    for namespace, results in sorted(totals.items()):
+        lookups = results.get("hit", 0.0) + results.get("miss", 0.0)
+        if lookups:
+            labels = _format_labels(("namespace", WORKER_LABEL), (namespace, worker_id()))
+            lines.append(f'{name}{labels} {results.get("hit", 0.0) / lookups}')
+    return lines
+
+def _pool_metrics(pools: Dict[str, dict], worker_pools: Dict[str, dict]) -> List[str]:
+    # (pool, processo, estado): pools deste processo e o pool de cada processo do Celery
+    rows = [(pool, worker_id(), status) for pool, status in sorted(pools.items())]
+    rows += [("worker", process, status) for process, status in sorted(worker_pools.items())]
+    lines = []
+    keys = sorted({key for _, _, status in rows for key, value in status.items() if isinstance(value, (int, float))})
+    for key in keys:
+        counter = key in POOL_COUNTERS
+        name = POOL_COUNTERS.get(key, f"bet_db_pool_{key}")
+        lines.append(f"# TYPE {name} {'counter' if counter else 'gauge'}")
+        for pool, process, status in rows:
+            if isinstance(status.get(key), (int, float)):
+                lines.append(f'{name}{_format_labels(("pool", WORKER_LABEL), (pool, process))} {status[key]}')
+    return lines
+
+def render(
+    pools: Dict[str, dict],
+    task_series: Dict[tuple, HistogramSeries],
+    worker_pools: Optional[Dict[str, dict]] = None,
+) -> str:
+    """Todas as métricas no formato texto do Prometheus"""
+    lines: List[str] = []
+    for metric in (REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_TIME, CACHE_REQUESTS):
+        lines.extend(metric.render())
+    lines.extend(_cache_hit_ratio())
+    lines.extend(render_histogram(
+        "bet_celery_task_duration_seconds", "Duração das tarefas do Celery",
+        ("task", "state"), task_series, TASK_BUCKETS
+    ))
+    lines.extend(_pool_metrics(pools, worker_pools or {}))
+    return "\n".join(lines) + "\n"
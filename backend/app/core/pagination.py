@@ -0,0 +1,52 @@
+"""
+Paginação por cursor (keyset)
+
+O cursor é opaco para o cliente: base64 (URL-safe) de um JSON com os
+valores da chave de ordenação da última linha da página.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(*values: Any) -> str:
+    """Gerar cursor a partir dos valores da chave de ordenação"""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_value(value: Any, expected: type) -> Any:
+    if isinstance(value, dict):
+        value = datetime.fromisoformat(value["dt"])
+    # bool é subclasse de int, mas não é um id válido
+    if not isinstance(value, expected) or isinstance(value, bool):
+        raise TypeError(value)
+    return value
+
+def decode_cursor(cursor: str, *types: type) -> Tuple[Any, ...]:
+    """Ler um cursor com os tipos da chave de ordenação; retorna 400 se for inválido
+
+    Os tipos são conferidos valor a valor: um cursor editado à mão (um texto
+    no lugar da data ou do id) não chega ao WHERE do keyset.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError(cursor)
+        return tuple(_decode_value(value, expected) for value, expected in zip(payload, types))
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """Expor o próximo cursor no header da resposta (listas continuam como antes)"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
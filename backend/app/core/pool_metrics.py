@@ -0,0 +1,103 @@
+"""
+Métricas dos pools de conexão do banco
+
+Os pools são identificados pelo ``pool_logging_name`` da engine (api,
+api_sync, worker). Cada pool registra quantas conexões foram retiradas,
+o tempo de espera para obter uma conexão, eventos de overflow (conexões
+novas abertas além de ``pool_size``) e timeouts. O pool ``worker`` fica nos
+processos do Celery: cada um publica o seu estado em Redis ao fim de cada
+tarefa (``app.core.metrics.record_worker_pool``).
+"""
+
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class PoolMetrics:
+    """Contadores acumulados de um pool de conexões"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_checkout(self, wait_time: float, overflowed: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+            if overflowed:
+                self.overflow_events += 1
+
+    def record_timeout(self, wait_time: float):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_avg_ms": round(self.wait_time_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+
+# Métricas por nome de pool (sobrevivem a engine.dispose(), que recria o pool)
+POOL_METRICS: Dict[str, PoolMetrics] = {}
+
+def get_metrics(name: str) -> PoolMetrics:
+    if name not in POOL_METRICS:
+        POOL_METRICS[name] = PoolMetrics(name)
+    return POOL_METRICS[name]
+
+class _InstrumentedPoolMixin:
+    """Medir o tempo de espera para retirar uma conexão do pool"""
+
+    def _do_get(self):
+        metrics = get_metrics(self._orig_logging_name or "default")
+        start = time.perf_counter()
+        overflow = self.overflow()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            metrics.record_timeout(time.perf_counter() - start)
+            raise
+        # overflow() cresce a cada conexão nova e passa de 0 além de pool_size;
+        # retiradas de conexões já abertas (mesmo em overflow) não contam
+        created_overflow = self.overflow() > max(overflow, 0)
+        metrics.record_checkout(time.perf_counter() - start, created_overflow)
+        return connection
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def pool_status(engine) -> Dict[str, float]:
+    """Estado atual do pool de uma engine (síncrona ou assíncrona) + contadores"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    pool = sync_engine.pool
+    name = getattr(pool, "_orig_logging_name", None) or "default"
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+        })
+    status.update(get_metrics(name).snapshot())
+    return status
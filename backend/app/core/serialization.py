@@ -0,0 +1,60 @@
+"""
+Serialização rápida das respostas em lista
+
+Em vez de deixar o FastAPI validar item a item (``from_attributes``) e
+depois passar pelo ``jsonable_encoder`` + ``json.dumps``, a lista inteira é
+validada por um ``TypeAdapter`` (uma chamada ao pydantic-core) e
+serializada direto para bytes JSON pelo próprio adapter. Os endpoints
+continuam declarando ``response_model`` para a documentação OpenAPI.
+
+Listas grandes podem ser enviadas em streaming (``streaming_json_list``):
+cada bloco de itens é montado, validado e serializado só quando o anterior
+já foi enviado.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, Type
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """``TypeAdapter`` de ``List[schema]`` (criado uma vez por schema)"""
+    return TypeAdapter(List[schema])
+
+def dump_list(schema: Type[BaseModel], items: Iterable[Any]) -> bytes:
+    """Validar e serializar uma lista (dicts, linhas do SQLAlchemy ou objetos) em JSON"""
+    adapter = list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
+
+def json_list_response(schema: Type[BaseModel], items: Iterable[Any]) -> Response:
+    """Resposta JSON de uma lista pelo caminho rápido"""
+    return Response(content=dump_list(schema, items), media_type="application/json")
+
+def _json_array_chunks(
+    schema: Type[BaseModel], items: Sequence[Any], build: Callable[[Sequence[Any]], Iterable[Any]], chunk_size: int
+) -> Iterator[bytes]:
+    separator = b"["
+    for start in range(0, len(items), chunk_size):
+        body = dump_list(schema, build(items[start:start + chunk_size]))[1:-1]
+        if body:
+            yield separator + body
+            separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+def streaming_json_list(
+    schema: Type[BaseModel],
+    items: Sequence[Any],
+    build: Callable[[Sequence[Any]], Iterable[Any]],
+    chunk_size: int
+) -> Response:
+    """Lista JSON montada por ``build`` em blocos de ``chunk_size`` itens
+
+    Até um bloco a resposta é comum; acima disso é enviada em streaming, um
+    bloco por vez (o mesmo JSON, sem montar a lista inteira em memória).
+    """
+    if len(items) <= chunk_size:
+        return json_list_response(schema, build(items))
+    return StreamingResponse(_json_array_chunks(schema, items, build, chunk_size), media_type="application/json")
@@ -0,0 +1 @@
+# CRUD Module
\ No newline at end of file
@@ -0,0 +1,121 @@
+from sqlalchemy import Row, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional, Sequence, Tuple
+from datetime import date, datetime
+from app.models.match import Match
+
+async def get_match(db: AsyncSession, match_id: int, for_update: bool = False) -> Optional[Match]:
+    """Buscar uma partida por ID
+
+    Com ``for_update`` a linha fica bloqueada (``SELECT ... FOR UPDATE``) até
+    o fim da transação e é relida do banco mesmo se já estiver na sessão.
+    """
+    if for_update:
+        return await db.get(Match, match_id, with_for_update=True, populate_existing=True)
+    return await db.get(Match, match_id)
+
+async def get_match_with_teams(db: AsyncSession, match_id: int) -> Optional[Match]:
+    """Buscar uma partida com mandante e visitante em uma única consulta"""
+    result = await db.execute(
+        select(Match).options(
+            joinedload(Match.home_team),
+            joinedload(Match.away_team)
+        ).where(Match.id == match_id)
+    )
+    return result.scalars().first()
+
+async def get_matches(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[str] = None,
+    league: Optional[str] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    columns: Optional[Sequence[str]] = None
+) -> List[Match]:
+    """Listar partidas com filtros opcionais
+
+    Ordenação por (match_date, id) decrescente. Com ``after`` (chave da
+    última partida da página anterior) a paginação é por keyset e ``skip``
+    é ignorado. Com ``columns`` retorna apenas essas colunas (linhas, sem
+    objetos do ORM).
+    """
+    query = select(*[getattr(Match, column) for column in columns]) if columns else select(Match)
+
+    if date_from:
+        query = query.where(Match.match_date >= date_from)
+
+    if date_to:
+        query = query.where(Match.match_date <= date_to)
+
+    if status:
+        query = query.where(Match.status == status)
+
+    if league:
+        query = query.where(Match.league_name.ilike(f"%{league}%"))
+
+    if after is not None:
+        query = query.where(tuple_(Match.match_date, Match.id) < tuple_(*after))
+    else:
+        query = query.offset(skip)
+
+    result = await db.execute(query.order_by(Match.match_date.desc(), Match.id.desc()).limit(limit))
+    return result.all() if columns else result.scalars().all()
+
+async def get_upcoming_with_odds(
+    db: AsyncSession,
+    date_from: datetime,
+    date_to: datetime,
+    league: Optional[str] = None,
+    odds_columns: Sequence[str] = ()
+) -> List[Row]:
+    """Partidas agendadas da janela com alguma odd (apenas as colunas usadas na análise)"""
+    odds = [getattr(Match, column) for column in odds_columns]
+    query = select(
+        Match.id, Match.match_date, Match.league_name, Match.home_team_id, Match.away_team_id,
+        Match.prediction, *odds
+    ).where(
+        Match.status == "scheduled",
+        Match.match_date >= date_from,
+        Match.match_date <= date_to,
+        or_(*[column.isnot(None) for column in odds])
+    )
+    if league:
+        query = query.where(Match.league_name.ilike(f"%{league}%"))
+    result = await db.execute(query.order_by(Match.match_date, Match.id))
+    return result.all()
+
+async def get_matches_for_analysis(
+    db: AsyncSession,
+    match_ids: Optional[Sequence[int]] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    league: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[Row]:
+    """Partidas a analisar em uma única consulta (apenas as colunas usadas na análise)
+
+    Com ``match_ids`` os filtros são ignorados; sem, as partidas da janela
+    são ordenadas por (match_date, id).
+    """
+    query = select(
+        Match.id, Match.home_team_id, Match.away_team_id, Match.prediction, Match.predicted_at
+    )
+    if match_ids is not None:
+        query = query.where(Match.id.in_(match_ids))
+    else:
+        if date_from:
+            query = query.where(Match.match_date >= date_from)
+        if date_to:
+            query = query.where(Match.match_date <= date_to)
+        if status:
+            query = query.where(Match.status == status)
+        if league:
+            query = query.where(Match.league_name.ilike(f"%{league}%"))
+        query = query.order_by(Match.match_date, Match.id).limit(limit)
+    result = await db.execute(query)
+    return result.all()
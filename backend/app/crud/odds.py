@@ -0,0 +1,71 @@
+from sqlalchemy import BigInteger, case, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime, timezone
+from app.models.odds import OddsSnapshot
+
+def _epoch(column, dialect: str):
+    """Segundos desde 1970 (UTC) de uma coluna de data, como inteiro"""
+    if dialect == "sqlite":
+        return cast(func.strftime("%s", column), BigInteger)
+    return cast(func.extract("epoch", column), BigInteger)
+
+async def get_odds_candles(
+    db: AsyncSession,
+    match_id: int,
+    interval: int,
+    market: Optional[str] = None,
+    selection: Optional[str] = None,
+    bookmaker: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> List[dict]:
+    """Histórico de odds de uma partida agregado em intervalos de ``interval`` segundos
+
+    Para cada (mercado, seleção, casa, intervalo): primeiro, maior, menor e
+    último preço e o número de registros. A agregação é feita no banco, sobre
+    a chave primária (partida, mercado, seleção, casa, instante).
+    """
+    dialect = db.get_bind().dialect.name
+    bucket = (_epoch(OddsSnapshot.recorded_at, dialect) // interval * interval).label("bucket")
+    key = (OddsSnapshot.market, OddsSnapshot.selection, OddsSnapshot.bookmaker)
+
+    query = select(
+        *key,
+        OddsSnapshot.price,
+        bucket,
+        func.row_number().over(partition_by=(*key, bucket), order_by=OddsSnapshot.recorded_at).label("first"),
+        func.row_number().over(partition_by=(*key, bucket), order_by=OddsSnapshot.recorded_at.desc()).label("last"),
+    ).where(OddsSnapshot.match_id == match_id)
+
+    if market:
+        query = query.where(OddsSnapshot.market == market)
+
+    if selection:
+        query = query.where(OddsSnapshot.selection == selection)
+
+    if bookmaker:
+        query = query.where(OddsSnapshot.bookmaker == bookmaker)
+
+    if date_from:
+        query = query.where(OddsSnapshot.recorded_at >= date_from)
+
+    if date_to:
+        query = query.where(OddsSnapshot.recorded_at <= date_to)
+
+    ranked = query.subquery()
+    group = (ranked.c.market, ranked.c.selection, ranked.c.bookmaker, ranked.c.bucket)
+    result = await db.execute(
+        select(
+            *group,
+            func.max(case((ranked.c.first == 1, ranked.c.price))).label("open"),
+            func.max(ranked.c.price).label("high"),
+            func.min(ranked.c.price).label("low"),
+            func.max(case((ranked.c.last == 1, ranked.c.price))).label("close"),
+            func.count().label("snapshots"),
+        ).group_by(*group).order_by(*group)
+    )
+    return [
+        {**row, "bucket": datetime.fromtimestamp(row["bucket"], timezone.utc)}
+        for row in result.mappings()
+    ]
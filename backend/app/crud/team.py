@@ -0,0 +1,58 @@
+from sqlalchemy import Row, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from app.models.team import Team
+
+async def get_team(db: AsyncSession, team_id: int) -> Optional[Team]:
+    """Buscar um time por ID"""
+    return await db.get(Team, team_id)
+
+async def get_team_names(db: AsyncSession, team_ids: Iterable[int]) -> Dict[int, str]:
+    """Nomes de vários times em uma única consulta"""
+    team_ids = set(team_ids)
+    if not team_ids:
+        return {}
+    result = await db.execute(select(Team.id, Team.name).where(Team.id.in_(team_ids)))
+    return dict(result.all())
+
+async def get_teams_by_ids(db: AsyncSession, team_ids: Iterable[int], columns: Sequence[str]) -> Dict[int, Row]:
+    """Colunas de vários times em uma única consulta, por ID"""
+    team_ids = set(team_ids)
+    if not team_ids:
+        return {}
+    result = await db.execute(
+        select(Team.id, *[getattr(Team, column) for column in columns]).where(Team.id.in_(team_ids))
+    )
+    return {row.id: row for row in result.all()}
+
+async def get_teams(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    country: Optional[str] = None,
+    league: Optional[str] = None,
+    after: Optional[Tuple[str, int]] = None,
+    columns: Optional[Sequence[str]] = None
+) -> List[Team]:
+    """Listar times ativos com filtros opcionais
+
+    Ordenação por (name, id). Com ``after`` (chave do último time da página
+    anterior) a paginação é por keyset e ``skip`` é ignorado. Com ``columns``
+    retorna apenas essas colunas (linhas, sem objetos do ORM).
+    """
+    query = select(*[getattr(Team, column) for column in columns]) if columns else select(Team)
+    query = query.where(Team.is_active == True)
+
+    if country:
+        query = query.where(Team.country.ilike(f"%{country}%"))
+
+    if league:
+        query = query.where(Team.league_name.ilike(f"%{league}%"))
+
+    if after is not None:
+        query = query.where(tuple_(Team.name, Team.id) > tuple_(*after))
+    else:
+        query = query.offset(skip)
+
+    result = await db.execute(query.order_by(Team.name, Team.id).limit(limit))
+    return result.all() if columns else result.scalars().all()
@@ -0,0 +1,13 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterable, List
+from app.models.team_form import TeamForm
+
+async def get_team_forms(db: AsyncSession, team_ids: Iterable[int]) -> List[TeamForm]:
+    """Forma pré-calculada de vários times em uma única consulta (pela chave primária)"""
+    result = await db.execute(
+        select(TeamForm)
+        .where(TeamForm.team_id.in_(set(team_ids)))
+        .order_by(TeamForm.team_id, TeamForm.venue, TeamForm.window_size)
+    )
+    return result.scalars().all()
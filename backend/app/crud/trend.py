@@ -0,0 +1,29 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.models.trend import Trend
+
+async def get_trends(
+    db: AsyncSession,
+    league: Optional[str] = None,
+    trend_type: Optional[str] = None,
+    team_id: Optional[int] = None,
+    limit: int = 50
+) -> List[Trend]:
+    """Listar trends materializados, do mais para o menos confiável
+
+    Com ``team_id`` retorna os trends do time, com ``league`` os das ligas
+    correspondentes e, sem filtros, os trends gerais.
+    """
+    if team_id is not None:
+        query = select(Trend).where(Trend.team_id == team_id)
+    elif league:
+        query = select(Trend).where(Trend.scope == "league", Trend.league_name.ilike(f"%{league}%"))
+    else:
+        query = select(Trend).where(Trend.scope == "all")
+
+    if trend_type:
+        query = query.where(Trend.trend_type == trend_type)
+
+    result = await db.execute(query.order_by(Trend.confidence.desc(), Trend.id).limit(limit))
+    return result.scalars().all()
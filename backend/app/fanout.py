@@ -0,0 +1,42 @@
+"""
+Distribuição de tarefas do Celery em faixas de IDs
+
+Trabalhos grandes (ex.: recalcular todos os times) são divididos em faixas
+contíguas de IDs, uma tarefa por faixa (group). Com um callback o grupo vira
+um chord: o callback roda uma única vez, com a lista de resultados, depois
+que todas as faixas terminarem (ex.: invalidar o cache).
+"""
+
+from typing import List, Tuple
+
+from celery import chord, group
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+def id_ranges(first_id: int, last_id: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """Faixas [início, fim] (inclusivas) de até ``chunk_size`` IDs"""
+    return [
+        (start, min(start + chunk_size - 1, last_id))
+        for start in range(first_id, last_id + 1, chunk_size)
+    ]
+
+def table_id_ranges(db: Session, column, chunk_size: int, *criteria) -> List[Tuple[int, int]]:
+    """Faixas entre o menor e o maior ID de uma coluna (vazio se não houver linhas)"""
+    first_id, last_id = db.execute(select(func.min(column), func.max(column)).where(*criteria)).one()
+    if first_id is None:
+        return []
+    return id_ranges(first_id, last_id, chunk_size)
+
+def fan_out(task, ranges: List[Tuple[int, int]], callback=None, **kwargs):
+    """Uma tarefa ``task(início, fim, **kwargs)`` por faixa
+
+    Sem callback dispara um group e retorna o ``GroupResult``; com callback
+    (assinatura que recebe a lista de resultados) dispara um chord e retorna
+    o resultado do callback. Com ``ranges`` vazio não dispara nada.
+    """
+    if not ranges:
+        return None
+    header = group(task.s(first_id, last_id, **kwargs) for first_id, last_id in ranges)
+    if callback is None:
+        return header.apply_async()
+    return chord(header)(callback)
@@ -1,17 +1,20 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.core.config import settings
 from app.api.v1.router import api_router
-from app.core.database import engine, Base
+from app.core.database import engine, async_engine
+from app.core.pool_metrics import pool_status
+from app.core import metrics
+from app.core.cache import ResponseCacheMiddleware, get_cache_client
+from app.services import live
 import logging
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Criar tabelas no banco
-Base.metadata.create_all(bind=engine)
+# As tabelas são criadas pelas migrações (alembic upgrade head)
 
 # Inicializar FastAPI
 app = FastAPI(
@@ -32,9 +35,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Cache de respostas GET em Redis
+if settings.CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware)
+
+# Latência, consultas ao banco e header Server-Timing (adicionado por último:
+# envolve os demais middlewares, inclusive as respostas servidas pelo cache)
+if settings.METRICS_ENABLED:
+    metrics.instrument_engine(async_engine)
+    metrics.instrument_engine(engine)
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Incluir rotas
 app.include_router(api_router, prefix="/api/v1")
 
+@app.on_event("shutdown")
+async def stop_live_feed():
+    await live.feed.stop()
+
 @app.get("/")
 async def root():
     return JSONResponse(content={
@@ -47,6 +65,23 @@ async def root():
 async def health_check():
     return JSONResponse(content={"status": "healthy"})
 
+@app.get("/metrics/pool")
+async def pool_metrics():
+    """Métricas dos pools de conexão deste processo e dos workers do Celery (por processo)"""
+    return JSONResponse(content={
+        "api": pool_status(async_engine),
+        "api_sync": pool_status(engine),
+        "worker": await metrics.worker_pool_series(get_cache_client())
+    })
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Métricas no formato texto do Prometheus"""
+    pools = {"api": pool_status(async_engine), "api_sync": pool_status(engine)}
+    task_series = await metrics.task_duration_series(get_cache_client())
+    worker_pools = await metrics.worker_pool_series(get_cache_client())
+    return PlainTextResponse(metrics.render(pools, task_series, worker_pools), media_type=metrics.CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
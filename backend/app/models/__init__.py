@@ -0,0 +1,7 @@
+# Models Module
+from app.models.team import Team
+from app.models.match import Match
+from app.models.trend import Trend
+from app.models.odds import OddsSnapshot
+from app.models.team_form import TeamForm
+from app.models.job_watermark import JobWatermark
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class JobWatermark(Base):
+    """Até quando os dados já foram processados por uma tarefa periódica (última execução concluída)"""
+    __tablename__ = "job_watermarks"
+
+    job = Column(String(100), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
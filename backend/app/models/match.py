@@ -0,0 +1,69 @@
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, JSON, String, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class Match(Base):
+    __tablename__ = "matches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    external_id = Column(String(50), unique=True, nullable=True)
+    home_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    away_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    league_id = Column(Integer)
+    league_name = Column(String(100))
+    season = Column(String(10))
+    round = Column(String(50))
+    match_date = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String(20), default="scheduled", nullable=False)
+
+    # Resultado
+    home_goals = Column(Integer)
+    away_goals = Column(Integer)
+    winner = Column(String(10))
+    total_goals = Column(Integer, default=0, nullable=False)
+    both_teams_scored = Column(Boolean, default=False, nullable=False)
+
+    # Odds
+    home_odds = Column(Float)
+    draw_odds = Column(Float)
+    away_odds = Column(Float)
+    over_2_5_odds = Column(Float)
+    under_2_5_odds = Column(Float)
+    btts_yes_odds = Column(Float)
+    btts_no_odds = Column(Float)
+
+    # Estatísticas
+    statistics = Column(JSON)
+
+    # Análise
+    prediction_confidence = Column(Float)
+    predicted_result = Column(String(20))
+    analysis_notes = Column(Text)
+    prediction = Column(JSON)  # Previsão completa do modelo (formato de MatchPrediction)
+    predicted_at = Column(DateTime(timezone=True))
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    home_team = relationship("Team", foreign_keys=[home_team_id])
+    away_team = relationship("Team", foreign_keys=[away_team_id])
+
+    __table_args__ = (
+        # Listagem ordenada por (match_date, id) e filtros por intervalo de datas
+        Index("ix_matches_match_date_id", "match_date", "id"),
+        # Filtro por status ordenado por data (ex.: partidas agendadas/finalizadas)
+        Index("ix_matches_status_match_date", "status", "match_date"),
+        # Forma recente: (home_team_id OR away_team_id) AND status ORDER BY match_date
+        Index("ix_matches_home_team_status_date", "home_team_id", "status", "match_date"),
+        Index("ix_matches_away_team_status_date", "away_team_id", "status", "match_date"),
+        # Filtro ILIKE '%liga%' (pg_trgm)
+        Index(
+            "ix_matches_league_name_trgm", "league_name",
+            postgresql_using="gin", postgresql_ops={"league_name": "gin_trgm_ops"}
+        ),
+        # Análise em lote das partidas agendadas de uma janela
+        Index("ix_matches_status_league_date", "status", "league_name", "match_date"),
+        # Estatísticas incrementais: partidas alteradas recentemente
+        Index("ix_matches_changed_at", func.coalesce(updated_at, created_at)),
+    )
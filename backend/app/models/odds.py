@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, PrimaryKeyConstraint, String
+from app.core.database import Base
+
+class OddsSnapshot(Base):
+    """Preço de uma seleção em uma casa de apostas em um instante (histórico apenas de inserção)"""
+    __tablename__ = "odds_snapshots"
+
+    match_id = Column(Integer, ForeignKey("matches.id", ondelete="CASCADE"), nullable=False)
+    market = Column(String(20), nullable=False)      # 1x2, over_under_2_5, btts, ...
+    selection = Column(String(10), nullable=False)   # home, draw, away, over, under, yes, no, ...
+    bookmaker = Column(String(50), nullable=False)
+    recorded_at = Column(DateTime(timezone=True), nullable=False)
+    price = Column(Float, nullable=False)
+
+    __table_args__ = (
+        # Sem id substituto: a chave natural é o único índice da tabela, torna
+        # o reenvio de um lote idempotente e atende às consultas por partida
+        # (+ mercado/seleção) ordenadas por tempo
+        PrimaryKeyConstraint("match_id", "market", "selection", "bookmaker", "recorded_at"),
+        # Linhas chegam em ordem de tempo: BRIN (PostgreSQL) para limpar o histórico antigo
+        Index("ix_odds_snapshots_recorded_at", "recorded_at", postgresql_using="brin"),
+    )
@@ -0,0 +1,53 @@
+from sqlalchemy import Boolean, Column, DateTime, Float, Index, Integer, String, text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class Team(Base):
+    __tablename__ = "teams"
+
+    id = Column(Integer, primary_key=True, index=True)
+    external_id = Column(String(50), unique=True, nullable=True)
+    name = Column(String(100), nullable=False)
+    short_name = Column(String(10))
+    logo_url = Column(String(255))
+    league_id = Column(Integer)
+    league_name = Column(String(100))
+    country = Column(String(50))
+    founded = Column(Integer)
+
+    # Estatísticas
+    games_played = Column(Integer, default=0, nullable=False)
+    wins = Column(Integer, default=0, nullable=False)
+    draws = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
+    goals_for = Column(Integer, default=0, nullable=False)
+    goals_against = Column(Integer, default=0, nullable=False)
+    avg_goals_scored = Column(Float, default=0.0, nullable=False)
+    avg_goals_conceded = Column(Float, default=0.0, nullable=False)
+    win_percentage = Column(Float, default=0.0, nullable=False)
+
+    # Estatísticas por mando
+    home_wins = Column(Integer, default=0, nullable=False)
+    home_draws = Column(Integer, default=0, nullable=False)
+    home_losses = Column(Integer, default=0, nullable=False)
+    away_wins = Column(Integer, default=0, nullable=False)
+    away_draws = Column(Integer, default=0, nullable=False)
+    away_losses = Column(Integer, default=0, nullable=False)
+
+    is_active = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # Listagem de times ativos ordenada por (name, id) - paginação por cursor
+        Index("ix_teams_active_name_id", "name", "id", postgresql_where=text("is_active")),
+        # Filtros ILIKE '%x%' (pg_trgm)
+        Index(
+            "ix_teams_country_trgm", "country",
+            postgresql_using="gin", postgresql_ops={"country": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_teams_league_name_trgm", "league_name",
+            postgresql_using="gin", postgresql_ops={"league_name": "gin_trgm_ops"}
+        ),
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, PrimaryKeyConstraint, String
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class TeamForm(Base):
+    """Forma pré-calculada de um time nas últimas ``window_size`` partidas (geral, em casa ou fora)"""
+    __tablename__ = "team_form"
+
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    venue = Column(String(5), nullable=False)         # all, home, away
+    window_size = Column(Integer, nullable=False)     # 5, 10, 20
+
+    matches = Column(Integer, default=0, nullable=False)
+    wins = Column(Integer, default=0, nullable=False)
+    draws = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
+    goals_for = Column(Integer, default=0, nullable=False)
+    goals_against = Column(Integer, default=0, nullable=False)
+    points_per_game = Column(Float, default=0.0, nullable=False)
+    form = Column(String(20), nullable=False)         # Resultados (W/D/L), do mais recente ao mais antigo
+    last_match_date = Column(DateTime(timezone=True))
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Leitura de vários times de uma vez: team_id IN (...)
+        PrimaryKeyConstraint("team_id", "venue", "window_size"),
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class Trend(Base):
+    """Trend pré-calculado de um escopo (geral, liga ou time)"""
+    __tablename__ = "trends"
+
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String(10), nullable=False)        # all, league, team
+    scope_key = Column(String(120), nullable=False)   # "all", "league:<nome>", "team:<id>"
+    league_name = Column(String(100))
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"))
+    trend_type = Column(String(30), nullable=False)
+    description = Column(String(255), nullable=False)
+
+    matches_count = Column(Integer, default=0, nullable=False)
+    successes = Column(Integer, default=0, nullable=False)
+    success_rate = Column(Float, default=0.0, nullable=False)
+    confidence = Column(Float, default=0.0, nullable=False)
+    streak = Column(Integer)  # Sequência atual (apenas trends de sequência)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("scope_key", "trend_type", name="uq_trends_scope_key_type"),
+        # Leitura do endpoint: escopo (+ liga) ordenado por confiança
+        Index("ix_trends_scope_league_confidence", "scope", "league_name", "confidence"),
+        Index("ix_trends_team_id", "team_id"),
+    )
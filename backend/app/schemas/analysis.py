@@ -20,6 +20,10 @@ class MatchPrediction(BaseModel):
     home_win_probability: float
     draw_probability: float
     away_win_probability: float
+    over_2_5_probability: Optional[float] = None
+    expected_home_goals: Optional[float] = None
+    expected_away_goals: Optional[float] = None
+    most_likely_score: Optional[str] = None
 
 class TrendItem(BaseModel):
     type: str
@@ -32,6 +36,16 @@ class AnalysisResponse(BaseModel):
     away_team: TeamAnalysis
     predictions: MatchPrediction
     trends: List[TrendItem]
+    predicted_at: Optional[datetime] = None
+
+class BatchAnalysisRequest(BaseModel):
+    """Partidas a analisar: lista de IDs ou filtro (janela, liga, status)"""
+    match_ids: Optional[List[int]] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    league: Optional[str] = None
+    status: Optional[str] = None
+    limit: int = Field(500, ge=1, le=5000)
 
 class TrendResponse(BaseModel):
     type: str
@@ -39,6 +53,9 @@ class TrendResponse(BaseModel):
     confidence: float
     matches_count: int
     success_rate: float
+    league: Optional[str] = None
+    team_id: Optional[int] = None
+    streak: Optional[int] = None
 
 class FormItem(BaseModel):
     match_id: int
@@ -52,4 +69,41 @@ class TeamFormResponse(BaseModel):
     team_id: int
     team_name: str
     recent_form: List[FormItem]
-    form_string: str 
\ No newline at end of file
+    form_string: str
+
+class FormWindow(BaseModel):
+    venue: str
+    window: int
+    matches: int
+    wins: int
+    draws: int
+    losses: int
+    goals_for: int
+    goals_against: int
+    points_per_game: float
+    form: str
+
+class TeamFormSummary(BaseModel):
+    team_id: int
+    team_name: Optional[str] = None
+    form_string: str
+    last_match_date: Optional[datetime] = None
+    windows: List[FormWindow]
+
+class ValueBet(BaseModel):
+    match_id: int
+    match_date: datetime
+    league_name: Optional[str] = None
+    home_team: Optional[str] = None
+    away_team: Optional[str] = None
+    market: str
+    selection: str
+    odds: float
+    implied_probability: float
+    model_probability: float
+    bookmaker_margin: float
+    edge: float
+    kelly_stake: float
+    
+    class Config:
+        protected_namespaces = ()
@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+class BulkUpsertResponse(BaseModel):
+    received: int
+    upserted: int
@@ -15,6 +15,24 @@ class MatchBase(BaseModel):
 class MatchCreate(MatchBase):
     external_id: Optional[str] = Field(None, max_length=50)
 
+class MatchBulkItem(MatchCreate):
+    """Partida de POST /matches/bulk: campos não enviados mantêm o valor gravado"""
+    # Resultado (vencedor, total de gols e ambos marcam são derivados do placar)
+    home_goals: Optional[int] = Field(None, ge=0)
+    away_goals: Optional[int] = Field(None, ge=0)
+    
+    # Odds
+    home_odds: Optional[float] = Field(None, gt=0)
+    draw_odds: Optional[float] = Field(None, gt=0)
+    away_odds: Optional[float] = Field(None, gt=0)
+    over_2_5_odds: Optional[float] = Field(None, gt=0)
+    under_2_5_odds: Optional[float] = Field(None, gt=0)
+    btts_yes_odds: Optional[float] = Field(None, gt=0)
+    btts_no_odds: Optional[float] = Field(None, gt=0)
+    
+    # Estatísticas
+    statistics: Optional[Dict[str, Any]] = None
+
 class MatchUpdate(BaseModel):
     league_id: Optional[int] = None
     league_name: Optional[str] = Field(None, max_length=100)
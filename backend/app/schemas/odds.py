@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class OddsSnapshotCreate(BaseModel):
+    match_id: int
+    market: str = Field(..., max_length=20)
+    selection: str = Field(..., max_length=10)
+    bookmaker: str = Field(..., min_length=1, max_length=50)
+    price: float = Field(..., gt=1)
+    recorded_at: Optional[datetime] = None  # Padrão: momento do recebimento
+
+class OddsAppendResponse(BaseModel):
+    received: int
+    appended: int
+    updated: int  # Partidas com a odd atual alterada
+
+class OddsCandle(BaseModel):
+    market: str
+    selection: str
+    bookmaker: str
+    bucket: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    snapshots: int
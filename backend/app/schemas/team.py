@@ -12,7 +12,7 @@ class TeamBase(BaseModel):
     founded: Optional[int] = Field(None, ge=1800, le=2100)
 
 class TeamCreate(TeamBase):
-    pass
+    external_id: Optional[str] = Field(None, max_length=50)
 
 class TeamUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
@@ -33,6 +33,7 @@ class TeamUpdate(BaseModel):
 
 class TeamResponse(TeamBase):
     id: int
+    external_id: Optional[str] = None
     games_played: int
     wins: int
     draws: int
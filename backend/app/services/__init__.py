@@ -0,0 +1 @@
+# Services Module
\ No newline at end of file
@@ -0,0 +1,278 @@
+"""
+Backtest das previsões e das estratégias de aposta
+
+As partidas finalizadas são reproduzidas em ordem de data. A previsão de
+cada partida usa apenas o que era conhecido antes do início: as forças dos
+times vêm de somas acumuladas (ou janelas móveis) por time e mando,
+calculadas de uma vez para todo o histórico com NumPy, e o mesmo modelo de
+Poisson/Dixon-Coles da API gera as probabilidades em lotes. As apostas da
+estratégia escolhida são liquidadas com as odds gravadas nas partidas.
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Sequence, Union
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.match import Match
+from app.services import prediction, value_bets
+from app.services.match_store import _to_datetime64
+
+# Partidas por chamada ao modelo (a grade de placares ocupa ~1 KB por partida)
+PREDICTION_CHUNK_SIZE = 50_000
+
+# Estratégia: (resultado de value_bets.scan, edge mínimo, unidade) -> fração da banca por seleção
+Strategy = Callable[[Dict[str, np.ndarray], float, float], np.ndarray]
+
+def flat_stakes(scan: Dict[str, np.ndarray], min_edge: float, unit: float) -> np.ndarray:
+    """Uma unidade em cada seleção com edge >= ``min_edge``"""
+    return np.where(scan["edge"] >= min_edge, unit, 0.0)
+
+def best_edge_stakes(scan: Dict[str, np.ndarray], min_edge: float, unit: float) -> np.ndarray:
+    """Uma unidade apenas na seleção de maior edge de cada partida"""
+    edge = np.nan_to_num(scan["edge"], nan=-np.inf)
+    stakes = np.zeros(edge.shape)
+    rows = np.arange(edge.shape[0])
+    best = edge.argmax(axis=1)
+    stakes[rows, best] = np.where(edge[rows, best] >= min_edge, unit, 0.0)
+    return stakes
+
+def kelly_stakes(scan: Dict[str, np.ndarray], min_edge: float, unit: float) -> np.ndarray:
+    """Kelly fracionado (``kelly_fraction`` e ``max_stake`` do scan) nas seleções com edge >= ``min_edge``"""
+    return np.where(scan["edge"] >= min_edge, scan["stake"], 0.0)
+
+STRATEGIES: Dict[str, Strategy] = {
+    "flat": flat_stakes,
+    "best": best_edge_stakes,
+    "kelly": kelly_stakes,
+}
+
+def load_history(db: Session, league: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """Partidas finalizadas em colunas, ordenadas por (match_date, id) - uma única consulta"""
+    query = select(
+        Match.id, Match.match_date, Match.home_team_id, Match.away_team_id,
+        Match.home_goals, Match.away_goals,
+        *[getattr(Match, column) for column in value_bets.ODDS_COLUMNS]
+    ).where(
+        Match.status == "finished", Match.home_goals.isnot(None), Match.away_goals.isnot(None)
+    ).order_by(Match.match_date, Match.id)
+    if league:
+        query = query.where(Match.league_name.ilike(f"%{league}%"))
+
+    rows = db.execute(query).all()
+    columns = list(zip(*rows)) if rows else [()] * (6 + len(value_bets.ODDS_COLUMNS))
+    ids, dates, homes, aways, home_goals, away_goals = columns[:6]
+    return {
+        "match_id": np.array(ids, dtype=np.int64),
+        "match_date": _to_datetime64(dates),
+        "home_team_id": np.array(homes, dtype=np.int64),
+        "away_team_id": np.array(aways, dtype=np.int64),
+        "home_goals": np.array(home_goals, dtype=float),
+        "away_goals": np.array(away_goals, dtype=float),
+        "odds": np.array(columns[6:], dtype=float).T.reshape(len(ids), len(value_bets.ODDS_COLUMNS)),
+    }
+
+def prior_sums(keys: np.ndarray, values: np.ndarray, window: Optional[int] = None) -> np.ndarray:
+    """Soma de ``values`` nas linhas anteriores com a mesma chave (linhas em ordem cronológica)
+
+    Com ``window`` apenas as ``window`` linhas anteriores do grupo entram na
+    soma. A linha atual nunca entra.
+    """
+    n = keys.size
+    order = np.lexsort((np.arange(n), keys))
+    sorted_keys = keys[order]
+    totals = np.concatenate(([0.0], np.cumsum(values[order], dtype=float)))
+
+    # Início do grupo de cada linha na ordem por (chave, tempo)
+    starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+    group_start = starts[np.searchsorted(starts, np.arange(n), side="right") - 1]
+    position = np.arange(n)
+    first = group_start if window is None else np.maximum(group_start, position - window)
+
+    sums = np.empty(n)
+    sums[order] = totals[position] - totals[first]
+    return sums
+
+def pre_match_lambdas(
+    history: Dict[str, np.ndarray],
+    window: Optional[int] = None,
+    prior_weight: float = prediction.PRIOR_WEIGHT,
+) -> Dict[str, np.ndarray]:
+    """Gols esperados de cada partida com as forças conhecidas antes do início
+
+    Equivalente a ``fit_team_strengths`` sobre as partidas anteriores (ou as
+    ``window`` últimas do time no mesmo mando), para todas as partidas de uma vez.
+    """
+    home, away = history["home_team_id"], history["away_team_id"]
+    hg, ag = history["home_goals"], history["away_goals"]
+    ones = np.ones(home.size)
+
+    # Médias da liga com as partidas de datas estritamente anteriores
+    previous = np.searchsorted(history["match_date"], history["match_date"], side="left")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_home = np.concatenate(([0.0], np.cumsum(hg)))[previous] / previous
+        avg_away = np.concatenate(([0.0], np.cumsum(ag)))[previous] / previous
+    avg_home = np.maximum(np.where(previous > 0, avg_home, prediction.DEFAULT_HOME_GOALS), 1e-6)
+    avg_away = np.maximum(np.where(previous > 0, avg_away, prediction.DEFAULT_AWAY_GOALS), 1e-6)
+
+    home_games = prior_sums(home, ones, window)
+    away_games = prior_sums(away, ones, window)
+    home_attack = prediction.strength_ratio(prior_sums(home, hg, window), home_games, avg_home, prior_weight)
+    home_defence = prediction.strength_ratio(prior_sums(home, ag, window), home_games, avg_away, prior_weight)
+    away_attack = prediction.strength_ratio(prior_sums(away, ag, window), away_games, avg_away, prior_weight)
+    away_defence = prediction.strength_ratio(prior_sums(away, hg, window), away_games, avg_home, prior_weight)
+
+    return {
+        "home_lambda": avg_home * home_attack * away_defence,
+        "away_lambda": avg_away * away_attack * home_defence,
+        "home_games": home_games,
+        "away_games": away_games,
+    }
+
+def outcomes(home_goals: np.ndarray, away_goals: np.ndarray) -> np.ndarray:
+    """Matriz (partidas x seleções) indicando as seleções vencedoras"""
+    total = home_goals + away_goals
+    btts = (home_goals > 0) & (away_goals > 0)
+    return np.column_stack((
+        home_goals > away_goals, home_goals == away_goals, home_goals < away_goals,
+        total > 2.5, total < 2.5, btts, ~btts,
+    ))
+
+def _model_probabilities(home_lambda: np.ndarray, away_lambda: np.ndarray) -> np.ndarray:
+    chunks = []
+    for start in range(0, home_lambda.size, PREDICTION_CHUNK_SIZE):
+        batch = prediction.predict_from_lambdas(
+            home_lambda[start:start + PREDICTION_CHUNK_SIZE], away_lambda[start:start + PREDICTION_CHUNK_SIZE]
+        )
+        over, btts = batch["over_2_5_probability"], batch["btts_probability"]
+        chunks.append(np.column_stack((
+            batch["home_win_probability"], batch["draw_probability"], batch["away_win_probability"],
+            over, 1 - over, btts, 1 - btts,
+        )))
+    return np.concatenate(chunks) if chunks else np.empty((0, len(value_bets.SELECTIONS)))
+
+def brier_score(probabilities: np.ndarray, won: np.ndarray) -> Optional[float]:
+    """Brier multiclasse médio (soma dos erros quadráticos por partida)"""
+    valid = np.all(np.isfinite(probabilities), axis=1)
+    if not valid.any():
+        return None
+    return round(float(((probabilities[valid] - won[valid]) ** 2).sum(axis=1).mean()), 4)
+
+def max_drawdown(bankroll: np.ndarray) -> float:
+    """Maior queda relativa da banca em relação ao pico anterior (banca inicial = 1)"""
+    curve = np.concatenate(([1.0], bankroll))
+    peaks = np.maximum.accumulate(curve)
+    return float(((peaks - curve) / peaks).max())
+
+def _bankroll(match_returns: np.ndarray, compound: bool) -> np.ndarray:
+    """Banca após cada partida (inicial = 1)"""
+    if compound:
+        return np.cumprod(1 + match_returns)
+    return 1 + np.cumsum(match_returns)
+
+def run_backtest(
+    history: Dict[str, np.ndarray],
+    strategy: Union[str, Strategy] = "flat",
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    min_edge: float = 0.02,
+    min_games: int = 5,
+    window: Optional[int] = None,
+    unit: float = 0.01,
+    compound: bool = False,
+    markets: Optional[Sequence[str]] = None,
+    **scan_options,
+) -> dict:
+    """Reproduzir o histórico e apostar com ``strategy``
+
+    As frações retornadas pela estratégia são da banca inicial ou, com
+    ``compound``, da banca atual. Apenas partidas no período
+    [``date_from``, ``date_to``] e com ao menos ``min_games`` jogos anteriores
+    de cada time no mesmo mando são avaliadas; as anteriores servem apenas de
+    histórico. ``scan_options`` vão para ``value_bets.scan`` (método de
+    remoção da margem, fração de Kelly, aposta máxima).
+    """
+    started = time.perf_counter()
+    if isinstance(strategy, str):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estratégia desconhecida: {strategy}")
+        strategy = STRATEGIES[strategy]
+
+    features = pre_match_lambdas(history, window=window)
+    dates = history["match_date"]
+    evaluated = (features["home_games"] >= min_games) & (features["away_games"] >= min_games)
+    if date_from is not None:
+        evaluated &= dates >= _to_datetime64([date_from])[0]
+    if date_to is not None:
+        evaluated &= dates <= _to_datetime64([date_to])[0]
+    rows = np.flatnonzero(evaluated)
+
+    model = _model_probabilities(features["home_lambda"][rows], features["away_lambda"][rows])
+    odds = history["odds"][rows]
+    won = outcomes(history["home_goals"][rows], history["away_goals"][rows])
+    scan = value_bets.scan(odds, model, **scan_options)
+
+    stakes = np.nan_to_num(strategy(scan, min_edge, unit))
+    stakes[~np.isfinite(scan["edge"])] = 0.0
+    if markets:
+        selected = np.array([market in markets for market, _, _ in value_bets.SELECTIONS])
+        stakes[:, ~selected] = 0.0
+
+    # Retorno por partida em frações da banca; as apostas de uma partida são simultâneas
+    returns = np.where(won, stakes * (np.nan_to_num(odds) - 1), -stakes)
+    bankroll = _bankroll(returns.sum(axis=1), compound)
+
+    # Banca zerada: nenhuma aposta depois da quebra
+    broke = np.flatnonzero(bankroll <= 0)
+    ruined_at = None
+    if broke.size:
+        ruined_at = str(dates[rows[broke[0]]])
+        stakes[broke[0] + 1:] = 0.0
+        returns[broke[0] + 1:] = 0.0
+        bankroll = np.maximum(_bankroll(returns.sum(axis=1), compound), 0.0)
+
+    before = np.concatenate(([1.0], bankroll[:-1])) if compound else np.ones(bankroll.size)
+    staked = float((stakes.sum(axis=1) * before).sum())
+    profit = float(bankroll[-1] - 1) if bankroll.size else 0.0
+
+    placed = stakes > 0
+    bets = int(placed.sum())
+    wins = int((placed & won).sum())
+
+    per_market = {}
+    for market, columns in value_bets.MARKETS.items():
+        market_staked = float((stakes[:, columns].sum(axis=1) * before).sum())
+        market_profit = float((returns[:, columns].sum(axis=1) * before).sum())
+        per_market[market] = {
+            "bets": int(placed[:, columns].sum()),
+            "staked": round(market_staked, 4),
+            "profit": round(market_profit, 4),
+            "roi": round(market_profit / market_staked, 4) if market_staked else None,
+        }
+
+    one_x_two, over_under, btts = (value_bets.MARKETS[market] for market in ("1x2", "over_under_2_5", "btts"))
+    return {
+        "matches": int(history["match_id"].size),
+        "evaluated": int(rows.size),
+        "period": [str(dates[rows[0]]), str(dates[rows[-1]])] if rows.size else None,
+        "bets": bets,
+        "wins": wins,
+        "hit_rate": round(wins / bets, 4) if bets else None,
+        "staked": round(staked, 4),
+        "profit": round(profit, 4),
+        "roi": round(profit / staked, 4) if staked else None,
+        "final_bankroll": round(float(bankroll[-1]), 4) if bankroll.size else 1.0,
+        "max_drawdown": round(max_drawdown(bankroll), 4),
+        "ruined_at": ruined_at,
+        "brier": {
+            "model_1x2": brier_score(model[:, one_x_two], won[:, one_x_two]),
+            "market_1x2": brier_score(scan["fair_probability"][:, one_x_two], won[:, one_x_two]),
+            "model_over_under_2_5": brier_score(model[:, over_under], won[:, over_under]),
+            "model_btts": brier_score(model[:, btts], won[:, btts]),
+        },
+        "markets": per_market,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
@@ -0,0 +1,235 @@
+"""
+Coletor de partidas da API football-data.org
+
+As competições/datas são buscadas em paralelo com um ``httpx.AsyncClient``
+compartilhado (pool de conexões), limitadas por um token bucket derivado de
+RATE_LIMIT_REQUESTS / RATE_LIMIT_WINDOW e com retentativas com backoff
+exponencial. Os resultados são gravados em lote pelo ``external_id``.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services import ingest
+
+logger = logging.getLogger(__name__)
+
+# Status da football-data.org -> status interno
+STATUS_MAP = {
+    "SCHEDULED": "scheduled",
+    "TIMED": "scheduled",
+    "IN_PLAY": "live",
+    "PAUSED": "live",
+    "LIVE": "live",
+    "FINISHED": "finished",
+    "AWARDED": "finished",
+    "POSTPONED": "postponed",
+    "SUSPENDED": "postponed",
+    "CANCELLED": "cancelled",
+}
+
+WINNER_MAP = {"HOME_TEAM": "home", "AWAY_TEAM": "away", "DRAW": "draw"}
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Limitador de taxa assíncrono (token bucket)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "TokenBucket":
+        rate = settings.RATE_LIMIT_REQUESTS / settings.RATE_LIMIT_WINDOW
+        return cls(rate=rate, capacity=max(1, min(settings.RATE_LIMIT_REQUESTS, settings.COLLECTOR_BURST)))
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """Aguardar até haver um token disponível"""
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+class FixtureCollector:
+    """Cliente assíncrono da football-data.org"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        bucket: Optional[TokenBucket] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_retries: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self.base_url = base_url or settings.FOOTBALL_DATA_API_URL
+        self.api_key = api_key if api_key is not None else settings.FOOTBALL_API_KEY
+        self.bucket = bucket or TokenBucket.from_settings()
+        self.transport = transport
+        self.max_retries = settings.COLLECTOR_MAX_RETRIES if max_retries is None else max_retries
+        self.concurrency = concurrency or settings.COLLECTOR_CONCURRENCY
+
+    def _client(self) -> httpx.AsyncClient:
+        headers = {"X-Auth-Token": self.api_key} if self.api_key else {}
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=settings.REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            transport=self.transport,
+        )
+
+    async def _get(self, client: httpx.AsyncClient, path: str, params: dict) -> dict:
+        """GET com limite de taxa e retentativas com backoff exponencial"""
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            try:
+                response = await client.get(path, params=params)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json()
+                retry_after = response.headers.get("Retry-After") or response.headers.get("X-RequestCounter-Reset")
+                error = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code}", request=response.request, response=response
+                )
+            except httpx.TransportError as e:
+                retry_after, error = None, e
+
+            if attempt == self.max_retries:
+                raise error
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else \
+                settings.COLLECTOR_BACKOFF_BASE * (2 ** attempt) + random.uniform(0, 0.1)
+            logger.warning(f"Falha em {path} ({error}); nova tentativa em {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def fetch_competition(
+        self, client: httpx.AsyncClient, competition: str, date_from: date, date_to: date
+    ) -> List[dict]:
+        data = await self._get(
+            client,
+            f"/competitions/{competition}/matches",
+            {"dateFrom": date_from.isoformat(), "dateTo": date_to.isoformat()},
+        )
+        return [parse_match(item, data.get("competition")) for item in data.get("matches", [])]
+
+    async def collect(
+        self, competitions: Iterable[str], date_from: date, date_to: date
+    ) -> Tuple[List[dict], Dict[str, str]]:
+        """Buscar todas as competições em paralelo; retorna (partidas, erros por competição)"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        competitions = list(competitions)
+
+        async with self._client() as client:
+            async def fetch(competition: str):
+                async with semaphore:
+                    return await self.fetch_competition(client, competition, date_from, date_to)
+
+            results = await asyncio.gather(*[fetch(c) for c in competitions], return_exceptions=True)
+
+        matches, errors = [], {}
+        for competition, result in zip(competitions, results):
+            if isinstance(result, Exception):
+                logger.error(f"Erro ao coletar {competition}: {str(result)}")
+                errors[competition] = str(result)
+            else:
+                matches.extend(result)
+        return matches, errors
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+def parse_match(item: dict, competition: Optional[dict] = None) -> dict:
+    """Converter uma partida da football-data.org para os campos de ``Match``"""
+    competition = item.get("competition") or competition or {}
+    season = item.get("season") or {}
+    score = item.get("score") or {}
+    full_time = score.get("fullTime") or {}
+    start, end = season.get("startDate"), season.get("endDate")
+
+    return {
+        "external_id": str(item["id"]),
+        "home_team": item.get("homeTeam") or {},
+        "away_team": item.get("awayTeam") or {},
+        "league_id": competition.get("id"),
+        "league_name": competition.get("name"),
+        "season": f"{start[:4]}-{end[2:4]}" if start and end else None,
+        "round": f"Matchday {item['matchday']}" if item.get("matchday") else item.get("stage"),
+        "match_date": _parse_datetime(item["utcDate"]),
+        "status": STATUS_MAP.get(item.get("status"), "scheduled"),
+        "home_goals": full_time.get("home"),
+        "away_goals": full_time.get("away"),
+        "winner": WINNER_MAP.get(score.get("winner")),
+    }
+
+def upsert_matches(db: Session, matches: List[dict]) -> Dict[str, int]:
+    """Gravar as partidas coletadas pelo external_id (o commit fica com o chamador)
+
+    Times ainda desconhecidos são criados; times existentes não são alterados.
+    """
+    teams = {}
+    for match in matches:
+        for side in ("home_team", "away_team"):
+            team = match[side]
+            if team.get("id") is not None:
+                teams[str(team["id"])] = {
+                    "external_id": str(team["id"]),
+                    "name": team.get("name") or team.get("shortName") or str(team["id"]),
+                    "short_name": (team.get("tla") or "")[:10] or None,
+                    "logo_url": team.get("crest"),
+                    "league_id": match.get("league_id"),
+                    "league_name": match.get("league_name"),
+                }
+    team_ids = ingest.bulk_upsert_teams(db, list(teams.values()), update_existing=False)["ids"]
+
+    rows = []
+    for data in matches:
+        home_id = team_ids.get(str(data["home_team"].get("id")))
+        away_id = team_ids.get(str(data["away_team"].get("id")))
+        if home_id is None or away_id is None:
+            continue
+        row = {key: value for key, value in data.items() if key not in ("home_team", "away_team")}
+        row.update(home_team_id=home_id, away_team_id=away_id)
+        rows.append(row)
+
+    return ingest.bulk_upsert_matches(db, rows)
+
+def collect_matches(
+    db: Session,
+    competitions: Optional[Iterable[str]] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    collector: Optional[FixtureCollector] = None,
+) -> dict:
+    """Coletar e gravar partidas (usado pela tarefa do Celery)"""
+    today = date.today()
+    competitions = competitions or [c.strip() for c in settings.COLLECTOR_COMPETITIONS.split(",") if c.strip()]
+    date_from = date_from or today - timedelta(days=settings.COLLECTOR_DAYS_BACK)
+    date_to = date_to or today + timedelta(days=settings.COLLECTOR_DAYS_AHEAD)
+    collector = collector or FixtureCollector()
+
+    matches, errors = asyncio.run(collector.collect(competitions, date_from, date_to))
+    result = upsert_matches(db, matches)
+    db.commit()
+    # A forma dos times é recalculada pela tarefa refresh_team_form
+    result.pop("team_ids")
+    result.update(fetched=len(matches), errors=errors)
+    return result
@@ -0,0 +1,137 @@
+"""
+Exportação em streaming (NDJSON, CSV e Parquet)
+
+As linhas chegam em lotes de um cursor no servidor e cada lote é convertido
+e enviado antes do próximo ser lido, então a memória usada não depende do
+total de linhas. Os codificadores recebem as colunas (nome, tipo) e um
+iterador assíncrono de lotes de tuplas.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, List, Sequence, Tuple
+
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer
+
+# formato -> (media type, extensão)
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# (nome, tipo) - tipos: int, float, bool, datetime, json, str
+Column = Tuple[str, str]
+Batches = AsyncIterator[Sequence[tuple]]
+
+def column_kind(sql_type) -> str:
+    """Tipo de exportação de um tipo SQLAlchemy"""
+    for base, kind in ((Boolean, "bool"), (Integer, "int"), (Float, "float"), (DateTime, "datetime"), (JSON, "json")):
+        if isinstance(sql_type, base):
+            return kind
+    return "str"
+
+def query_columns(query) -> List[Column]:
+    """Colunas (nome, tipo) de um select"""
+    return [(column.name, column_kind(column.type)) for column in query.selected_columns]
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+async def ndjson_chunks(columns: Sequence[Column], batches: Batches) -> AsyncIterator[bytes]:
+    names = [name for name, _ in columns]
+    async for batch in batches:
+        lines = [
+            json.dumps(dict(zip(names, row)), default=_json_default, ensure_ascii=False, separators=(",", ":"))
+            for row in batch
+        ]
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+
+async def csv_chunks(columns: Sequence[Column], batches: Batches) -> AsyncIterator[bytes]:
+    json_positions = [i for i, (_, kind) in enumerate(columns) if kind == "json"]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    yield buffer.getvalue().encode()
+
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            if json_positions:
+                row = list(row)
+                for i in json_positions:
+                    if row[i] is not None:
+                        row[i] = json.dumps(row[i], ensure_ascii=False)
+            writer.writerow(row)
+        yield buffer.getvalue().encode()
+
+class _ChunkSink(io.RawIOBase):
+    """Destino do ParquetWriter que entrega os bytes escritos a cada row group
+
+    ``tell`` continua contando o total escrito: o rodapé do Parquet guarda
+    offsets absolutos.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+async def parquet_chunks(columns: Sequence[Column], batches: Batches) -> AsyncIterator[bytes]:
+    """Um row group por lote (requer pyarrow)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {
+        "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(),
+        "datetime": pa.timestamp("us", tz="UTC"), "json": pa.string(), "str": pa.string(),
+    }
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in columns])
+    json_positions = {i for i, (_, kind) in enumerate(columns) if kind == "json"}
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        async for batch in batches:
+            if not batch:
+                continue
+            values = list(zip(*batch))
+            arrays = [
+                [None if value is None else json.dumps(value, ensure_ascii=False) for value in values[i]]
+                if i in json_positions else values[i]
+                for i in range(len(columns))
+            ]
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(array, type=field.type) for array, field in zip(arrays, schema)], schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def encode(format: str, columns: Sequence[Column], batches: Batches) -> AsyncIterator[bytes]:
+    """Codificador do formato pedido"""
+    encoders = {"ndjson": ndjson_chunks, "csv": csv_chunks, "parquet": parquet_chunks}
+    return encoders[format](columns, batches)
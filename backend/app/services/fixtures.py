@@ -0,0 +1,196 @@
+"""
+Partidas por dia (/matches/today, /matches/tomorrow e /matches/day/{data})
+
+O "dia" é o dia civil em um fuso horário (FIXTURES_TIMEZONE ou ``tz``): a
+janela vai da meia-noite local até a meia-noite seguinte, convertidas para
+UTC, então a virada de mês e os dias com mudança de horário saem corretos.
+
+Cada dia fica em um hash Redis com a lista JSON das partidas (ordem
+match_date, id) no campo ``*`` e uma lista por liga. A chave inclui uma
+versão própria, incrementada (``invalidate``) só quando jogos ou resultados
+mudam: criação, importação, coleta e alteração de data, status ou placar.
+Odds e previsões, gravadas a todo momento, não invalidam os dias; nelas a
+lista pode ficar atrasada até FIXTURES_CACHE_TTL. A coleta diária recalcula
+os dias coletados logo após gravar (uma consulta para a janela inteira); os
+demais dias são montados na primeira leitura e servidos do Redis a partir
+daí. Essas rotas não passam pelo cache de respostas.
+"""
+
+import json
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_cache_client, get_sync_cache_client
+from app.core.config import settings
+from app.core.serialization import dump_list
+from app.models.match import Match
+from app.schemas.match import MatchResponse
+
+logger = logging.getLogger(__name__)
+
+# Campo do hash com todas as partidas do dia
+ALL_LEAGUES = "*"
+
+COLUMNS = list(MatchResponse.model_fields)
+
+# Campos de MatchUpdate que mudam a lista de jogos do dia ou o resultado
+FIXTURE_FIELDS = frozenset({
+    "home_team_id", "away_team_id", "league_id", "league_name", "season", "round",
+    "match_date", "status", "home_goals", "away_goals", "winner",
+})
+
+def get_timezone(name: Optional[str] = None) -> ZoneInfo:
+    """Fuso pelo nome IANA (padrão FIXTURES_TIMEZONE); ValueError se desconhecido"""
+    try:
+        return ZoneInfo(name or settings.FIXTURES_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Fuso horário desconhecido: {name}") from e
+
+def local_today(tz: ZoneInfo, offset_days: int = 0) -> date:
+    """Data local de hoje (mais ``offset_days`` dias) no fuso"""
+    return datetime.now(tz).date() + timedelta(days=offset_days)
+
+def day_window(day: date, tz: ZoneInfo) -> Tuple[datetime, datetime]:
+    """Início e fim (exclusivo) do dia local, em UTC"""
+    start = datetime.combine(day, time.min, tzinfo=tz)
+    end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+def collected_days(tz: ZoneInfo) -> List[date]:
+    """Dias locais cobertos pela coleta diária (COLLECTOR_DAYS_BACK/AHEAD)"""
+    today = local_today(tz)
+    offsets = range(-settings.COLLECTOR_DAYS_BACK, settings.COLLECTOR_DAYS_AHEAD + 1)
+    return [today + timedelta(days=offset) for offset in offsets]
+
+def _version_key() -> str:
+    return f"{settings.FIXTURES_CACHE_PREFIX}:version"
+
+def _key(tz: ZoneInfo, day: date, version: int) -> str:
+    return f"{settings.FIXTURES_CACHE_PREFIX}:v{version}:{tz.key}:{day.isoformat()}"
+
+async def invalidate():
+    """Descartar os dias em cache (jogos ou resultados alterados)"""
+    if not settings.CACHE_ENABLED:
+        return
+    try:
+        await get_cache_client().incr(_version_key())
+    except redis.RedisError as e:
+        logger.warning(f"Falha ao invalidar partidas por dia: {str(e)}")
+
+def invalidate_sync():
+    """Versão síncrona de ``invalidate`` para tarefas e scripts"""
+    if not settings.CACHE_ENABLED:
+        return
+    try:
+        get_sync_cache_client().incr(_version_key())
+    except redis.RedisError as e:
+        logger.warning(f"Falha ao invalidar partidas por dia: {str(e)}")
+
+def _days_query(first_day: date, last_day: date, tz: ZoneInfo):
+    start, _ = day_window(first_day, tz)
+    _, end = day_window(last_day, tz)
+    return (
+        select(*[getattr(Match, column) for column in COLUMNS])
+        .where(Match.match_date >= start, Match.match_date < end)
+        .order_by(Match.match_date, Match.id)
+    )
+
+def _local_date(value: datetime, tz: ZoneInfo) -> date:
+    # SQLite devolve datas sem fuso (gravadas em UTC)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(tz).date()
+
+def _bucket(rows: Sequence) -> Dict[str, bytes]:
+    """Campos do hash de um dia: todas as partidas e uma lista por liga"""
+    by_league: Dict[str, list] = {}
+    for row in rows:
+        by_league.setdefault(row.league_name or "", []).append(row)
+    bucket = {ALL_LEAGUES: dump_list(MatchResponse, rows)}
+    bucket.update({league: dump_list(MatchResponse, league_rows) for league, league_rows in by_league.items()})
+    return bucket
+
+def _buckets(rows: Sequence, days: Sequence[date], tz: ZoneInfo) -> Dict[date, Dict[str, bytes]]:
+    by_day: Dict[date, list] = {day: [] for day in days}
+    for row in rows:
+        by_day.setdefault(_local_date(row.match_date, tz), []).append(row)
+    return {day: _bucket(by_day[day]) for day in days}
+
+def _fields(fields: Iterable[str], league: Optional[str]) -> List[str]:
+    """Campos lidos: o dia inteiro ou as ligas que contêm ``league`` (sem diferenciar maiúsculas)"""
+    if not league:
+        return [ALL_LEAGUES]
+    needle = league.lower()
+    return [field for field in fields if field != ALL_LEAGUES and needle in field.lower()]
+
+def _merge(parts: List[bytes]) -> bytes:
+    """Juntar as listas de várias ligas mantendo a ordem (match_date, id)"""
+    if len(parts) == 1:
+        return parts[0]
+    items = [item for part in parts for item in json.loads(part)]
+    items.sort(key=lambda item: (item["match_date"], item["id"]))
+    return json.dumps(items, ensure_ascii=False, separators=(",", ":")).encode()
+
+def _store(pipe, key: str, bucket: Dict[str, bytes]):
+    pipe.delete(key)
+    pipe.hset(key, mapping=bucket)
+    pipe.expire(key, settings.FIXTURES_CACHE_TTL)
+
+async def get_day(db, day: date, tz: ZoneInfo, league: Optional[str] = None) -> bytes:
+    """Partidas do dia local em JSON (do Redis; monta e grava o dia se faltar)"""
+    client = get_cache_client()
+    key = None
+    if settings.CACHE_ENABLED:
+        try:
+            key = _key(tz, day, int(await client.get(_version_key()) or 0))
+            if league:
+                fields = _fields([field.decode() for field in await client.hkeys(key)], league)
+                if fields or await client.exists(key):
+                    return _merge(await client.hmget(key, fields) if fields else [b"[]"])
+            else:
+                cached = await client.hget(key, ALL_LEAGUES)
+                if cached is not None:
+                    return cached
+        except redis.RedisError as e:
+            logger.warning(f"Cache de partidas por dia indisponível: {str(e)}")
+            key = None
+
+    bucket = _bucket((await db.execute(_days_query(day, day, tz))).all())
+    if key is not None:
+        try:
+            pipe = client.pipeline()
+            _store(pipe, key, bucket)
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Falha ao gravar partidas do dia {day}: {str(e)}")
+    fields = _fields(bucket, league)
+    return _merge([bucket[field] for field in fields] if fields else [b"[]"])
+
+def refresh_days(db: Session, days: Optional[Sequence[date]] = None, tz: Optional[ZoneInfo] = None) -> int:
+    """Recalcular e gravar os dias informados (padrão: os da coleta diária)
+
+    Uma única consulta para a janela inteira; retorna o número de dias gravados.
+    """
+    if not settings.CACHE_ENABLED:
+        return 0
+    tz = tz or get_timezone()
+    days = sorted(days or collected_days(tz))
+    try:
+        # Versão lida antes da consulta: uma gravação no meio torna estes dias obsoletos
+        client = get_sync_cache_client()
+        version = int(client.get(_version_key()) or 0)
+        buckets = _buckets(db.execute(_days_query(days[0], days[-1], tz)).all(), days, tz)
+        pipe = client.pipeline()
+        for day, bucket in buckets.items():
+            _store(pipe, _key(tz, day, version), bucket)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Falha ao recalcular partidas por dia: {str(e)}")
+        return 0
+    return len(days)
@@ -0,0 +1,210 @@
+"""
+Ingestão em massa de times e partidas
+
+Os registros são gravados em lotes com ``INSERT ... ON CONFLICT
+(external_id) DO UPDATE`` (PostgreSQL e SQLite). Em outros bancos é usado
+um caminho ORM com uma consulta de existentes por lote. Só as colunas
+enviadas são gravadas: campos não informados de um schema (``exclude_unset``)
+recebem o default do modelo em registros novos e mantêm o valor gravado nos
+existentes. Um registro igual ao gravado não é reescrito (nem o
+``updated_at``), para que a coleta repetida não marque tudo como alterado.
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple, Union
+
+from pydantic import BaseModel
+from sqlalchemy import JSON, Text, cast, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.match import Match
+from app.models.team import Team
+from app.services import live, statistics
+
+# Registros por lote (cada lote é uma chamada executemany)
+DEFAULT_CHUNK_SIZE = 5000
+
+# Colunas que nunca são sobrescritas em um conflito
+IMMUTABLE_COLUMNS = {"id", "external_id", "created_at"}
+
+Record = Union[BaseModel, dict]
+
+def _as_dict(record: Record, exclude_unset: bool = False) -> dict:
+    return record.model_dump(exclude_unset=exclude_unset) if isinstance(record, BaseModel) else dict(record)
+
+def _dialect_insert(db: Session):
+    """``insert`` com suporte a ON CONFLICT para o banco da sessão (ou None)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+def _chunks(rows: List[dict], chunk_size: int) -> Iterable[List[dict]]:
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
+
+def _normalize(records: Iterable[Record], model) -> List[dict]:
+    """Converter para dicts apenas com as colunas do modelo que foram enviadas"""
+    valid = set(model.__table__.columns.keys())
+    return [{k: v for k, v in _as_dict(r, exclude_unset=True).items() if k in valid} for r in records]
+
+def _groups(rows: List[dict]) -> Iterable[List[dict]]:
+    """Agrupar pelo conjunto de colunas (o INSERT multi-VALUES exige as mesmas colunas)"""
+    groups: Dict[tuple, List[dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return groups.values()
+
+def _distinct(column, value):
+    """``column IS DISTINCT FROM value`` (o json do PostgreSQL não tem igualdade: compara o texto)"""
+    if isinstance(column.type, JSON):
+        column, value = cast(column, Text), cast(value, Text)
+    return column.is_distinct_from(value)
+
+def _upsert(
+    db: Session, model, rows: List[dict], chunk_size: int, update_existing: bool = True
+) -> Tuple[Dict[str, int], Set[int]]:
+    """Upsert pelo external_id; retorna ({external_id: id}, ids gravados)
+
+    Os ids gravados são os dos registros com external_id inseridos ou
+    alterados; os iguais ao que já estava gravado ficam de fora. Com
+    ``update_existing=False`` registros já existentes são mantidos como
+    estão (apenas os novos são inseridos).
+    """
+    ids: Dict[str, int] = {}
+    written: Set[int] = set()
+    if not rows:
+        return ids, written
+
+    insert = _dialect_insert(db)
+    for chunk in _chunks(rows, chunk_size):
+        keyed = [row for row in chunk if row.get("external_id") is not None]
+        unkeyed = [row for row in chunk if row.get("external_id") is None]
+
+        # Mesmo external_id repetido no lote: os campos são combinados em ordem
+        merged: Dict[str, dict] = {}
+        for row in keyed:
+            merged[row["external_id"]] = {**merged.get(row["external_id"], {}), **row}
+
+        for group in _groups(list(merged.values())):
+            if insert is not None:
+                # executemany: o statement é compilado uma vez e o driver envia
+                # os registros em lotes multi-VALUES ("insertmanyvalues")
+                table = model.__table__
+                stmt = insert(table)
+                columns = [column for column in group[0] if column not in IMMUTABLE_COLUMNS] if update_existing else []
+                if columns:
+                    # Só atualiza (e só devolve no RETURNING) quando alguma coluna muda
+                    update_columns = {column: stmt.excluded[column] for column in columns}
+                    update_columns["updated_at"] = func.now()
+                    changed = or_(*(_distinct(table.c[column], stmt.excluded[column]) for column in columns))
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[table.c.external_id], set_=update_columns, where=changed
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=[table.c.external_id])
+                returned = {
+                    external_id: id_
+                    for id_, external_id in db.execute(stmt.returning(table.c.id, table.c.external_id), group)
+                }
+                ids.update(returned)
+                written.update(returned.values())
+                unchanged = [row["external_id"] for row in group if row["external_id"] not in returned]
+                if unchanged:
+                    ids.update(_ids_by_external_id(db, model, unchanged))
+            else:
+                group_ids, group_written = _orm_upsert(db, model, group, update_existing)
+                ids.update(group_ids)
+                written.update(group_written)
+
+        for group in _groups(unkeyed):
+            db.execute(model.__table__.insert(), group)
+    return ids, written
+
+def _ids_by_external_id(db: Session, model, external_ids: List[str]) -> Dict[str, int]:
+    rows = db.execute(select(model.external_id, model.id).where(model.external_id.in_(external_ids)))
+    return {external_id: id_ for external_id, id_ in rows}
+
+def _orm_upsert(
+    db: Session, model, rows: List[dict], update_existing: bool = True
+) -> Tuple[Dict[str, int], Set[int]]:
+    """Fallback para bancos sem ON CONFLICT"""
+    existing = {
+        obj.external_id: obj
+        for obj in db.execute(
+            select(model).where(model.external_id.in_([row["external_id"] for row in rows]))
+        ).scalars()
+    }
+    written = []
+    for row in rows:
+        obj = existing.get(row["external_id"])
+        if obj is None:
+            obj = model(**row)
+            db.add(obj)
+            existing[row["external_id"]] = obj
+            written.append(obj)
+        elif update_existing:
+            changed = False
+            for column, value in row.items():
+                if column not in IMMUTABLE_COLUMNS and getattr(obj, column) != value:
+                    setattr(obj, column, value)
+                    changed = True
+            if changed:
+                written.append(obj)
+    db.flush()
+    return {external_id: obj.id for external_id, obj in existing.items()}, {obj.id for obj in written}
+
+def bulk_upsert_teams(
+    db: Session,
+    teams: Sequence[Record],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    update_existing: bool = True,
+) -> Dict[str, Any]:
+    """Gravar times em lote (o commit fica com o chamador)
+
+    Retorna ``received``, ``upserted`` (inseridos ou alterados, como em
+    ``bulk_upsert_matches``) e ``ids``: {external_id: id} de todos os times
+    com external_id do lote, inclusive os que já estavam gravados.
+    """
+    rows = _normalize(teams, Team)
+    ids, written = _upsert(db, Team, rows, chunk_size, update_existing)
+    unkeyed = sum(1 for row in rows if row.get("external_id") is None)
+    return {"received": len(rows), "upserted": len(written) + unkeyed, "ids": ids}
+
+def bulk_upsert_matches(
+    db: Session,
+    matches: Sequence[Record],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    update_statistics: bool = True,
+) -> Dict[str, Any]:
+    """Gravar partidas em lote (o commit fica com o chamador)
+
+    Vencedor, total de gols e ambos marcam são derivados do placar, só
+    quando o placar vem no registro (sem placar os valores gravados ficam). Com
+    ``update_statistics`` as estatísticas dos times envolvidos são
+    recalculadas em SQL ao final, em vez de uma atualização por partida. As
+    partidas com external_id inseridas ou alteradas ficam registradas para o
+    feed ao vivo; ``upserted`` conta só as gravadas (as iguais ao banco não)
+    e ``team_ids`` traz os times dessas partidas.
+    """
+    rows = [
+        {**row, **statistics.result_fields(row.get("home_goals"), row.get("away_goals"))}
+        for row in _normalize(matches, Match)
+    ]
+
+    ids, written = _upsert(db, Match, rows, chunk_size)
+    live.record(db, written)
+
+    changed = [
+        row for row in rows
+        if row.get("external_id") is None or ids[row["external_id"]] in written
+    ]
+    team_ids = {row["home_team_id"] for row in changed} | {row["away_team_id"] for row in changed}
+    if update_statistics and team_ids:
+        statistics.recompute_team_statistics(db, team_ids)
+
+    unkeyed = sum(1 for row in rows if row.get("external_id") is None)
+    return {"received": len(rows), "upserted": len(written) + unkeyed, "team_ids": sorted(team_ids)}
@@ -0,0 +1,232 @@
+"""
+Feed ao vivo das alterações de partidas (SSE e WebSocket)
+
+Publicação: quem altera partidas registra os IDs na sessão (``record``) e,
+depois do commit, ``publish``/``publish_sync`` lê as colunas ao vivo dessas
+partidas (uma consulta por lote gravado) e publica no canal Redis
+LIVE_CHANNEL.
+
+Consumo: cada processo da API mantém uma única inscrição no canal
+(``LiveFeed``) e distribui os eventos em memória para as conexões,
+indexadas por liga e por partida; o banco não é consultado por cliente. O
+filtro de liga segue o das listagens (ILIKE): o termo pode ser parte do
+nome, sem diferenciar maiúsculas. Cada
+conexão acumula apenas o último estado de cada partida e envia a cada
+LIVE_COALESCE_INTERVAL segundos, então uma rajada de atualizações da mesma
+partida vira uma única mensagem.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_cache_client, get_sync_cache_client
+from app.core.config import settings
+from app.models.match import Match
+
+logger = logging.getLogger(__name__)
+
+# Colunas enviadas a cada alteração
+LIVE_COLUMNS = (
+    "id", "league_name", "home_team_id", "away_team_id", "match_date", "status",
+    "home_goals", "away_goals", "winner",
+    "home_odds", "draw_odds", "away_odds", "over_2_5_odds", "under_2_5_odds", "btts_yes_odds", "btts_no_odds",
+    "updated_at",
+)
+
+# Eventos por mensagem publicada
+PUBLISH_CHUNK_SIZE = 500
+
+PENDING_KEY = "live_match_ids"
+
+# Publicação
+
+def record(db: Session, match_ids: Iterable[int]):
+    """Registrar partidas alteradas na sessão (publicadas depois do commit)"""
+    db.info.setdefault(PENDING_KEY, set()).update(match_ids)
+
+def _pending(db) -> List[int]:
+    return sorted(db.info.pop(PENDING_KEY, ()))
+
+def _live_query(match_ids: List[int]):
+    return select(*[getattr(Match, column) for column in LIVE_COLUMNS]).where(Match.id.in_(match_ids))
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+def _messages(rows) -> List[str]:
+    events = [dict(zip(LIVE_COLUMNS, row)) for row in rows]
+    return [
+        json.dumps({"events": events[start:start + PUBLISH_CHUNK_SIZE]}, default=_json_default)
+        for start in range(0, len(events), PUBLISH_CHUNK_SIZE)
+    ]
+
+def _chunks(match_ids: List[int]) -> Iterable[List[int]]:
+    for start in range(0, len(match_ids), PUBLISH_CHUNK_SIZE):
+        yield match_ids[start:start + PUBLISH_CHUNK_SIZE]
+
+async def publish(db) -> int:
+    """Publicar as partidas registradas na sessão assíncrona (após o commit)"""
+    match_ids = _pending(db)
+    if not match_ids or not settings.LIVE_ENABLED:
+        return 0
+    client = get_cache_client()
+    try:
+        for chunk in _chunks(match_ids):
+            rows = (await db.execute(_live_query(chunk))).all()
+            for message in _messages(rows):
+                await client.publish(settings.LIVE_CHANNEL, message)
+    except redis.RedisError as e:
+        logger.warning(f"Falha ao publicar alterações de partidas: {str(e)}")
+    return len(match_ids)
+
+def publish_sync(db: Session) -> int:
+    """Publicar as partidas registradas na sessão (tarefas do Celery, após o commit)"""
+    match_ids = _pending(db)
+    if not match_ids or not settings.LIVE_ENABLED:
+        return 0
+    client = get_sync_cache_client()
+    try:
+        for chunk in _chunks(match_ids):
+            for message in _messages(db.execute(_live_query(chunk)).all()):
+                client.publish(settings.LIVE_CHANNEL, message)
+    except redis.RedisError as e:
+        logger.warning(f"Falha ao publicar alterações de partidas: {str(e)}")
+    return len(match_ids)
+
+# Consumo
+
+class Subscription:
+    """Conexão de um cliente: filtros e últimos estados pendentes por partida"""
+
+    def __init__(self, leagues: Optional[Iterable[str]] = None, match_ids: Optional[Iterable[int]] = None):
+        # Termos de liga em minúsculas (comparados por substring)
+        self.leagues: Set[str] = {league.strip().lower() for league in leagues or () if league.strip()}
+        self.match_ids: Set[int] = set(match_ids or ())
+        self.pending: Dict[int, dict] = {}
+        self.ready = asyncio.Event()
+
+    def push(self, event: dict):
+        self.pending[event["id"]] = event
+        self.ready.set()
+
+    async def batches(
+        self,
+        interval: Optional[float] = None,
+        heartbeat: Optional[float] = None,
+    ) -> AsyncIterator[List[dict]]:
+        """Lotes de eventos agrupados; lote vazio a cada ``heartbeat`` segundos sem eventos"""
+        interval = settings.LIVE_COALESCE_INTERVAL if interval is None else interval
+        heartbeat = settings.LIVE_HEARTBEAT_INTERVAL if heartbeat is None else heartbeat
+        while True:
+            try:
+                await asyncio.wait_for(self.ready.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield []
+                continue
+            if interval:
+                await asyncio.sleep(interval)
+            self.ready.clear()
+            events, self.pending = list(self.pending.values()), {}
+            yield events
+
+class LiveFeed:
+    """Inscrição única no canal Redis deste processo, distribuída às conexões"""
+
+    def __init__(self):
+        self._unfiltered: Set[Subscription] = set()
+        self._by_league: Dict[str, Set[Subscription]] = {}
+        self._by_match: Dict[int, Set[Subscription]] = {}
+        # Liga do evento (minúsculas) -> termos inscritos contidos nela;
+        # descartado quando um termo entra ou sai do índice
+        self._league_terms: Dict[str, List[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(
+        self,
+        leagues: Optional[Iterable[str]] = None,
+        match_ids: Optional[Iterable[int]] = None,
+    ) -> Subscription:
+        subscription = Subscription(leagues, match_ids)
+        if not subscription.leagues and not subscription.match_ids:
+            self._unfiltered.add(subscription)
+        for league in subscription.leagues:
+            if league not in self._by_league:
+                self._league_terms.clear()
+            self._by_league.setdefault(league, set()).add(subscription)
+        for match_id in subscription.match_ids:
+            self._by_match.setdefault(match_id, set()).add(subscription)
+        self._ensure_listening()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._unfiltered.discard(subscription)
+        for index, keys in ((self._by_league, subscription.leagues), (self._by_match, subscription.match_ids)):
+            for key in keys:
+                subscribers = index.get(key)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del index[key]
+                        if index is self._by_league:
+                            self._league_terms.clear()
+
+    def _terms_for(self, league: Optional[str]) -> List[str]:
+        """Termos de liga inscritos que fazem parte do nome ``league``"""
+        if not league or not self._by_league:
+            return []
+        name = league.lower()
+        terms = self._league_terms.get(name)
+        if terms is None:
+            terms = self._league_terms[name] = [term for term in self._by_league if term in name]
+        return terms
+
+    def dispatch(self, events: List[dict]):
+        """Entregar eventos às conexões interessadas (todas, da liga ou da partida)"""
+        for event in events:
+            targets = set(self._unfiltered)
+            for term in self._terms_for(event.get("league_name")):
+                targets.update(self._by_league[term])
+            targets.update(self._by_match.get(event.get("id"), ()))
+            for subscription in targets:
+                subscription.push(event)
+
+    def _ensure_listening(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = get_cache_client().pubsub()
+                await pubsub.subscribe(settings.LIVE_CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.dispatch(json.loads(message["data"])["events"])
+                finally:
+                    await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except (redis.RedisError, ValueError, KeyError) as e:
+                logger.warning(f"Feed ao vivo: reconectando ao Redis ({str(e)})")
+                await asyncio.sleep(1)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+feed = LiveFeed()
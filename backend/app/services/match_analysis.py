@@ -0,0 +1,129 @@
+"""
+Análise em lote das partidas agendadas
+
+As forças dos times são estimadas uma única vez (a partir do armazenamento
+colunar) e as previsões são calculadas para um lote inteiro de partidas de
+uma vez. O resultado é gravado de volta com um UPDATE executemany por lote
+(``prediction``, ``predicted_result``, ``prediction_confidence`` e
+``analysis_notes``), para que /analysis/match apenas leia a previsão.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.match import Match
+from app.services import match_store, prediction
+from app.services.trends import league_filter
+
+def analysis_window(
+    date_from: Optional[datetime] = None, date_to: Optional[datetime] = None
+) -> Tuple[datetime, datetime]:
+    """Janela padrão: de agora até ANALYSIS_WINDOW_DAYS dias à frente"""
+    now = datetime.now(timezone.utc)
+    return date_from or now, date_to or now + timedelta(days=settings.ANALYSIS_WINDOW_DAYS)
+
+def _upcoming(date_from: datetime, date_to: datetime, leagues: Optional[List[Optional[str]]] = None) -> list:
+    conditions = [Match.status == "scheduled", Match.match_date >= date_from, Match.match_date <= date_to]
+    if leagues is not None:
+        conditions.append(league_filter(Match.league_name, leagues))
+    return conditions
+
+def upcoming_counts_by_league(
+    db: Session, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None
+) -> Dict[Optional[str], int]:
+    """Número de partidas agendadas na janela, por liga"""
+    date_from, date_to = analysis_window(date_from, date_to)
+    rows = db.execute(
+        select(Match.league_name, func.count()).where(*_upcoming(date_from, date_to)).group_by(Match.league_name)
+    )
+    return dict(rows.all())
+
+def prediction_updates(
+    strengths: prediction.TeamStrengths,
+    match_ids: Sequence[int],
+    home_ids: Sequence[int],
+    away_ids: Sequence[int],
+    predicted_at: datetime,
+) -> List[dict]:
+    """Valores a gravar para cada partida do lote (uma única chamada ao modelo)"""
+    batch = prediction.predict_fixtures(strengths, home_ids, away_ids)
+    updates = []
+    for i, match_id in enumerate(match_ids):
+        values = prediction.prediction_at(batch, i)
+        outcomes = {
+            "home": values["home_win_probability"],
+            "draw": values["draw_probability"],
+            "away": values["away_win_probability"],
+        }
+        result = max(outcomes, key=outcomes.get)
+        updates.append({
+            "match_id": match_id,
+            "prediction": values,
+            "predicted_result": result,
+            "prediction_confidence": outcomes[result],
+            "analysis_notes": (
+                f"Placar mais provável {values['most_likely_score']}; "
+                f"mais de 2.5 gols: {values['over_2_5_probability']:.0%}; "
+                f"ambos marcam: {values['btts_probability']:.0%}"
+            ),
+            "predicted_at": predicted_at,
+        })
+    return updates
+
+# UPDATE por id executado em executemany. ``updated_at`` é mantido: a previsão
+# é um dado derivado e não deve marcar a partida como alterada (o que
+# dispararia estatísticas, trends e o armazenamento colunar).
+PREDICTION_COLUMNS = ("prediction", "predicted_result", "prediction_confidence", "analysis_notes", "predicted_at")
+
+_UPDATE_PREDICTION = update(Match.__table__).where(
+    Match.__table__.c.id == bindparam("b_match_id")
+).values(
+    {
+        **{column: bindparam(f"b_{column}") for column in PREDICTION_COLUMNS},
+        "updated_at": Match.__table__.c.updated_at,
+    }
+)
+
+def analyze_upcoming(
+    db: Session,
+    leagues: Optional[Iterable[Optional[str]]] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    strengths: Optional[prediction.TeamStrengths] = None,
+) -> Dict[str, int]:
+    """Analisar as partidas agendadas da janela em lotes (commit a cada lote)"""
+    date_from, date_to = analysis_window(date_from, date_to)
+    batch_size = batch_size or settings.ANALYSIS_BATCH_SIZE
+    if leagues is not None:
+        leagues = list(leagues)
+    if strengths is None:
+        store = match_store.get_match_store(db, max_age=0)
+        strengths = prediction.fit_team_strengths(*store.results())
+
+    predicted_at = datetime.now(timezone.utc)
+    analyzed = batches = last_id = 0
+    while True:
+        # Lotes por keyset no id: cada lote é uma consulta indexada curta
+        rows = db.execute(
+            select(Match.id, Match.home_team_id, Match.away_team_id)
+            .where(*_upcoming(date_from, date_to, leagues), Match.id > last_id)
+            .order_by(Match.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        match_ids, home_ids, away_ids = zip(*rows)
+        updates = prediction_updates(strengths, match_ids, home_ids, away_ids, predicted_at)
+        db.execute(_UPDATE_PREDICTION, [{f"b_{key}": value for key, value in row.items()} for row in updates])
+        db.commit()
+
+        analyzed += len(rows)
+        batches += 1
+        last_id = match_ids[-1]
+
+    return {"analyzed": analyzed, "batches": batches}
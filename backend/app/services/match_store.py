@@ -0,0 +1,264 @@
+"""
+Armazenamento colunar em memória das partidas finalizadas
+
+Para as análises (forma, trends, previsões) bastam ids, data, liga e placar.
+Em vez de materializar objetos ``Match`` do ORM, as partidas finalizadas são
+carregadas em arrays NumPy compactos (ids dos times em int32, gols em int8,
+datas em datetime64) e atualizadas de forma incremental: cada ``refresh``
+busca apenas as partidas alteradas desde a última leitura (índice
+``ix_matches_changed_at``).
+
+Os arrays ficam ordenados por (match_date, id); a partida mais recente é a
+última.
+
+A carga inicial é esperada por todos: quem chega durante ela aguarda o fim
+(cedendo o loop quando roda em ``run_sync`` da sessão assíncrona) em vez de
+receber um armazenamento vazio. Depois dela, um refresh em andamento não
+bloqueia os leitores, que seguem com os dados atuais.
+"""
+
+import asyncio
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.exc import MissingGreenlet
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+from app.core.config import settings
+from app.models.match import Match
+
+_EMPTY_DATES = np.array([], dtype="datetime64[us]")
+
+# Transações que começaram antes da última leitura podem gravar um
+# ``updated_at`` anterior à marca; relemos essa margem a cada refresh.
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+# Intervalo entre verificações enquanto outra chamada faz a carga inicial
+LOAD_POLL_INTERVAL = 0.01
+
+def _pause(seconds: float):
+    """Esperar sem travar o loop: cede a vez no greenlet de ``run_sync`` ou dorme na thread"""
+    try:
+        await_only(asyncio.sleep(seconds))
+    except MissingGreenlet:
+        time.sleep(seconds)
+
+def _to_datetime64(values: Sequence[datetime]) -> np.ndarray:
+    """Datas (com ou sem fuso) como datetime64 em UTC"""
+    return np.array(
+        [(value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value) for value in values],
+        dtype="datetime64[us]",
+    )
+
+def _insert_positions(
+    dates: np.ndarray, ids: np.ndarray, new_dates: np.ndarray, new_ids: np.ndarray
+) -> np.ndarray:
+    """Posições de inserção que mantêm a ordem por (match_date, id)"""
+    low = np.searchsorted(dates, new_dates, side="left")
+    high = np.searchsorted(dates, new_dates, side="right")
+    # Empates de data (mesmo horário de início) são desempatados pelo id
+    for i in np.flatnonzero(high > low):
+        low[i] += np.searchsorted(ids[low[i]:high[i]], new_ids[i])
+    return low
+
+class MatchStore:
+    """Partidas finalizadas em colunas NumPy"""
+
+    def __init__(self):
+        self.ids = np.array([], dtype=np.int64)
+        self.match_date = _EMPTY_DATES
+        self.home_team_id = np.array([], dtype=np.int32)
+        self.away_team_id = np.array([], dtype=np.int32)
+        self.home_goals = np.array([], dtype=np.int8)
+        self.away_goals = np.array([], dtype=np.int8)
+        self.league_code = np.array([], dtype=np.int16)
+        self.leagues: List[Optional[str]] = []
+        self._league_codes: Dict[Optional[str], int] = {}
+
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at: Optional[float] = None
+        self._recent: Dict[int, Tuple[int, datetime]] = {}  # id -> (hash da linha, alteração) na margem
+        self._team_index: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return int(self.ids.size)
+
+    @property
+    def loaded(self) -> bool:
+        """Se a carga inicial já terminou"""
+        return self.refreshed_at is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelas colunas"""
+        return sum(array.nbytes for array in (
+            self.ids, self.match_date, self.home_team_id, self.away_team_id,
+            self.home_goals, self.away_goals, self.league_code,
+        ))
+
+    def _code(self, league: Optional[str]) -> int:
+        if league not in self._league_codes:
+            self._league_codes[league] = len(self.leagues)
+            self.leagues.append(league)
+        return self._league_codes[league]
+
+    def refresh(self, db: Session, full: bool = False) -> int:
+        """Carregar as partidas alteradas desde a última leitura; retorna quantas foram aplicadas
+
+        Na primeira chamada (ou com ``full=True``) todas as partidas
+        finalizadas são carregadas. Se outro refresh estiver em andamento,
+        retorna imediatamente e os leitores continuam com os dados atuais;
+        durante a carga inicial, espera que ela termine (e a refaz se falhou).
+        """
+        while not self._lock.acquire(blocking=False):
+            if self.loaded:
+                return 0
+            _pause(LOAD_POLL_INTERVAL)
+        try:
+            changed_at = func.coalesce(Match.updated_at, Match.created_at)
+            query = select(
+                Match.id, Match.match_date, Match.home_team_id, Match.away_team_id,
+                Match.home_goals, Match.away_goals, Match.league_name, Match.status, changed_at,
+            )
+            incremental = self.watermark is not None and not full
+            if incremental:
+                query = query.where(changed_at >= self.watermark - WATERMARK_OVERLAP)
+            else:
+                query = query.where(
+                    Match.status == "finished", Match.home_goals.isnot(None), Match.away_goals.isnot(None)
+                )
+            rows = db.execute(query).all()
+            if incremental:
+                # Linhas da margem já aplicadas sem alteração são ignoradas
+                rows = [row for row in rows if self._recent.get(row[0]) != (hash(tuple(row)), row[-1])]
+            if rows or not incremental:
+                self._merge(rows, replace=not incremental)
+            self.refreshed_at = time.monotonic()
+            return len(rows)
+        finally:
+            self._lock.release()
+
+    def _merge(self, rows, replace: bool):
+        if rows:
+            ids, dates, homes, aways, home_goals, away_goals, leagues, statuses, changed = zip(*rows)
+        else:
+            ids = dates = homes = aways = home_goals = away_goals = leagues = statuses = changed = ()
+
+        ids = np.array(ids, dtype=np.int64)
+        finished = np.array(
+            [status == "finished" and hg is not None and ag is not None
+             for status, hg, ag in zip(statuses, home_goals, away_goals)],
+            dtype=bool,
+        )
+        new = {
+            "ids": ids[finished],
+            "match_date": _to_datetime64(dates)[finished] if len(dates) else _EMPTY_DATES,
+            "home_team_id": np.array(homes, dtype=np.int32)[finished],
+            "away_team_id": np.array(aways, dtype=np.int32)[finished],
+            "home_goals": np.array([g or 0 for g in home_goals], dtype=np.int8)[finished],
+            "away_goals": np.array([g or 0 for g in away_goals], dtype=np.int8)[finished],
+            "league_code": np.array([self._code(league) for league in leagues], dtype=np.int16)[finished],
+        }
+        order = np.lexsort((new["ids"], new["match_date"]))
+        new = {name: values[order] for name, values in new.items()}
+
+        if replace:
+            columns = new
+            recent = {}
+        else:
+            # Partidas relidas substituem a versão anterior (ou saem, se não estão mais finalizadas)
+            keep = ~np.isin(self.ids, ids)
+            base = {name: getattr(self, name)[keep] for name in new}
+            positions = _insert_positions(base["match_date"], base["ids"], new["match_date"], new["ids"])
+            columns = {name: np.insert(base[name], positions, values) for name, values in new.items()}
+            recent = dict(self._recent)
+
+        watermark = max([*changed, *([self.watermark] if self.watermark and not replace else [])], default=None)
+        if not replace:
+            recent.update((row[0], (hash(tuple(row)), row[-1])) for row in rows)
+        if watermark is not None:
+            recent = {id_: seen for id_, seen in recent.items() if seen[1] >= watermark - WATERMARK_OVERLAP}
+
+        # Troca em um único bloco síncrono: leitores veem os dados antigos ou os novos
+        for name, values in columns.items():
+            setattr(self, name, values)
+        self._team_index = None
+        self._recent = recent
+        self.watermark = watermark
+
+    def is_stale(self, max_age: Optional[float] = None) -> bool:
+        max_age = settings.MATCH_STORE_REFRESH_INTERVAL if max_age is None else max_age
+        return self.refreshed_at is None or time.monotonic() - self.refreshed_at >= max_age
+
+    def league_mask(self, league: Optional[str] = None) -> np.ndarray:
+        """Partidas das ligas que contêm ``league`` (sem diferenciar maiúsculas, como ILIKE)"""
+        if not league:
+            return np.ones(self.ids.size, dtype=bool)
+        codes = [code for code, name in enumerate(self.leagues) if name and league.lower() in name.lower()]
+        return np.isin(self.league_code, codes)
+
+    def results(self, league: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(mandantes, visitantes, gols mandante, gols visitante) das partidas finalizadas"""
+        mask = self.league_mask(league) if league else slice(None)
+        return self.home_team_id[mask], self.away_team_id[mask], self.home_goals[mask], self.away_goals[mask]
+
+    def _build_team_index(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Posições das partidas agrupadas por time (ordem cronológica dentro do grupo)"""
+        if self._team_index is None:
+            n = self.ids.size
+            teams = np.concatenate((self.home_team_id, self.away_team_id))
+            positions = np.concatenate((np.arange(n), np.arange(n)))
+            # Por time e, dentro do time, pela posição (ordem cronológica)
+            order = np.lexsort((positions, teams))
+            self._team_index = (teams[order], positions[order], order < n)
+        return self._team_index
+
+    def team_results(self, team_id: int, limit: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Partidas de um time, da mais recente para a mais antiga, na perspectiva do time"""
+        teams, positions, is_home = self._build_team_index()
+        start, end = np.searchsorted(teams, [team_id, team_id + 1])
+        if limit is not None:
+            start = max(start, end - limit)
+        pos, home = positions[start:end][::-1], is_home[start:end][::-1]
+        return {
+            "match_id": self.ids[pos],
+            "match_date": self.match_date[pos],
+            "is_home": home,
+            "opponent_id": np.where(home, self.away_team_id[pos], self.home_team_id[pos]),
+            "goals_for": np.where(home, self.home_goals[pos], self.away_goals[pos]),
+            "goals_against": np.where(home, self.away_goals[pos], self.home_goals[pos]),
+        }
+
+    def to_frame(self):
+        """DataFrame do pandas com as colunas (liga como categoria)"""
+        import pandas as pd
+
+        leagues = np.array(self.leagues, dtype=object)
+        return pd.DataFrame({
+            "id": self.ids,
+            "match_date": self.match_date,
+            "home_team_id": self.home_team_id,
+            "away_team_id": self.away_team_id,
+            "home_goals": self.home_goals,
+            "away_goals": self.away_goals,
+            "league_name": pd.Series(leagues[self.league_code] if leagues.size else [], dtype="category"),
+        })
+
+# Um armazenamento por processo (API ou worker do Celery)
+_store = MatchStore()
+
+def get_match_store(db: Session, max_age: Optional[float] = None) -> MatchStore:
+    """Armazenamento do processo, atualizado se a última leitura for mais antiga que ``max_age``
+
+    Nunca retorna antes da carga inicial: espera a carga em andamento, se houver.
+    """
+    if _store.is_stale(max_age):
+        _store.refresh(db)
+    return _store
@@ -0,0 +1,197 @@
+"""
+Histórico de odds (apenas inserção)
+
+Cada coleta de odds vira linhas em ``odds_snapshots`` (partida, mercado,
+seleção, casa, instante, preço), gravadas em lotes executemany com ``ON
+CONFLICT DO NOTHING``: reenviar um lote não duplica o histórico e nenhuma
+linha existente é reescrita. A tabela ``matches`` só guarda a odd atual de
+cada seleção e só é tocada quando o preço muda e não há no histórico um
+preço mais recente (lotes antigos reenviados não voltam a odd atual).
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.match import Match
+from app.models.odds import OddsSnapshot
+from app.services import live
+from app.services.ingest import DEFAULT_CHUNK_SIZE, Record, _as_dict, _chunks, _dialect_insert
+from app.services.value_bets import SELECTIONS
+
+# Intervalos aceitos na consulta agregada (segundos)
+INTERVALS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "6h": 21600, "1d": 86400}
+
+# (mercado, seleção) -> coluna com a odd atual em Match
+CURRENT_ODDS_COLUMNS = {(market, selection): column for market, selection, column in SELECTIONS}
+CURRENT_ODDS_SELECTIONS = {column: key for key, column in CURRENT_ODDS_COLUMNS.items()}
+
+def _utc(value: datetime) -> datetime:
+    # SQLite devolve datas sem fuso (gravadas em UTC)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+class UnknownMatchesError(ValueError):
+    """Odds de partidas inexistentes (a chave estrangeira rejeitaria o lote)"""
+
+    def __init__(self, match_ids: List[int]):
+        self.match_ids = match_ids
+        super().__init__(f"Partidas não encontradas: {', '.join(map(str, match_ids))}")
+
+def missing_matches(db: Session, match_ids, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[int]:
+    """IDs de ``match_ids`` que não existem em ``matches``"""
+    match_ids = sorted(set(match_ids))
+    found = set()
+    for chunk in _chunks(match_ids, chunk_size):
+        found.update(db.execute(select(Match.id).where(Match.id.in_(chunk))).scalars())
+    return [match_id for match_id in match_ids if match_id not in found]
+
+def _normalize(snapshots: Sequence[Record], received_at: datetime) -> List[dict]:
+    rows = []
+    for snapshot in snapshots:
+        row = _as_dict(snapshot)
+        recorded_at = row.get("recorded_at") or received_at
+        if recorded_at.tzinfo is not None:
+            recorded_at = recorded_at.astimezone(timezone.utc)
+        rows.append({
+            "match_id": row["match_id"],
+            "market": row["market"],
+            "selection": row["selection"],
+            "bookmaker": row["bookmaker"],
+            "recorded_at": recorded_at,
+            "price": row["price"],
+        })
+    return rows
+
+def latest_prices(rows: Sequence[dict]) -> Dict[str, List[dict]]:
+    """Último preço de cada (partida, seleção) conhecida do lote, por coluna de Match
+
+    Preços de casas diferentes no mesmo instante: vale o maior.
+    """
+    latest: Dict[Tuple[int, str], Tuple[datetime, float]] = {}
+    for row in rows:
+        column = CURRENT_ODDS_COLUMNS.get((row["market"], row["selection"]))
+        if column is None:
+            continue
+        key = (row["match_id"], column)
+        seen = latest.get(key)
+        recorded = (_utc(row["recorded_at"]), row["price"])
+        if seen is None or recorded > seen:
+            latest[key] = recorded
+
+    by_column: Dict[str, List[dict]] = {}
+    for (match_id, column), (recorded_at, price) in latest.items():
+        by_column.setdefault(column, []).append(
+            {"b_match_id": match_id, "b_price": price, "b_recorded_at": recorded_at}
+        )
+    return by_column
+
+def current_price_changes(db: Session, rows: Sequence[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, List[dict]]:
+    """Odds atuais alteradas pelo lote, por coluna de Match
+
+    Do último preço de cada (partida, seleção) do lote ficam só os diferentes
+    da odd atual e sem snapshot mais recente no histórico (duas consultas por
+    bloco de partidas: odds atuais e último instante gravado por seleção).
+    """
+    latest = latest_prices(rows)
+    if not latest:
+        return {}
+    columns = list(latest)
+    match_ids = sorted({value["b_match_id"] for values in latest.values() for value in values})
+    table = Match.__table__
+    snapshots = OddsSnapshot.__table__
+
+    current: Dict[int, tuple] = {}
+    newest: Dict[Tuple[int, str, str], datetime] = {}
+    for chunk in _chunks(match_ids, chunk_size):
+        current.update(
+            (row[0], tuple(row[1:]))
+            for row in db.execute(select(table.c.id, *[table.c[column] for column in columns]).where(table.c.id.in_(chunk)))
+        )
+        newest.update(
+            ((match_id, market, selection), _utc(recorded_at))
+            for match_id, market, selection, recorded_at in db.execute(
+                select(snapshots.c.match_id, snapshots.c.market, snapshots.c.selection, func.max(snapshots.c.recorded_at))
+                .where(snapshots.c.match_id.in_(chunk))
+                .group_by(snapshots.c.match_id, snapshots.c.market, snapshots.c.selection)
+            )
+        )
+
+    changes: Dict[str, List[dict]] = {}
+    for position, column in enumerate(columns):
+        market, selection = CURRENT_ODDS_SELECTIONS[column]
+        for value in latest[column]:
+            match_id = value["b_match_id"]
+            if match_id not in current or current[match_id][position] == value["b_price"]:
+                continue
+            stored = newest.get((match_id, market, selection))
+            if stored is not None and stored > value["b_recorded_at"]:
+                continue
+            changes.setdefault(column, []).append(value)
+    return changes
+
+def _update_current(column: str):
+    """UPDATE da odd atual (``updated_at`` é mantido)
+
+    Condicional também no banco: preço diferente e nenhum snapshot mais
+    recente da seleção (outro lote gravado entre a leitura e o UPDATE).
+    """
+    table = Match.__table__
+    snapshots = OddsSnapshot.__table__
+    market, selection = CURRENT_ODDS_SELECTIONS[column]
+    newer = select(snapshots.c.match_id).where(
+        snapshots.c.match_id == table.c.id,
+        snapshots.c.market == market,
+        snapshots.c.selection == selection,
+        snapshots.c.recorded_at > bindparam("b_recorded_at"),
+    )
+    return update(table).where(
+        table.c.id == bindparam("b_match_id"),
+        table.c[column].is_distinct_from(bindparam("b_price")),
+        ~newer.exists(),
+    ).values({column: bindparam("b_price"), "updated_at": table.c.updated_at})
+
+def append_snapshots(
+    db: Session,
+    snapshots: Sequence[Record],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    update_current: bool = True,
+) -> Dict[str, int]:
+    """Gravar um lote de odds no histórico (o commit fica com o chamador)
+
+    Com ``update_current`` a odd atual das partidas (colunas ``*_odds``)
+    passa a ser o último preço recebido no lote, se for diferente e mais
+    recente que o histórico; só essas partidas ficam registradas para o feed
+    ao vivo e contam em ``updated`` (o chamador invalida o cache só nesse caso).
+    Partidas inexistentes levantam ``UnknownMatchesError`` antes de gravar.
+    """
+    rows = _normalize(snapshots, datetime.now(timezone.utc))
+    if not rows:
+        return {"received": 0, "appended": 0, "updated": 0}
+    missing = missing_matches(db, (row["match_id"] for row in rows), chunk_size)
+    if missing:
+        raise UnknownMatchesError(missing)
+
+    insert = _dialect_insert(db)
+    table = OddsSnapshot.__table__
+    appended = 0
+    for chunk in _chunks(rows, chunk_size):
+        if insert is not None:
+            stmt = insert(table).on_conflict_do_nothing().returning(table.c.match_id)
+            appended += len(db.execute(stmt, chunk).all())
+        else:
+            db.execute(table.insert(), chunk)
+            appended += len(chunk)
+
+    changed = set()
+    if update_current:
+        for column, values in current_price_changes(db, rows, chunk_size).items():
+            result = db.execute(_update_current(column), values)
+            # rowcount 0: outro lote chegou antes. O asyncpg não informa o
+            # rowcount de executemany (-1); aí valem as alterações lidas acima
+            if result.rowcount != 0:
+                changed.update(value["b_match_id"] for value in values)
+        live.record(db, changed)
+
+    return {"received": len(rows), "appended": appended, "updated": len(changed)}
@@ -0,0 +1,262 @@
+"""
+Motor de previsão de placares (Poisson / Dixon-Coles)
+
+As forças de ataque e defesa são estimadas a partir das partidas finalizadas
+e a grade de placares é calculada para um lote inteiro de partidas de uma vez,
+usando operações vetorizadas do NumPy.
+"""
+
+import numpy as np
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+# Número máximo de gols considerado na grade de placares (0..MAX_GOALS)
+MAX_GOALS = 10
+
+# Parâmetro de dependência do Dixon-Coles para placares baixos
+DIXON_COLES_RHO = -0.1
+
+# Peso (em jogos) da média da liga usada para suavizar times com poucos jogos
+PRIOR_WEIGHT = 3.0
+
+# Médias padrão usadas quando ainda não há partidas finalizadas
+DEFAULT_HOME_GOALS = 1.5
+DEFAULT_AWAY_GOALS = 1.2
+
+_GOALS = np.arange(MAX_GOALS + 1)
+_LOG_FACTORIALS = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, MAX_GOALS + 1)))))
+_HOME_WIN_MASK = (_GOALS[:, None] > _GOALS[None, :]).astype(float)
+_DRAW_MASK = np.eye(MAX_GOALS + 1)
+_AWAY_WIN_MASK = (_GOALS[:, None] < _GOALS[None, :]).astype(float)
+_OVER_2_5_MASK = ((_GOALS[:, None] + _GOALS[None, :]) > 2).astype(float)
+_BTTS_MASK = ((_GOALS[:, None] > 0) & (_GOALS[None, :] > 0)).astype(float)
+
+
+class TeamStrengths:
+    """Forças de ataque/defesa por time, separadas por mando de campo"""
+
+    def __init__(
+        self,
+        team_ids: np.ndarray,
+        home_attack: np.ndarray,
+        home_defence: np.ndarray,
+        away_attack: np.ndarray,
+        away_defence: np.ndarray,
+        avg_home_goals: float,
+        avg_away_goals: float,
+    ):
+        self.team_ids = team_ids
+        self.home_attack = home_attack
+        self.home_defence = home_defence
+        self.away_attack = away_attack
+        self.away_defence = away_defence
+        self.avg_home_goals = avg_home_goals
+        self.avg_away_goals = avg_away_goals
+
+    def _index(self, ids: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Mapear ids de times para posições nos arrays (e máscara de conhecidos)"""
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.team_ids.size == 0:
+            return np.zeros(ids.shape, dtype=np.int64), np.zeros(ids.shape, dtype=bool)
+        pos = np.searchsorted(self.team_ids, ids)
+        pos = np.clip(pos, 0, self.team_ids.size - 1)
+        return pos, self.team_ids[pos] == ids
+
+    def expected_goals(
+        self, home_ids: Sequence[int], away_ids: Sequence[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Gols esperados (lambda mandante, lambda visitante) para cada partida"""
+        home_pos, home_known = self._index(home_ids)
+        away_pos, away_known = self._index(away_ids)
+
+        def pick(values: np.ndarray, pos: np.ndarray, known: np.ndarray) -> np.ndarray:
+            if values.size == 0:
+                return np.ones(pos.shape)
+            return np.where(known, values[pos], 1.0)
+
+        home_lambda = (
+            self.avg_home_goals
+            * pick(self.home_attack, home_pos, home_known)
+            * pick(self.away_defence, away_pos, away_known)
+        )
+        away_lambda = (
+            self.avg_away_goals
+            * pick(self.away_attack, away_pos, away_known)
+            * pick(self.home_defence, home_pos, home_known)
+        )
+        return home_lambda, away_lambda
+
+
+def _as_array(values: Iterable, dtype) -> np.ndarray:
+    """Converter para array sem copiar elemento a elemento quando já é um array"""
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+    return np.asarray(values, dtype=dtype)
+
+
+def strength_ratio(goals, games, league_avg, prior_weight: float = PRIOR_WEIGHT):
+    """Média de gols do time sobre a média da liga, suavizada com ``prior_weight`` jogos fictícios"""
+    return (goals + prior_weight * league_avg) / ((games + prior_weight) * league_avg)
+
+
+def fit_team_strengths(
+    home_team_ids: Iterable[int],
+    away_team_ids: Iterable[int],
+    home_goals: Iterable[int],
+    away_goals: Iterable[int],
+    prior_weight: float = PRIOR_WEIGHT,
+) -> TeamStrengths:
+    """Estimar forças de ataque/defesa a partir de partidas finalizadas
+
+    Cada força é a razão entre a média do time e a média da liga no mesmo
+    mando, suavizada em direção a 1.0 com ``prior_weight`` jogos fictícios.
+    """
+    home_ids = _as_array(home_team_ids, np.int64)
+    away_ids = _as_array(away_team_ids, np.int64)
+    hg = _as_array(home_goals, float)
+    ag = _as_array(away_goals, float)
+
+    if hg.size == 0:
+        empty = np.empty(0)
+        return TeamStrengths(
+            np.empty(0, dtype=np.int64), empty, empty, empty, empty,
+            DEFAULT_HOME_GOALS, DEFAULT_AWAY_GOALS,
+        )
+
+    avg_home = max(hg.mean(), 1e-6)
+    avg_away = max(ag.mean(), 1e-6)
+
+    team_ids, inverse = np.unique(np.concatenate([home_ids, away_ids]), return_inverse=True)
+    n_teams = team_ids.size
+    home_idx = inverse[: home_ids.size]
+    away_idx = inverse[home_ids.size:]
+
+    home_games = np.bincount(home_idx, minlength=n_teams)
+    away_games = np.bincount(away_idx, minlength=n_teams)
+    scored_home = np.bincount(home_idx, weights=hg, minlength=n_teams)
+    conceded_home = np.bincount(home_idx, weights=ag, minlength=n_teams)
+    scored_away = np.bincount(away_idx, weights=ag, minlength=n_teams)
+    conceded_away = np.bincount(away_idx, weights=hg, minlength=n_teams)
+
+    return TeamStrengths(
+        team_ids=team_ids,
+        home_attack=strength_ratio(scored_home, home_games, avg_home, prior_weight),
+        home_defence=strength_ratio(conceded_home, home_games, avg_away, prior_weight),
+        away_attack=strength_ratio(scored_away, away_games, avg_away, prior_weight),
+        away_defence=strength_ratio(conceded_away, away_games, avg_home, prior_weight),
+        avg_home_goals=float(avg_home),
+        avg_away_goals=float(avg_away),
+    )
+
+
+def _poisson_pmf(lam: np.ndarray) -> np.ndarray:
+    """Distribuição de Poisson (n, MAX_GOALS + 1) para cada lambda"""
+    lam = np.maximum(np.asarray(lam, dtype=float), 1e-9)
+    log_pmf = _GOALS[None, :] * np.log(lam)[:, None] - lam[:, None] - _LOG_FACTORIALS[None, :]
+    return np.exp(log_pmf)
+
+
+def score_matrix(
+    home_lambda: Sequence[float],
+    away_lambda: Sequence[float],
+    rho: Optional[float] = DIXON_COLES_RHO,
+) -> np.ndarray:
+    """Grade de probabilidades de placar (n, MAX_GOALS + 1, MAX_GOALS + 1)
+
+    Linhas são gols do mandante e colunas gols do visitante. Com ``rho``
+    aplica-se a correção de Dixon-Coles aos placares 0-0, 0-1, 1-0 e 1-1;
+    ``rho=None`` mantém o modelo de Poisson independente.
+    """
+    home_lambda = np.atleast_1d(np.asarray(home_lambda, dtype=float))
+    away_lambda = np.atleast_1d(np.asarray(away_lambda, dtype=float))
+    grid = _poisson_pmf(home_lambda)[:, :, None] * _poisson_pmf(away_lambda)[:, None, :]
+
+    if rho:
+        grid[:, 0, 0] *= np.maximum(1.0 - home_lambda * away_lambda * rho, 0.0)
+        grid[:, 0, 1] *= np.maximum(1.0 + home_lambda * rho, 0.0)
+        grid[:, 1, 0] *= np.maximum(1.0 + away_lambda * rho, 0.0)
+        grid[:, 1, 1] *= max(1.0 - rho, 0.0)
+
+    # Renormalizar (truncamento em MAX_GOALS e ajuste de Dixon-Coles)
+    grid /= grid.sum(axis=(1, 2), keepdims=True)
+    return grid
+
+
+def predict_from_lambdas(
+    home_lambda: Sequence[float],
+    away_lambda: Sequence[float],
+    rho: Optional[float] = DIXON_COLES_RHO,
+) -> Dict[str, np.ndarray]:
+    """Probabilidades dos mercados principais para um lote de partidas"""
+    home_lambda = np.atleast_1d(np.asarray(home_lambda, dtype=float))
+    away_lambda = np.atleast_1d(np.asarray(away_lambda, dtype=float))
+    grid = score_matrix(home_lambda, away_lambda, rho=rho)
+
+    flat_best = grid.reshape(grid.shape[0], -1).argmax(axis=1)
+    return {
+        "expected_home_goals": home_lambda,
+        "expected_away_goals": away_lambda,
+        "total_goals_prediction": home_lambda + away_lambda,
+        "home_win_probability": np.einsum("nij,ij->n", grid, _HOME_WIN_MASK),
+        "draw_probability": np.einsum("nij,ij->n", grid, _DRAW_MASK),
+        "away_win_probability": np.einsum("nij,ij->n", grid, _AWAY_WIN_MASK),
+        "over_2_5_probability": np.einsum("nij,ij->n", grid, _OVER_2_5_MASK),
+        "btts_probability": np.einsum("nij,ij->n", grid, _BTTS_MASK),
+        "most_likely_home_goals": flat_best // (MAX_GOALS + 1),
+        "most_likely_away_goals": flat_best % (MAX_GOALS + 1),
+    }
+
+
+def predict_fixtures(
+    strengths: TeamStrengths,
+    home_team_ids: Sequence[int],
+    away_team_ids: Sequence[int],
+    rho: Optional[float] = DIXON_COLES_RHO,
+) -> Dict[str, np.ndarray]:
+    """Prever um lote de partidas (mandante x visitante) de uma só vez"""
+    home_lambda, away_lambda = strengths.expected_goals(home_team_ids, away_team_ids)
+    return predict_from_lambdas(home_lambda, away_lambda, rho=rho)
+
+
+def prediction_at(batch: Dict[str, np.ndarray], index: int) -> Dict[str, float]:
+    """Extrair a previsão de uma partida do lote no formato de MatchPrediction"""
+    return {
+        "total_goals_prediction": round(float(batch["total_goals_prediction"][index]), 3),
+        "btts_probability": round(float(batch["btts_probability"][index]), 4),
+        "home_win_probability": round(float(batch["home_win_probability"][index]), 4),
+        "draw_probability": round(float(batch["draw_probability"][index]), 4),
+        "away_win_probability": round(float(batch["away_win_probability"][index]), 4),
+        "over_2_5_probability": round(float(batch["over_2_5_probability"][index]), 4),
+        "expected_home_goals": round(float(batch["expected_home_goals"][index]), 3),
+        "expected_away_goals": round(float(batch["expected_away_goals"][index]), 3),
+        "most_likely_score": "{}-{}".format(
+            int(batch["most_likely_home_goals"][index]),
+            int(batch["most_likely_away_goals"][index]),
+        ),
+    }
+
+
+def prediction_trends(prediction: Dict[str, float]) -> list:
+    """Gerar itens de tendência a partir de uma previsão"""
+    trends = []
+    over = prediction["over_2_5_probability"]
+    if over >= 0.5:
+        trends.append({"type": "over_2_5", "confidence": over,
+                       "description": "Tendência para mais de 2.5 gols"})
+    else:
+        trends.append({"type": "under_2_5", "confidence": round(1 - over, 4),
+                       "description": "Tendência para menos de 2.5 gols"})
+
+    btts = prediction["btts_probability"]
+    if btts >= 0.5:
+        trends.append({"type": "btts", "confidence": btts,
+                       "description": "Tendência para ambos os times marcarem"})
+
+    outcomes = {
+        "home_win": (prediction["home_win_probability"], "Tendência de vitória do mandante"),
+        "draw": (prediction["draw_probability"], "Tendência de empate"),
+        "away_win": (prediction["away_win_probability"], "Tendência de vitória do visitante"),
+    }
+    best = max(outcomes, key=lambda key: outcomes[key][0])
+    trends.append({"type": best, "confidence": outcomes[best][0],
+                   "description": outcomes[best][1]})
+    return trends
@@ -0,0 +1,199 @@
+"""
+Estatísticas agregadas dos times
+
+Dois modos de atualização:
+- incremental: quando uma partida passa a ``finished`` (ou tem o placar
+  corrigido) os contadores dos dois times recebem apenas a diferença, com
+  UPDATEs relativos (``wins = wins + 1``) na mesma transação da partida;
+- recálculo completo: agrega todas as partidas finalizadas em SQL e
+  regrava os contadores de uma vez (para backfills e reconciliação).
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import Float, and_, case, cast, func, literal, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.models.match import Match
+from app.models.team import Team
+
+# Estado de uma partida relevante para as estatísticas:
+# (status, home_team_id, away_team_id, home_goals, away_goals)
+ResultState = Tuple[Optional[str], Optional[int], Optional[int], Optional[int], Optional[int]]
+
+# UPDATEs em massa não precisam sincronizar objetos já carregados na sessão
+EXECUTION_OPTIONS = {"synchronize_session": False}
+
+COUNTER_COLUMNS = (
+    "games_played", "wins", "draws", "losses", "goals_for", "goals_against",
+    "home_wins", "home_draws", "home_losses", "away_wins", "away_draws", "away_losses",
+)
+
+def result_state(match: Match) -> ResultState:
+    """Extrair o estado de resultado de uma partida"""
+    return (match.status, match.home_team_id, match.away_team_id, match.home_goals, match.away_goals)
+
+def counts_for_statistics(state: ResultState) -> bool:
+    """Uma partida entra nas estatísticas quando finalizada e com placar"""
+    status, _, _, home_goals, away_goals = state
+    return status == "finished" and home_goals is not None and away_goals is not None
+
+def result_fields(home_goals: Optional[int], away_goals: Optional[int]) -> dict:
+    """Vencedor, total de gols e ambos marcam derivados do placar"""
+    if home_goals is None or away_goals is None:
+        return {}
+    if home_goals > away_goals:
+        winner = "home"
+    elif home_goals < away_goals:
+        winner = "away"
+    else:
+        winner = "draw"
+    return {
+        "total_goals": home_goals + away_goals,
+        "both_teams_scored": home_goals > 0 and away_goals > 0,
+        "winner": winner,
+    }
+
+def apply_result_fields(match: Match):
+    """Preencher vencedor, total de gols e ambos marcam a partir do placar"""
+    for field, value in result_fields(match.home_goals, match.away_goals).items():
+        setattr(match, field, value)
+
+def _team_deltas(goals_for: int, goals_against: int, is_home: bool, sign: int) -> dict:
+    win, draw, loss = goals_for > goals_against, goals_for == goals_against, goals_for < goals_against
+    side = "home" if is_home else "away"
+    deltas = {
+        "games_played": 1,
+        "wins": int(win),
+        "draws": int(draw),
+        "losses": int(loss),
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        f"{side}_wins": int(win),
+        f"{side}_draws": int(draw),
+        f"{side}_losses": int(loss),
+    }
+    return {column: sign * value for column, value in deltas.items() if value}
+
+def _delta_statement(team_id: int, deltas: dict):
+    """UPDATE relativo dos contadores, recalculando as médias com os novos valores"""
+    values = {getattr(Team, column): getattr(Team, column) + delta for column, delta in deltas.items()}
+
+    games = Team.games_played + deltas.get("games_played", 0)
+    goals_for = Team.goals_for + deltas.get("goals_for", 0)
+    goals_against = Team.goals_against + deltas.get("goals_against", 0)
+    wins = Team.wins + deltas.get("wins", 0)
+    values[Team.avg_goals_scored] = func.coalesce(cast(goals_for, Float) / func.nullif(games, 0), 0.0)
+    values[Team.avg_goals_conceded] = func.coalesce(cast(goals_against, Float) / func.nullif(games, 0), 0.0)
+    values[Team.win_percentage] = func.coalesce(cast(wins, Float) / func.nullif(games, 0), 0.0)
+
+    return update(Team).where(Team.id == team_id).values(values)
+
+def result_statements(state: ResultState, sign: int = 1) -> list:
+    """Statements que aplicam (sign=1) ou revertem (sign=-1) um resultado"""
+    _, home_team_id, away_team_id, home_goals, away_goals = state
+    return [
+        _delta_statement(home_team_id, _team_deltas(home_goals, away_goals, True, sign)),
+        _delta_statement(away_team_id, _team_deltas(away_goals, home_goals, False, sign)),
+    ]
+
+def transition_statements(old_state: ResultState, new_state: ResultState) -> list:
+    """Statements para refletir a mudança de estado de uma partida nas estatísticas"""
+    if old_state == new_state:
+        return []
+    statements = []
+    if counts_for_statistics(old_state):
+        statements.extend(result_statements(old_state, sign=-1))
+    if counts_for_statistics(new_state):
+        statements.extend(result_statements(new_state, sign=1))
+    return statements
+
+def apply_transition(db: Session, old_state: ResultState, new_state: ResultState) -> bool:
+    """Aplicar a transição na sessão atual (o commit fica com o chamador)"""
+    statements = transition_statements(old_state, new_state)
+    for statement in statements:
+        db.execute(statement, execution_options=EXECUTION_OPTIONS)
+    return bool(statements)
+
+def _team_results(team_ids: Optional[Iterable[int]] = None):
+    """Uma linha por time por partida finalizada (perspectiva de cada time)"""
+    finished = and_(
+        Match.status == "finished",
+        Match.home_goals.isnot(None),
+        Match.away_goals.isnot(None)
+    )
+    home = select(
+        Match.home_team_id.label("team_id"),
+        Match.home_goals.label("gf"),
+        Match.away_goals.label("ga"),
+        literal(1).label("is_home")
+    ).where(finished)
+    away = select(
+        Match.away_team_id.label("team_id"),
+        Match.away_goals.label("gf"),
+        Match.home_goals.label("ga"),
+        literal(0).label("is_home")
+    ).where(finished)
+    if team_ids is not None:
+        home = home.where(Match.home_team_id.in_(team_ids))
+        away = away.where(Match.away_team_id.in_(team_ids))
+    return union_all(home, away).subquery("team_results")
+
+def recompute_statements(team_ids: Optional[Iterable[int]] = None) -> list:
+    """Statements do recálculo completo (todos os times ou apenas ``team_ids``)"""
+    if team_ids is not None:
+        team_ids = list(team_ids)
+    results = _team_results(team_ids)
+
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    win, draw, loss = results.c.gf > results.c.ga, results.c.gf == results.c.ga, results.c.gf < results.c.ga
+    at_home, away = results.c.is_home == 1, results.c.is_home == 0
+    games = func.count()
+    aggregates = select(
+        results.c.team_id,
+        games.label("games_played"),
+        count_if(win).label("wins"),
+        count_if(draw).label("draws"),
+        count_if(loss).label("losses"),
+        func.sum(results.c.gf).label("goals_for"),
+        func.sum(results.c.ga).label("goals_against"),
+        count_if(and_(at_home, win)).label("home_wins"),
+        count_if(and_(at_home, draw)).label("home_draws"),
+        count_if(and_(at_home, loss)).label("home_losses"),
+        count_if(and_(away, win)).label("away_wins"),
+        count_if(and_(away, draw)).label("away_draws"),
+        count_if(and_(away, loss)).label("away_losses"),
+        (cast(func.sum(results.c.gf), Float) / games).label("avg_goals_scored"),
+        (cast(func.sum(results.c.ga), Float) / games).label("avg_goals_conceded"),
+        (cast(count_if(win), Float) / games).label("win_percentage"),
+    ).group_by(results.c.team_id).subquery("team_aggregates")
+
+    # Zerar primeiro para times sem partidas finalizadas
+    reset = update(Team).values(
+        {**{column: 0 for column in COUNTER_COLUMNS},
+         "avg_goals_scored": 0.0, "avg_goals_conceded": 0.0, "win_percentage": 0.0}
+    )
+    if team_ids is not None:
+        reset = reset.where(Team.id.in_(team_ids))
+
+    columns = COUNTER_COLUMNS + ("avg_goals_scored", "avg_goals_conceded", "win_percentage")
+    fill = update(Team).where(Team.id == aggregates.c.team_id).values(
+        {column: aggregates.c[column] for column in columns}
+    )
+    return [reset, fill]
+
+def recompute_team_statistics(db: Session, team_ids: Optional[Iterable[int]] = None):
+    """Recalcular as estatísticas em SQL (o commit fica com o chamador)"""
+    for statement in recompute_statements(team_ids):
+        db.execute(statement, execution_options=EXECUTION_OPTIONS)
+
+def teams_with_recent_results(db: Session, since) -> List[int]:
+    """Times com partidas alteradas desde ``since``"""
+    rows = db.execute(
+        select(Match.home_team_id, Match.away_team_id).where(
+            func.coalesce(Match.updated_at, Match.created_at) >= since
+        )
+    ).all()
+    return sorted({team_id for row in rows for team_id in row})
@@ -0,0 +1,84 @@
+"""
+Forma dos times pré-calculada
+
+Para cada time e janela (últimas 5, 10 e 20 partidas), no geral, em casa e
+fora: sequência de resultados, vitórias/empates/derrotas, gols a favor e
+contra e pontos por jogo. As linhas ficam na tabela ``team_form`` e são
+recalculadas apenas para os times de partidas finalizadas/alteradas, a
+partir do armazenamento colunar; o endpoint /analysis/form apenas lê.
+"""
+
+from datetime import timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.models.team_form import TeamForm
+from app.services import match_store
+
+FORM_WINDOWS = (5, 10, 20)
+
+# Mando considerado: None = todas as partidas
+VENUES = {"all": None, "home": True, "away": False}
+
+def _window_row(team_id: int, venue: str, window: int, results: Dict[str, np.ndarray]) -> dict:
+    gf = results["goals_for"][:window].astype(np.int16)
+    ga = results["goals_against"][:window].astype(np.int16)
+    wins, draws = int(np.count_nonzero(gf > ga)), int(np.count_nonzero(gf == ga))
+    matches = int(gf.size)
+    last_date = results["match_date"][0].item().replace(tzinfo=timezone.utc) if matches else None
+    return {
+        "team_id": team_id,
+        "venue": venue,
+        "window_size": window,
+        "matches": matches,
+        "wins": wins,
+        "draws": draws,
+        "losses": matches - wins - draws,
+        "goals_for": int(gf.sum()),
+        "goals_against": int(ga.sum()),
+        "points_per_game": round((3 * wins + draws) / matches, 3) if matches else 0.0,
+        "form": "".join(np.where(gf > ga, "W", np.where(gf == ga, "D", "L")).tolist()),
+        "last_match_date": last_date,
+    }
+
+def team_form_rows(
+    team_ids: Iterable[int],
+    store: match_store.MatchStore,
+    windows: Iterable[int] = FORM_WINDOWS,
+) -> List[dict]:
+    """Linhas de forma dos times (times sem partidas finalizadas não geram linhas)"""
+    windows = tuple(windows)
+    rows = []
+    for team_id in team_ids:
+        results = store.team_results(team_id)
+        if not results["match_id"].size:
+            continue
+        for venue, is_home in VENUES.items():
+            selected = results if is_home is None else {
+                name: values[results["is_home"] == is_home] for name, values in results.items()
+            }
+            rows.extend(_window_row(team_id, venue, window, selected) for window in windows)
+    return rows
+
+def refresh_team_form(db: Session, team_ids: Optional[Iterable[int]] = None) -> int:
+    """Recalcular a forma dos times (todos com ``None``) - o commit fica com o chamador"""
+    store = match_store.get_match_store(db, max_age=0)
+    if team_ids is None:
+        team_ids = np.unique(np.concatenate((store.home_team_id, store.away_team_id))).tolist()
+        db.execute(delete(TeamForm), execution_options={"synchronize_session": False})
+    else:
+        team_ids = sorted(set(team_ids))
+        if not team_ids:
+            return 0
+        db.execute(
+            delete(TeamForm).where(TeamForm.team_id.in_(team_ids)),
+            execution_options={"synchronize_session": False},
+        )
+
+    rows = team_form_rows(team_ids, store)
+    if rows:
+        db.execute(insert(TeamForm), rows)
+    return len(rows)
@@ -0,0 +1,229 @@
+"""
+Trends materializados por liga e por time
+
+As taxas (over/under, ambos marcam, resultados, clean sheets) e as
+sequências de vitórias em casa/fora são calculadas a partir das partidas
+finalizadas e gravadas na tabela ``trends``; o endpoint /analysis/trends
+apenas lê essas linhas. A atualização é feita por escopo: apenas as ligas e
+os times com partidas alteradas são recalculados.
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, case, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.match import Match
+from app.models.team import Team
+from app.models.trend import Trend
+from app.services import match_store
+
+# Condições em função dos gols (mandante, visitante) de uma partida. As
+# expressões funcionam com colunas SQL, arrays NumPy e inteiros.
+MATCH_TRENDS = {
+    "over_1_5": ("Jogos com mais de 1.5 gols", lambda h, a: h + a > 1.5),
+    "over_2_5": ("Jogos com mais de 2.5 gols", lambda h, a: h + a > 2.5),
+    "over_3_5": ("Jogos com mais de 3.5 gols", lambda h, a: h + a > 3.5),
+    "under_2_5": ("Jogos com menos de 2.5 gols", lambda h, a: h + a < 2.5),
+    "btts": ("Ambos os times marcam", lambda h, a: (h > 0) & (a > 0)),
+    "home_win": ("Vitórias do mandante", lambda h, a: h > a),
+    "draw": ("Empates", lambda h, a: h == a),
+    "away_win": ("Vitórias do visitante", lambda h, a: h < a),
+    "clean_sheet": ("Jogos com ao menos um time sem sofrer gols", lambda h, a: (h == 0) | (a == 0)),
+}
+
+# Condições em função dos gols (a favor, contra) de um time
+TEAM_TRENDS = {
+    "over_1_5": MATCH_TRENDS["over_1_5"],
+    "over_2_5": MATCH_TRENDS["over_2_5"],
+    "over_3_5": MATCH_TRENDS["over_3_5"],
+    "under_2_5": MATCH_TRENDS["under_2_5"],
+    "btts": MATCH_TRENDS["btts"],
+    "win": ("Vitórias", lambda gf, ga: gf > ga),
+    "clean_sheet": ("Jogos sem sofrer gols", lambda gf, ga: ga == 0),
+}
+
+# Sequências atuais de vitórias (a partir de TRENDS_MIN_STREAK): (descrição, mando considerado)
+STREAK_TRENDS = {
+    "win_streak": ("vitórias seguidas", None),
+    "home_win_streak": ("vitórias seguidas em casa", True),
+    "away_win_streak": ("vitórias seguidas fora", False),
+}
+
+# z para o limite inferior de Wilson (95%)
+CONFIDENCE_Z = 1.96
+
+def wilson_lower_bound(successes: int, total: int, z: float = CONFIDENCE_Z) -> float:
+    """Limite inferior do intervalo de Wilson: taxa penalizada por amostras pequenas"""
+    if not total:
+        return 0.0
+    p = successes / total
+    denominator = 1 + z * z / total
+    center = p + z * z / (2 * total)
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total))
+    return max(0.0, (center - margin) / denominator)
+
+def _trend_row(
+    scope: str, scope_key: str, trend_type: str, description: str, total: int, successes: int,
+    league_name: Optional[str] = None, team_id: Optional[int] = None, streak: Optional[int] = None,
+) -> dict:
+    return {
+        "scope": scope,
+        "scope_key": scope_key,
+        "league_name": league_name,
+        "team_id": team_id,
+        "trend_type": trend_type,
+        "description": description,
+        "matches_count": total,
+        "successes": successes,
+        "success_rate": successes / total if total else 0.0,
+        "confidence": round(wilson_lower_bound(successes, total), 4),
+        "streak": streak,
+    }
+
+def _finished():
+    return and_(Match.status == "finished", Match.home_goals.isnot(None), Match.away_goals.isnot(None))
+
+def league_filter(column, leagues: List[Optional[str]]):
+    """``column IN leagues``, tratando ``None`` na lista como ``IS NULL``"""
+    named = [league for league in leagues if league is not None]
+    condition = column.in_(named)
+    return or_(condition, column.is_(None)) if None in leagues else condition
+
+def league_trend_rows(db: Session, leagues: Optional[Iterable[Optional[str]]] = None) -> List[dict]:
+    """Trends por liga, agregados em SQL sobre todas as partidas finalizadas"""
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    query = select(
+        Match.league_name,
+        func.count().label("matches_count"),
+        *[count_if(condition(Match.home_goals, Match.away_goals)).label(trend_type)
+          for trend_type, (_, condition) in MATCH_TRENDS.items()]
+    ).where(_finished()).group_by(Match.league_name)
+    if leagues is not None:
+        query = query.where(league_filter(Match.league_name, list(leagues)))
+
+    rows = []
+    for row in db.execute(query).mappings():
+        league = row["league_name"]
+        for trend_type, (description, _) in MATCH_TRENDS.items():
+            rows.append(_trend_row(
+                "league", f"league:{league or ''}", trend_type,
+                f"{league}: {description.lower()}" if league else description,
+                row["matches_count"], row[trend_type], league_name=league,
+            ))
+    return rows
+
+def _current_streak(wins: np.ndarray) -> int:
+    """Vitórias consecutivas a partir da partida mais recente"""
+    losses = np.flatnonzero(~wins)
+    return int(losses[0]) if losses.size else int(wins.size)
+
+def team_trend_rows(
+    db: Session,
+    team_ids: Optional[Iterable[int]] = None,
+    window: Optional[int] = None,
+    store: Optional[match_store.MatchStore] = None,
+) -> List[dict]:
+    """Trends por time sobre as últimas ``window`` partidas finalizadas
+
+    As partidas vêm do armazenamento colunar (atualizado antes do cálculo).
+    """
+    window = window or settings.TRENDS_TEAM_WINDOW
+    store = store or match_store.get_match_store(db, max_age=0)
+    if team_ids is None:
+        team_ids = np.unique(np.concatenate((store.home_team_id, store.away_team_id))).tolist()
+    team_ids = list(team_ids)
+    if not team_ids:
+        return []
+    names = dict(db.execute(select(Team.id, Team.name).where(Team.id.in_(team_ids))).all())
+
+    rows = []
+    for team_id in team_ids:
+        results = store.team_results(team_id, limit=window)
+        total = int(results["match_id"].size)
+        if not total:
+            continue
+        gf = results["goals_for"].astype(np.int16)
+        ga = results["goals_against"].astype(np.int16)
+        name = names.get(team_id, str(team_id))
+        scope_key = f"team:{team_id}"
+        for trend_type, (description, condition) in TEAM_TRENDS.items():
+            rows.append(_trend_row(
+                "team", scope_key, trend_type, f"{name}: {description.lower()}",
+                total, int(np.count_nonzero(condition(gf, ga))), team_id=team_id,
+            ))
+        wins = gf > ga
+        for trend_type, (description, is_home) in STREAK_TRENDS.items():
+            considered = wins if is_home is None else wins[results["is_home"] == is_home]
+            streak = _current_streak(considered)
+            if streak < settings.TRENDS_MIN_STREAK:
+                continue
+            # A sequência é o próprio trend (streak sucessos em streak jogos):
+            # a confiança cresce com o tamanho, não com a taxa de vitórias da janela
+            rows.append(_trend_row(
+                "team", scope_key, trend_type, f"{name}: {streak} {description}",
+                streak, streak, team_id=team_id, streak=streak,
+            ))
+    return rows
+
+def overall_trend_rows(db: Session) -> List[dict]:
+    """Trends gerais, somando os contadores já materializados das ligas"""
+    query = select(
+        Trend.trend_type, func.sum(Trend.matches_count), func.sum(Trend.successes)
+    ).where(Trend.scope == "league").group_by(Trend.trend_type)
+    return [
+        _trend_row("all", "all", trend_type, MATCH_TRENDS[trend_type][0], int(total), int(successes))
+        for trend_type, total, successes in db.execute(query)
+        if trend_type in MATCH_TRENDS
+    ]
+
+def _replace(db: Session, condition, rows: List[dict]):
+    db.execute(delete(Trend).where(condition), execution_options={"synchronize_session": False})
+    if rows:
+        db.execute(insert(Trend), rows)
+
+def refresh_trends(
+    db: Session,
+    leagues: Optional[Iterable[Optional[str]]] = None,
+    team_ids: Optional[Iterable[int]] = None,
+) -> Dict[str, int]:
+    """Recalcular os trends (todos os escopos com ``None``) - o commit fica com o chamador"""
+    if leagues is not None:
+        leagues = list(leagues)
+    if team_ids is not None:
+        team_ids = list(team_ids)
+
+    league_rows = league_trend_rows(db, leagues) if leagues != [] else []
+    if leagues is None:
+        _replace(db, Trend.scope == "league", league_rows)
+    elif leagues:
+        _replace(db, and_(Trend.scope == "league", league_filter(Trend.league_name, leagues)), league_rows)
+
+    team_rows = team_trend_rows(db, team_ids) if team_ids != [] else []
+    if team_ids is None:
+        _replace(db, Trend.scope == "team", team_rows)
+    elif team_ids:
+        _replace(db, Trend.team_id.in_(team_ids), team_rows)
+
+    overall_rows = []
+    if leagues != []:
+        overall_rows = overall_trend_rows(db)
+        _replace(db, Trend.scope == "all", overall_rows)
+
+    return {"leagues": len(league_rows), "teams": len(team_rows), "overall": len(overall_rows)}
+
+def changed_scopes(db: Session, since) -> Tuple[List[Optional[str]], List[int]]:
+    """Ligas e times com partidas alteradas desde ``since``"""
+    rows = db.execute(
+        select(Match.league_name, Match.home_team_id, Match.away_team_id).where(
+            func.coalesce(Match.updated_at, Match.created_at) >= since
+        )
+    ).all()
+    leagues = {league for league, _, _ in rows}
+    team_ids = {team_id for _, home, away in rows for team_id in (home, away)}
+    return sorted(leagues, key=lambda league: league or ""), sorted(team_ids)
@@ -0,0 +1,144 @@
+"""
+Scanner de value bets sobre as odds gravadas
+
+Para cada partida e seleção (1X2, mais/menos de 2.5 gols, ambos marcam) a
+margem da casa é removida das probabilidades implícitas de cada mercado e o
+valor esperado é comparado com a probabilidade do modelo. Todas as partidas
+e mercados são avaliados de uma vez, em matrizes NumPy (partidas x seleções),
+e a aposta sugerida segue o critério de Kelly (fracionado).
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# (mercado, seleção, coluna de odds em Match)
+SELECTIONS = (
+    ("1x2", "home", "home_odds"),
+    ("1x2", "draw", "draw_odds"),
+    ("1x2", "away", "away_odds"),
+    ("over_under_2_5", "over", "over_2_5_odds"),
+    ("over_under_2_5", "under", "under_2_5_odds"),
+    ("btts", "yes", "btts_yes_odds"),
+    ("btts", "no", "btts_no_odds"),
+)
+
+ODDS_COLUMNS = tuple(column for _, _, column in SELECTIONS)
+
+# Colunas de cada mercado na matriz de seleções
+MARKETS = {"1x2": slice(0, 3), "over_under_2_5": slice(3, 5), "btts": slice(5, 7)}
+
+MARGIN_METHODS = ("proportional", "power")
+
+def model_probabilities(predictions: Sequence[Dict[str, float]]) -> np.ndarray:
+    """Matriz (partidas x seleções) com as probabilidades do modelo"""
+    if not predictions:
+        return np.empty((0, len(SELECTIONS)))
+    keys = ("home_win_probability", "draw_probability", "away_win_probability",
+            "over_2_5_probability", "btts_probability")
+    home, draw, away, over, btts = np.array([[p[key] for key in keys] for p in predictions], dtype=float).T
+    return np.column_stack((home, draw, away, over, 1 - over, btts, 1 - btts))
+
+def remove_margin(implied: np.ndarray, method: str = "proportional", iterations: int = 8) -> np.ndarray:
+    """Probabilidades justas de um mercado (linhas) a partir das implícitas (1/odd)
+
+    - proportional: divide cada probabilidade pelo total do mercado;
+    - power: encontra k com sum(p ** k) = 1 (corrige o viés de favorito/azarão).
+    """
+    if method == "proportional":
+        return implied / implied.sum(axis=1, keepdims=True)
+    if method != "power":
+        raise ValueError(f"Método de remoção de margem desconhecido: {method}")
+
+    # Odds <= 1 (probabilidade implícita >= 1) não têm solução: ficam com a proporcional
+    valid = np.all(implied < 1, axis=1)
+    fair = implied / implied.sum(axis=1, keepdims=True)
+
+    # Newton vetorizado em k para todas as linhas ao mesmo tempo. A função é
+    # convexa e decrescente, então as iterações convergem de forma monótona
+    # (após o primeiro passo, quando o mercado não tem margem).
+    market = implied[valid]
+    log_p = np.log(market)
+    k = np.ones(market.shape[0])
+    for _ in range(iterations):
+        powered = market ** k[:, None]
+        k = k - (powered.sum(axis=1) - 1) / (powered * log_p).sum(axis=1)
+    fair[valid] = market ** k[:, None]
+    return fair
+
+def scan(
+    odds: np.ndarray,
+    model: np.ndarray,
+    margin_method: str = "proportional",
+    kelly_fraction: float = 0.25,
+    max_stake: float = 0.05,
+) -> Dict[str, np.ndarray]:
+    """Avaliar todas as seleções de uma vez
+
+    ``odds`` e ``model`` são matrizes (partidas x seleções); odds ausentes são
+    NaN e o mercado inteiro fica sem avaliação. Retorna matrizes com a
+    probabilidade justa, a margem do mercado, o valor esperado (edge) e a
+    fração da banca sugerida.
+    """
+    odds = np.asarray(odds, dtype=float)
+    fair = np.full(odds.shape, np.nan)
+    margin = np.full(odds.shape, np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        implied = 1.0 / odds
+        for columns in MARKETS.values():
+            market = implied[:, columns]
+            complete = np.all(np.isfinite(market) & (market > 0), axis=1)
+            if not complete.any():
+                continue
+            fair_market = np.full(market.shape, np.nan)
+            fair_market[complete] = remove_margin(market[complete], margin_method)
+            fair[:, columns] = fair_market
+            margin[:, columns] = (market.sum(axis=1) - 1)[:, None]
+
+        edge = model * odds - 1
+        edge[~np.isfinite(fair)] = np.nan
+        kelly = np.clip(edge / (odds - 1) * kelly_fraction, 0.0, max_stake)
+
+    return {"fair_probability": fair, "margin": margin, "edge": edge, "stake": np.nan_to_num(kelly)}
+
+def ranked_value_bets(
+    odds: np.ndarray,
+    model: np.ndarray,
+    min_edge: float = 0.02,
+    markets: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None,
+    **options,
+) -> List[dict]:
+    """Seleções com edge >= ``min_edge``, da maior para a menor
+
+    Cada item traz o índice da partida (``row``) nas matrizes de entrada.
+    """
+    odds = np.asarray(odds, dtype=float)
+    result = scan(odds, model, **options)
+    edge = result["edge"]
+    candidates = np.isfinite(edge) & (edge >= min_edge)
+    if markets:
+        selected = np.array([market in markets for market, _, _ in SELECTIONS])
+        candidates &= selected[None, :]
+
+    rows, columns = np.nonzero(candidates)
+    order = np.argsort(-edge[rows, columns], kind="stable")
+    if limit is not None:
+        order = order[:limit]
+
+    bets = []
+    for row, column in zip(rows[order].tolist(), columns[order].tolist()):
+        market, selection, _ = SELECTIONS[column]
+        bets.append({
+            "row": row,
+            "market": market,
+            "selection": selection,
+            "odds": float(odds[row, column]),
+            "implied_probability": round(float(result["fair_probability"][row, column]), 4),
+            "model_probability": round(float(model[row, column]), 4),
+            "bookmaker_margin": round(float(result["margin"][row, column]), 4),
+            "edge": round(float(edge[row, column]), 4),
+            "kelly_stake": round(float(result["stake"][row, column]), 4),
+        })
+    return bets
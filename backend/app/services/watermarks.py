@@ -0,0 +1,40 @@
+"""
+Marcas d'água das tarefas periódicas
+
+Cada tarefa incremental processa apenas as partidas alteradas desde a sua
+última execução concluída. A marca é gravada na mesma transação do trabalho,
+então uma execução que falha não avança a marca e a próxima refaz o
+intervalo. A leitura recua JOB_WATERMARK_OVERLAP segundos para cobrir
+transações que gravaram ``updated_at`` antes do início da execução anterior
+mas só fizeram commit depois (reprocessar é idempotente). Sem marca
+(primeira execução), usa a janela configurada da tarefa.
+
+O início da execução vem do relógio do banco (``now``), o mesmo que grava
+``updated_at``: um worker com o relógio adiantado pularia alterações.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job_watermark import JobWatermark
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def now(db: Session) -> datetime:
+    """Hora atual do banco (``SELECT now()``), em UTC"""
+    return _utc(db.execute(select(func.now())).scalar_one()).astimezone(timezone.utc)
+
+def changes_since(db: Session, job: str, fallback_window: int) -> datetime:
+    """Início do intervalo a processar pela tarefa ``job``"""
+    mark = db.get(JobWatermark, job)
+    if mark is None:
+        return now(db) - timedelta(seconds=fallback_window)
+    return _utc(mark.watermark) - timedelta(seconds=settings.JOB_WATERMARK_OVERLAP)
+
+def advance(db: Session, job: str, watermark: datetime):
+    """Registrar até onde a tarefa processou - o commit fica com o chamador"""
+    db.merge(JobWatermark(job=job, watermark=watermark))
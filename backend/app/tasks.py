@@ -1,70 +1,285 @@
-from celery import Celery
-from app.worker import celery_app
-from app.core.database import SessionLocal
+from celery import Celery, group
+from sqlalchemy import select
+from app.worker import TASK_ROUTES, celery_app
+from functools import wraps
+from typing import List, Optional
+from app.core.cache import invalidate_sync
+from app.core.locks import job_lock
+from app.core.config import settings
+from app.core.database import WorkerSessionLocal
 from app.models.team import Team
 from app.models.match import Match
+from app.fanout import fan_out, table_id_ranges
+from app.services import collector, fixtures, live, match_analysis, statistics, team_form, trends, watermarks
 import logging
 
 logger = logging.getLogger(__name__)
 
+def single_run(lock_key=None):
+    """Descartar a execução se outra execução da mesma tarefa estiver em andamento
+
+    O lock expira no limite rígido de tempo da tarefa. ``lock_key`` recebe os
+    argumentos da tarefa e diferencia execuções que podem rodar juntas (ex.:
+    a análise de ligas diferentes).
+    """
+    def decorator(func):
+        ttl = TASK_ROUTES[f"{__name__}.{func.__name__}"][2]
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            name = func.__name__ + (f":{lock_key(*args, **kwargs)}" if lock_key else "")
+            with job_lock(name, ttl) as acquired:
+                if not acquired:
+                    logger.info(f"{name}: execução anterior em andamento, ignorando")
+                    return {"status": "skipped", "message": "Execução anterior em andamento"}
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _team_ids_between(db, first_id: int, last_id: int) -> List[int]:
+    return db.execute(select(Team.id).where(Team.id.between(first_id, last_id))).scalars().all()
+
+def _fan_out_teams(db, task, namespaces: List[str]):
+    """Distribuir ``task`` em faixas de IDs de times (None se couber em uma faixa só)"""
+    ranges = table_id_ranges(db, Team.id, settings.TASK_FANOUT_CHUNK_SIZE)
+    if len(ranges) <= 1:
+        return None
+    fan_out(task, ranges, callback=invalidate_cache.s(namespaces))
+    return ranges
+
 @celery_app.task
+@single_run()
 def collect_daily_matches():
     """Tarefa para coletar partidas do dia"""
+    db = WorkerSessionLocal()
     try:
         logger.info("Iniciando coleta de partidas diárias")
         
-        # Implementar lógica de coleta aqui
-        # Por enquanto, apenas um placeholder
+        result = collector.collect_matches(db)
+        if result["upserted"]:
+            invalidate_sync("matches", "teams")
+            fixtures.invalidate_sync()
+            fixtures.refresh_days(db)
+            live.publish_sync(db)
+            refresh_trends.delay()
+            refresh_team_form.delay()
         
-        logger.info("Coleta de partidas concluída")
-        return {"status": "success", "message": "Partidas coletadas com sucesso"}
+        logger.info(
+            f"Coleta de partidas concluída: {result['fetched']} recebidas, "
+            f"{result['upserted']} gravadas"
+        )
+        return {"status": "success", "message": "Partidas coletadas com sucesso", **result}
     except Exception as e:
+        db.rollback()
         logger.error(f"Erro na coleta de partidas: {str(e)}")
         return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
 
 @celery_app.task
-def update_team_statistics():
-    """Tarefa para atualizar estatísticas dos times"""
+@single_run()
+def update_team_statistics(full: bool = False):
+    """Tarefa para atualizar estatísticas dos times
+    
+    As partidas finalizadas pela API já atualizam os times de forma
+    incremental; aqui reconciliamos apenas os times com partidas alteradas
+    desde a última execução concluída. Com ``full=True`` todos os times são
+    recalculados.
+    """
+    db = WorkerSessionLocal()
     try:
         logger.info("Atualizando estatísticas dos times")
+        started = watermarks.now(db)
         
-        db = SessionLocal()
-        teams = db.query(Team).filter(Team.is_active == True).all()
+        if full:
+            team_ids = None
+            ranges = _fan_out_teams(db, recompute_team_statistics_range, ["teams"])
+            if ranges:
+                logger.info(f"Estatísticas distribuídas em {len(ranges)} faixas de times")
+                return {"status": "success", "message": "Estatísticas distribuídas por faixa de times",
+                        "chunks": len(ranges)}
+        else:
+            since = watermarks.changes_since(db, "update_team_statistics", settings.STATS_RECONCILE_WINDOW)
+            team_ids = statistics.teams_with_recent_results(db, since)
+            if not team_ids:
+                watermarks.advance(db, "update_team_statistics", started)
+                db.commit()
+                logger.info("Nenhum time com partidas alteradas")
+                return {"status": "success", "message": "Nenhuma estatística a atualizar", "teams": 0}
         
-        for team in teams:
-            # Implementar cálculo de estatísticas
-            # Por enquanto, apenas um placeholder
-            pass
+        statistics.recompute_team_statistics(db, team_ids)
+        watermarks.advance(db, "update_team_statistics", started)
+        db.commit()
+        invalidate_sync("teams")
         
-        db.close()
-        logger.info("Estatísticas atualizadas")
-        return {"status": "success", "message": "Estatísticas atualizadas"}
+        updated = "todos" if team_ids is None else len(team_ids)
+        logger.info(f"Estatísticas atualizadas ({updated} times)")
+        return {"status": "success", "message": "Estatísticas atualizadas", "teams": updated}
     except Exception as e:
+        db.rollback()
         logger.error(f"Erro na atualização de estatísticas: {str(e)}")
         return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
 
 @celery_app.task
-def analyze_upcoming_matches():
-    """Tarefa para analisar partidas futuras"""
+@single_run()
+def refresh_trends(full: bool = False):
+    """Tarefa para atualizar os trends materializados
+    
+    Recalcula apenas as ligas e os times com partidas alteradas desde a
+    última execução concluída. Com ``full=True`` todos os trends são
+    recalculados.
+    """
+    db = WorkerSessionLocal()
     try:
-        logger.info("Analisando partidas futuras")
+        logger.info("Atualizando trends")
+        started = watermarks.now(db)
         
-        db = SessionLocal()
-        upcoming_matches = db.query(Match).filter(
-            Match.status == "scheduled"
-        ).limit(10).all()
+        if full:
+            leagues, team_ids = None, None
+        else:
+            since = watermarks.changes_since(db, "refresh_trends", settings.TRENDS_REFRESH_WINDOW)
+            leagues, team_ids = trends.changed_scopes(db, since)
+            if not leagues and not team_ids:
+                watermarks.advance(db, "refresh_trends", started)
+                db.commit()
+                logger.info("Nenhuma partida alterada")
+                return {"status": "success", "message": "Nenhum trend a atualizar", "trends": 0}
         
-        for match in upcoming_matches:
-            # Implementar análise de partidas
-            # Por enquanto, apenas um placeholder
-            pass
+        counts = trends.refresh_trends(db, leagues, team_ids)
+        watermarks.advance(db, "refresh_trends", started)
+        db.commit()
+        invalidate_sync("analysis")
         
+        logger.info(f"Trends atualizados: {counts}")
+        return {"status": "success", "message": "Trends atualizados", "trends": sum(counts.values()), **counts}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erro na atualização de trends: {str(e)}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
+
+@celery_app.task
+@single_run()
+def refresh_team_form(full: bool = False):
+    """Tarefa para atualizar a forma pré-calculada dos times
+    
+    Recalcula apenas os times com partidas alteradas desde a última execução
+    concluída (as alterações feitas pela API já atualizam os dois times na
+    hora). Com ``full=True`` todos os times são recalculados.
+    """
+    db = WorkerSessionLocal()
+    try:
+        logger.info("Atualizando forma dos times")
+        started = watermarks.now(db)
+        
+        if full:
+            team_ids = None
+            ranges = _fan_out_teams(db, refresh_team_form_range, ["analysis"])
+            if ranges:
+                logger.info(f"Forma dos times distribuída em {len(ranges)} faixas de times")
+                return {"status": "success", "message": "Forma dos times distribuída por faixa de times",
+                        "chunks": len(ranges)}
+        else:
+            since = watermarks.changes_since(db, "refresh_team_form", settings.TEAM_FORM_REFRESH_WINDOW)
+            team_ids = statistics.teams_with_recent_results(db, since)
+            if not team_ids:
+                watermarks.advance(db, "refresh_team_form", started)
+                db.commit()
+                logger.info("Nenhum time com partidas alteradas")
+                return {"status": "success", "message": "Nenhuma forma a atualizar", "rows": 0}
+        
+        rows = team_form.refresh_team_form(db, team_ids)
+        watermarks.advance(db, "refresh_team_form", started)
+        db.commit()
+        invalidate_sync("analysis")
+        
+        logger.info(f"Forma dos times atualizada ({rows} linhas)")
+        return {"status": "success", "message": "Forma dos times atualizada", "rows": rows}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erro na atualização da forma dos times: {str(e)}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
+
+@celery_app.task
+def recompute_team_statistics_range(first_id: int, last_id: int):
+    """Recalcular as estatísticas dos times de uma faixa de IDs (parte de um chord)"""
+    db = WorkerSessionLocal()
+    try:
+        team_ids = _team_ids_between(db, first_id, last_id)
+        if team_ids:
+            statistics.recompute_team_statistics(db, team_ids)
+            db.commit()
+        return {"status": "success", "teams": len(team_ids)}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erro nas estatísticas dos times {first_id}-{last_id}: {str(e)}")
+        return {"status": "error", "message": str(e)}
+    finally:
         db.close()
-        logger.info("Análise de partidas concluída")
-        return {"status": "success", "message": "Análise concluída"}
+
+@celery_app.task
+def refresh_team_form_range(first_id: int, last_id: int):
+    """Recalcular a forma dos times de uma faixa de IDs (parte de um chord)"""
+    db = WorkerSessionLocal()
+    try:
+        rows = team_form.refresh_team_form(db, _team_ids_between(db, first_id, last_id))
+        db.commit()
+        return {"status": "success", "rows": rows}
     except Exception as e:
+        db.rollback()
+        logger.error(f"Erro na forma dos times {first_id}-{last_id}: {str(e)}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
+
+@celery_app.task
+def invalidate_cache(results: list, namespaces: List[str]):
+    """Callback dos chords: invalidar o cache uma vez, depois de todas as faixas"""
+    invalidate_sync(*namespaces)
+    errors = [result for result in results if (result or {}).get("status") == "error"]
+    if errors:
+        logger.warning(f"{len(errors)} de {len(results)} faixas terminaram com erro")
+    return {"status": "success" if not errors else "error", "chunks": len(results), "errors": len(errors)}
+
+@celery_app.task
+@single_run(lambda leagues=None: "all" if leagues is None else ",".join(map(str, leagues)))
+def analyze_upcoming_matches(leagues: Optional[List[Optional[str]]] = None):
+    """Tarefa para analisar partidas futuras
+    
+    Analisa todas as partidas agendadas da janela em lotes e grava as
+    previsões. Acima de ANALYSIS_FANOUT_THRESHOLD partidas, distribui uma
+    tarefa por liga entre os workers.
+    """
+    db = WorkerSessionLocal()
+    try:
+        logger.info("Analisando partidas futuras")
+        
+        if leagues is None:
+            counts = match_analysis.upcoming_counts_by_league(db)
+            total = sum(counts.values())
+            if total > settings.ANALYSIS_FANOUT_THRESHOLD and len(counts) > 1:
+                group(analyze_upcoming_matches.s(leagues=[league]) for league in counts).apply_async()
+                logger.info(f"Análise de {total} partidas distribuída em {len(counts)} ligas")
+                return {"status": "success", "message": "Análise distribuída por liga",
+                        "matches": total, "leagues": len(counts)}
+        
+        result = match_analysis.analyze_upcoming(db, leagues)
+        if result["analyzed"]:
+            invalidate_sync("matches")
+        
+        logger.info(f"Análise de partidas concluída: {result['analyzed']} partidas em {result['batches']} lotes")
+        return {"status": "success", "message": "Análise concluída", **result}
+    except Exception as e:
+        db.rollback()
         logger.error(f"Erro na análise de partidas: {str(e)}")
         return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
 
 @celery_app.task
 def test_task():
@@ -1,5 +1,15 @@
+import os
+import socket
+import time
+from typing import Dict
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_process_init
+from kombu import Queue
+from app.core import metrics
+from app.core.cache import get_sync_cache_client
 from app.core.config import settings
+from app.core.database import worker_engine
+from app.core.pool_metrics import pool_status
 
 # Configurar Celery
 celery_app = Celery(
@@ -9,15 +19,39 @@ celery_app = Celery(
     include=["app.tasks"]
 )
 
+# Filas: workers dedicados (-Q) evitam que um recálculo longo atrase a
+# análise agendada; um worker sem -Q consome todas
+QUEUES = ("ingest", "stats", "analysis", "maintenance")
+
+# Tarefa -> (fila, limite suave, limite rígido em segundos)
+TASK_ROUTES = {
+    "app.tasks.collect_daily_matches": ("ingest", 240, 300),
+    "app.tasks.update_team_statistics": ("stats", 540, 600),
+    "app.tasks.recompute_team_statistics_range": ("stats", 240, 300),
+    "app.tasks.refresh_trends": ("stats", 540, 600),
+    "app.tasks.refresh_team_form": ("stats", 540, 600),
+    "app.tasks.refresh_team_form_range": ("stats", 240, 300),
+    "app.tasks.analyze_upcoming_matches": ("analysis", 1200, 1500),  # agendada a cada 30 min
+    "app.tasks.invalidate_cache": ("maintenance", 30, 60),
+    "app.tasks.test_task": ("maintenance", 30, 60),
+}
+
 # Configurações
 celery_app.conf.update(
+    task_queues=[Queue(name) for name in QUEUES],
+    task_default_queue="maintenance",
+    task_routes={name: {"queue": queue} for name, (queue, _, _) in TASK_ROUTES.items()},
+    task_annotations={
+        name: {"soft_time_limit": soft, "time_limit": hard}
+        for name, (_, soft, hard) in TASK_ROUTES.items()
+    },
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
-    task_time_limit=300,  # 5 minutos
+    task_time_limit=300,  # 5 minutos (tarefas fora de TASK_ROUTES)
     task_soft_time_limit=240,  # 4 minutos
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
@@ -33,11 +67,40 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.update_team_statistics",
         "schedule": 7200.0,  # A cada 2 horas
     },
+    "refresh-trends": {
+        "task": "app.tasks.refresh_trends",
+        "schedule": 1800.0,  # A cada 30 minutos
+    },
+    "refresh-team-form": {
+        "task": "app.tasks.refresh_team_form",
+        "schedule": 1800.0,  # A cada 30 minutos
+    },
     "analyze-upcoming-matches": {
         "task": "app.tasks.analyze_upcoming_matches",
         "schedule": 1800.0,  # A cada 30 minutos
     },
 }
 
+@worker_process_init.connect
+def reset_db_pool(**kwargs):
+    """Descartar conexões herdadas do processo pai após o fork"""
+    worker_engine.dispose(close=False)
+
+# Início das tarefas em execução neste processo (task_id -> perf_counter)
+_task_started: Dict[str, float] = {}
+
+@task_prerun.connect
+def start_task_timer(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+@task_postrun.connect
+def record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    """Gravar a duração da tarefa e o pool deste processo em Redis (expostos pelo /metrics da API)"""
+    started = _task_started.pop(task_id, None)
+    if started is not None and settings.METRICS_ENABLED:
+        client = get_sync_cache_client()
+        metrics.record_task_duration(client, task.name, state or "UNKNOWN", time.perf_counter() - started)
+        metrics.record_worker_pool(client, f"{socket.gethostname()}:{os.getpid()}", pool_status(worker_engine))
+
 if __name__ == "__main__":
     celery_app.start() 
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Configuração dos testes
+
+Banco SQLite temporário (recriado a cada teste) e Redis em memória
+(fakeredis), então os testes não dependem de PostgreSQL nem de Redis.
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Antes de importar o app: a configuração é lida na importação
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bet-tests-"), "test.db")
+os.environ["DEBUG"] = "false"
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core import cache, locks
+from app.core.database import Base, SessionLocal, async_engine, engine
+from app.main import app
+from app.models.match import Match
+from app.models.team import Team
+from app.services import match_store
+
+@pytest.fixture(autouse=True)
+def database():
+    """Tabelas recriadas a cada teste"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    match_store._store = match_store.MatchStore()
+    yield
+    engine.dispose()
+
+@pytest.fixture(autouse=True)
+def redis_server():
+    """Redis em memória compartilhado pelos clientes síncrono e assíncrono"""
+    server = fakeredis.FakeServer()
+    cache.set_cache_client(fakeredis.aioredis.FakeRedis(server=server), fakeredis.FakeRedis(server=server))
+    # fakeredis não executa Lua (liberação atômica do redis-py Lock)
+    locks.set_lock_backend(locks.LocalLockBackend())
+    yield server
+    cache.set_cache_client()
+    locks.set_lock_backend()
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def seed(db):
+    """Seis times da mesma liga, 30 partidas finalizadas e uma agendada com odds"""
+    teams = [Team(name=f"Time {i}", short_name=f"T{i}", league_name="Liga A", country="BR") for i in range(6)]
+    db.add_all(teams)
+    db.commit()
+
+    now = datetime.now(timezone.utc)
+    for k in range(30):
+        home, away = teams[k % 6], teams[(k + 1 + k // 6) % 6]
+        if home is away:
+            away = teams[(k + 2) % 6]
+        home_goals, away_goals = k % 4, (k * 7) % 3
+        db.add(Match(
+            home_team_id=home.id, away_team_id=away.id, league_name="Liga A",
+            match_date=now - timedelta(days=k + 1), status="finished",
+            home_goals=home_goals, away_goals=away_goals,
+            winner="home" if home_goals > away_goals else "away" if away_goals > home_goals else "draw",
+            total_goals=home_goals + away_goals, both_teams_scored=home_goals > 0 and away_goals > 0
+        ))
+    scheduled = Match(
+        home_team_id=teams[0].id, away_team_id=teams[1].id, league_name="Liga A",
+        match_date=now + timedelta(hours=3), status="scheduled",
+        home_odds=2.0, draw_odds=3.4, away_odds=3.9
+    )
+    db.add(scheduled)
+    db.commit()
+    return {"teams": [team.id for team in teams], "scheduled": scheduled.id}
+
+class QueryCounter:
+    """Comandos SQL executados pelas engines (evento before_cursor_execute)"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self):
+        self.statements.clear()
+
+@pytest.fixture
+def queries():
+    counter = QueryCounter()
+    targets = (engine, async_engine.sync_engine)
+    for target in targets:
+        event.listen(target, "before_cursor_execute", counter)
+    yield counter
+    for target in targets:
+        event.remove(target, "before_cursor_execute", counter)
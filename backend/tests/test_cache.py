@@ -0,0 +1,63 @@
+"""Cache de respostas em Redis (ResponseCacheMiddleware e invalidação por versão)"""
+
+from app.core import cache
+
+def fetch(client, path, **params):
+    response = client.get(f"/api/v1{path}", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+def test_miss_then_hit(client, seed, queries):
+    first = fetch(client, "/teams/")
+    assert first.headers["X-Cache"] == "MISS"
+    queries.reset()
+    second = fetch(client, "/teams/")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert queries.count == 0
+
+def test_query_string_is_part_of_the_key(client, seed):
+    fetch(client, "/matches/", limit=5)
+    assert fetch(client, "/matches/", limit=6).headers["X-Cache"] == "MISS"
+    # Mesmos parâmetros em outra ordem: mesma chave
+    fetch(client, "/matches/", limit=5, status="finished")
+    assert fetch(client, "/matches/", status="finished", limit=5).headers["X-Cache"] == "HIT"
+
+def test_invalidate_namespace_and_dependents(client, seed):
+    for path in ("/teams/", "/matches/", "/analysis/trends"):
+        fetch(client, path)
+    cache.invalidate_sync("teams")
+    # Times e análises (dependentes) são recalculados; partidas continuam em cache
+    assert fetch(client, "/teams/").headers["X-Cache"] == "MISS"
+    assert fetch(client, "/analysis/trends").headers["X-Cache"] == "MISS"
+    assert fetch(client, "/matches/").headers["X-Cache"] == "HIT"
+
+def test_write_invalidates(client, seed):
+    fetch(client, "/teams/", limit=50)
+    response = client.post("/api/v1/teams/", json={"name": "Time Novo", "league_name": "Liga A"})
+    assert response.status_code == 200, response.text
+    after = fetch(client, "/teams/", limit=50)
+    assert after.headers["X-Cache"] == "MISS"
+    assert "Time Novo" in [team["name"] for team in after.json()]
+
+def test_next_cursor_header_is_cached(client, seed):
+    first = fetch(client, "/matches/", limit=5)
+    cursor = first.headers["X-Next-Cursor"]
+    second = fetch(client, "/matches/", limit=5)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["X-Next-Cursor"] == cursor
+    assert fetch(client, "/matches/", limit=5, cursor=cursor).json()[0]["id"] not in [m["id"] for m in first.json()]
+
+def test_errors_are_not_cached(client, seed):
+    assert client.get("/api/v1/teams/9999").status_code == 404
+    assert client.get("/api/v1/teams/9999").headers.get("X-Cache") is None
+
+def test_falls_back_to_database_when_redis_fails(client, seed, redis_server):
+    redis_server.connected = False
+    response = fetch(client, "/teams/")
+    assert "X-Cache" not in response.headers
+    assert len(response.json()) == 6
+    # Invalidação sem Redis apenas registra o erro
+    cache.invalidate_sync("teams")
+    redis_server.connected = True
+    assert fetch(client, "/teams/").headers["X-Cache"] == "MISS"
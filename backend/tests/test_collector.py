@@ -0,0 +1,122 @@
+"""Coletor da football-data.org (httpx.MockTransport, sem rede)"""
+
+import time
+from datetime import date, datetime, timezone
+
+import httpx
+import pytest
+
+from app.models.match import Match
+from app.models.team import Team
+from app.services import collector
+
+DAY = date(2030, 1, 1)
+
+def api_match(match_id, status="FINISHED", home=1, away=0, winner="HOME_TEAM"):
+    return {
+        "id": match_id,
+        "utcDate": "2030-01-01T15:00:00Z",
+        "status": status,
+        "matchday": 3,
+        "season": {"startDate": "2029-08-01", "endDate": "2030-05-30"},
+        "homeTeam": {"id": 10, "name": "Casa FC", "tla": "CAS"},
+        "awayTeam": {"id": 20, "name": "Fora FC", "tla": "FOR"},
+        "score": {"winner": winner, "fullTime": {"home": home, "away": away}},
+    }
+
+def page(competition, *matches):
+    return {"competition": {"id": 2021, "name": f"Liga {competition}"}, "matches": list(matches)}
+
+class FakeBucket:
+    async def acquire(self):
+        pass
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Esperas do backoff registradas em vez de executadas"""
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(collector.asyncio, "sleep", sleep)
+    return delays
+
+def make_collector(handler, **kwargs):
+    kwargs.setdefault("bucket", FakeBucket())
+    return collector.FixtureCollector(
+        base_url="https://api.test/v4", api_key="chave", transport=httpx.MockTransport(handler), **kwargs
+    )
+
+def test_parse_match():
+    parsed = collector.parse_match(api_match(7), {"id": 2021, "name": "Premier League"})
+    assert parsed == {
+        "external_id": "7",
+        "home_team": {"id": 10, "name": "Casa FC", "tla": "CAS"},
+        "away_team": {"id": 20, "name": "Fora FC", "tla": "FOR"},
+        "league_id": 2021,
+        "league_name": "Premier League",
+        "season": "2029-30",
+        "round": "Matchday 3",
+        "match_date": datetime(2030, 1, 1, 15, tzinfo=timezone.utc),
+        "status": "finished",
+        "home_goals": 1,
+        "away_goals": 0,
+        "winner": "home",
+    }
+
+def test_parse_scheduled_match():
+    parsed = collector.parse_match(api_match(8, status="TIMED", home=None, away=None, winner=None))
+    assert (parsed["status"], parsed["home_goals"], parsed["winner"], parsed["league_name"]) == ("scheduled", None, None, None)
+
+async def test_retry_after_on_429(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "7"})
+        return httpx.Response(200, json=page("PL", api_match(1)))
+
+    matches, errors = await make_collector(handler, max_retries=2).collect(["PL"], DAY, DAY)
+    assert [m["external_id"] for m in matches] == ["1"] and errors == {}
+    assert sleeps == [7.0]
+    assert calls[0].headers["X-Auth-Token"] == "chave"
+    assert calls[0].url.params["dateFrom"] == DAY.isoformat()
+
+async def test_gives_up_after_max_retries(sleeps):
+    handler = lambda request: httpx.Response(503)
+    matches, errors = await make_collector(handler, max_retries=2).collect(["PL"], DAY, DAY)
+    assert matches == [] and "503" in errors["PL"]
+    # Backoff exponencial entre as três tentativas
+    assert len(sleeps) == 2 and sleeps[1] > sleeps[0]
+
+async def test_competition_error_does_not_abort_others(sleeps):
+    ids = {"PL": 1, "SA": 2}
+
+    def handler(request):
+        competition = request.url.path.split("/")[-2]
+        if competition not in ids:
+            return httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(200, json=page(competition, api_match(ids[competition])))
+
+    matches, errors = await make_collector(handler).collect(["PL", "BSA", "SA"], DAY, DAY)
+    assert sorted(m["league_name"] for m in matches) == ["Liga PL", "Liga SA"]
+    assert list(errors) == ["BSA"]
+    assert sleeps == []
+
+async def test_token_bucket_paces_requests():
+    bucket = collector.TokenBucket(rate=20, capacity=2)
+    started = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+    # Duas imediatas (capacidade) e as outras quatro a 20 por segundo
+    assert time.monotonic() - started >= 4 / 20 * 0.9
+
+def test_collect_matches_stores_teams_and_matches(db):
+    handler = lambda request: httpx.Response(200, json=page("PL", api_match(1), api_match(2, status="SCHEDULED", home=None, away=None, winner=None)))
+    result = collector.collect_matches(db, ["PL"], DAY, DAY, collector=make_collector(handler))
+    assert result["fetched"] == 2 and result["errors"] == {}
+    assert {team.external_id for team in db.query(Team)} == {"10", "20"}
+    finished = db.query(Match).filter(Match.external_id == "1").one()
+    assert (finished.winner, finished.total_goals, finished.league_name) == ("home", 1, "Liga PL")
@@ -0,0 +1,62 @@
+"""Filas do Celery e distribuição em faixas de IDs (execução eager, sem broker)"""
+
+import pytest
+
+from app import tasks
+from app.core.config import settings
+from app.fanout import id_ranges, table_id_ranges
+from app.models.team import Team
+from app.worker import QUEUES, TASK_ROUTES, celery_app
+
+@pytest.fixture
+def eager(monkeypatch):
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(celery_app.conf, "task_eager_propagates", True)
+
+def queue_of(name):
+    return celery_app.amqp.router.route({}, name)["queue"].name
+
+@pytest.mark.parametrize("name", sorted(TASK_ROUTES))
+def test_task_routes(name):
+    queue, soft, hard = TASK_ROUTES[name]
+    assert queue in QUEUES
+    assert queue_of(name) == queue
+    task = celery_app.tasks[name]
+    assert (task.soft_time_limit, task.time_limit) == (soft, hard)
+
+def test_unrouted_task_goes_to_default_queue():
+    assert queue_of("app.tasks.nao_existe") == "maintenance"
+
+@pytest.mark.parametrize("first_id, last_id, chunk_size", [
+    (1, 1, 10), (1, 10, 10), (1, 11, 10), (5, 23, 4), (100, 100000, 997),
+])
+def test_id_ranges_cover_every_id_once(first_id, last_id, chunk_size):
+    ranges = id_ranges(first_id, last_id, chunk_size)
+    assert ranges[0][0] == first_id and ranges[-1][1] == last_id
+    for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+        # Faixas inclusivas e contíguas: sem sobreposição nem buracos
+        assert next_start == end + 1
+    assert all(end - start + 1 <= chunk_size for start, end in ranges)
+
+def test_id_ranges_edges():
+    assert id_ranges(1, 10, 5) == [(1, 5), (6, 10)]
+    assert id_ranges(1, 11, 5) == [(1, 5), (6, 10), (11, 11)]
+
+def test_table_id_ranges_empty_table(db):
+    assert table_id_ranges(db, Team.id, 10) == []
+
+def test_full_statistics_chord_invalidates_once(eager, seed, db, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_FANOUT_CHUNK_SIZE", 2)
+    invalidated, callbacks = [], []
+    monkeypatch.setattr(tasks, "invalidate_sync", lambda *namespaces: invalidated.append(namespaces))
+    callback = tasks.invalidate_cache.run
+    monkeypatch.setattr(tasks.invalidate_cache, "run", lambda results, namespaces: callbacks.append(results) or callback(results, namespaces))
+
+    result = tasks.update_team_statistics(full=True)
+    assert result["chunks"] == 3
+    # Callback do chord: uma única vez, com o resultado das três faixas
+    assert len(callbacks) == 1
+    assert [r["teams"] for r in callbacks[0]] == [2, 2, 2]
+    assert invalidated == [("teams",)]
+    db.expire_all()
+    assert sum(team.games_played for team in db.query(Team)) == 60
@@ -0,0 +1,70 @@
+"""Partidas por dia (janela local e cache próprio em Redis)"""
+
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.database import SessionLocal
+from app.models.match import Match
+from app.services import fixtures
+
+SAO_PAULO = fixtures.get_timezone("America/Sao_Paulo")
+BERLIN = fixtures.get_timezone("Europe/Berlin")
+
+def test_day_window_crosses_month_in_utc():
+    start, end = fixtures.day_window(date(2030, 1, 31), SAO_PAULO)
+    assert start == datetime(2030, 1, 31, 3, tzinfo=timezone.utc)
+    assert end == datetime(2030, 2, 1, 3, tzinfo=timezone.utc)
+
+def test_day_window_on_daylight_saving_change():
+    # Início do horário de verão europeu: o dia local tem 23 horas
+    start, end = fixtures.day_window(date(2030, 3, 31), BERLIN)
+    assert end - start == timedelta(hours=23)
+
+def day_of(seed, db):
+    match = db.get(Match, seed["scheduled"])
+    return fixtures._local_date(match.match_date, SAO_PAULO)
+
+def get_day(client, day, **params):
+    response = client.get(f"/api/v1/matches/day/{day.isoformat()}", params={"tz": SAO_PAULO.key, **params})
+    assert response.status_code == 200, response.text
+    return response
+
+def test_day_routes_bypass_response_cache(client, seed, db):
+    response = get_day(client, day_of(seed, db))
+    assert "X-Cache" not in response.headers
+    assert seed["scheduled"] in [match["id"] for match in response.json()]
+    assert "X-Cache" not in client.get("/api/v1/matches/today").headers
+
+def test_league_filter(client, seed, db):
+    day = day_of(seed, db)
+    assert [match["id"] for match in get_day(client, day, league="liga a").json()] == [seed["scheduled"]]
+    assert get_day(client, day, league="Outra Liga").json() == []
+
+def test_odds_append_keeps_day_cache(client, seed, db, queries):
+    day = day_of(seed, db)
+    get_day(client, day)
+    body = [{
+        "match_id": seed["scheduled"], "market": "1x2", "selection": "home", "bookmaker": "casa",
+        "price": 2.5, "recorded_at": datetime.now(timezone.utc).isoformat(),
+    }]
+    assert client.post("/api/v1/matches/odds", json=body).json()["updated"] == 1
+    queries.reset()
+    get_day(client, day)
+    assert queries.count == 0
+
+def test_result_update_invalidates_day_cache(client, seed, db, queries):
+    day = day_of(seed, db)
+    get_day(client, day)
+    response = client.put(f"/api/v1/matches/{seed['scheduled']}", json={"status": "finished", "home_goals": 1, "away_goals": 0})
+    assert response.status_code == 200, response.text
+    queries.reset()
+    [match] = [m for m in get_day(client, day).json() if m["id"] == seed["scheduled"]]
+    assert match["status"] == "finished" and match["home_goals"] == 1
+    assert queries.count > 0
+
+def test_refresh_days_precomputes(client, seed, db, queries):
+    day = day_of(seed, db)
+    with SessionLocal() as session:
+        fixtures.refresh_days(session, [day], SAO_PAULO)
+    queries.reset()
+    assert seed["scheduled"] in [match["id"] for match in get_day(client, day).json()]
+    assert queries.count == 0
@@ -0,0 +1,93 @@
+"""Ingestão em massa de partidas (POST /matches/bulk e ingest.bulk_upsert_matches)"""
+
+from datetime import datetime, timezone
+
+from app.models.match import Match
+from app.models.team import Team
+from app.models.team_form import TeamForm
+from app.services import ingest
+
+DATE = "2030-01-01T15:00:00+00:00"
+
+def bulk(client, items):
+    response = client.post("/api/v1/matches/bulk", json=items)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def stored(db, external_id):
+    db.expire_all()
+    return db.query(Match).filter(Match.external_id == external_id).one()
+
+def item(seed, **fields):
+    home, away = seed["teams"][:2]
+    return {"external_id": "ext-1", "home_team_id": home, "away_team_id": away, "match_date": DATE, **fields}
+
+def test_bulk_accepts_result_and_odds(client, seed, db):
+    assert bulk(client, [item(seed, status="finished", home_goals=2, away_goals=2, home_odds=2.5)]) == {"received": 1, "upserted": 1}
+    match = stored(db, "ext-1")
+    assert (match.status, match.winner, match.total_goals, match.both_teams_scored) == ("finished", "draw", 4, True)
+    assert match.home_odds == 2.5
+
+def test_repost_without_score_keeps_result(client, seed, db):
+    bulk(client, [item(seed, status="finished", home_goals=3, away_goals=1)])
+    # Reenvio só com os dados da partida: resultado e status continuam
+    bulk(client, [item(seed, league_name="Liga A")])
+    match = stored(db, "ext-1")
+    assert (match.status, match.home_goals, match.away_goals) == ("finished", 3, 1)
+    assert (match.winner, match.total_goals, match.both_teams_scored) == ("home", 4, True)
+    assert match.league_name == "Liga A"
+
+def test_new_match_gets_model_defaults(client, seed, db):
+    bulk(client, [item(seed)])
+    match = stored(db, "ext-1")
+    assert (match.status, match.total_goals, match.both_teams_scored, match.winner) == ("scheduled", 0, False, None)
+
+def test_mixed_columns_in_one_batch(seed, db):
+    home, away = seed["teams"][:2]
+    base = {"home_team_id": home, "away_team_id": away, "match_date": datetime(2030, 1, 1, tzinfo=timezone.utc)}
+    ingest.bulk_upsert_matches(db, [
+        {**base, "external_id": "a", "status": "finished", "home_goals": 1, "away_goals": 0},
+        {**base, "external_id": "b"},
+        {**base, "external_id": "a", "home_odds": 1.7},
+    ])
+    db.commit()
+    first, second = stored(db, "a"), stored(db, "b")
+    assert (first.winner, first.home_odds) == ("home", 1.7)
+    assert (second.status, second.home_goals) == ("scheduled", None)
+
+def test_score_change_recomputes_team_statistics(client, seed, db):
+    bulk(client, [item(seed, status="finished", home_goals=1, away_goals=0)])
+    db.expire_all()
+    wins = db.get(Team, seed["teams"][0]).wins
+    bulk(client, [item(seed, home_goals=0, away_goals=1)])
+    db.expire_all()
+    assert db.get(Team, seed["teams"][0]).wins == wins - 1
+    assert stored(db, "ext-1").winner == "away"
+
+def test_identical_repost_is_not_rewritten(client, seed, db):
+    bulk(client, [item(seed, status="finished", home_goals=1, away_goals=0, home_odds=2.5)])
+    db.query(Match).filter(Match.external_id == "ext-1").update({"updated_at": datetime(2020, 1, 1)})
+    db.commit()
+    # Mesmos valores: nada é gravado e a partida não aparece como alterada
+    assert bulk(client, [item(seed, status="finished", home_goals=1, away_goals=0, home_odds=2.5)]) == {"received": 1, "upserted": 0}
+    assert stored(db, "ext-1").updated_at == datetime(2020, 1, 1)
+    assert bulk(client, [item(seed, status="finished", home_goals=1, away_goals=0, home_odds=2.4)]) == {"received": 1, "upserted": 1}
+    assert stored(db, "ext-1").updated_at != datetime(2020, 1, 1)
+
+def test_team_bulk_counts_rows_written(client, seed):
+    teams = [{"external_id": f"t-{i}", "name": f"Time Externo {i}", "league_name": "Liga B"} for i in range(3)]
+    post = lambda items: client.post("/api/v1/teams/bulk", json=items).json()
+    assert post(teams) == {"received": 3, "upserted": 3}
+    # Um alterado, dois iguais e um sem external_id (sempre inserido)
+    teams[0]["name"] = "Time Renomeado"
+    assert post(teams + [{"name": "Time Avulso", "league_name": "Liga B"}]) == {"received": 4, "upserted": 2}
+
+def test_bulk_result_refreshes_team_form(client, seed, db):
+    bulk(client, [item(seed, status="finished", home_goals=3, away_goals=0)])
+    db.expire_all()
+    home, away = seed["teams"][:2]
+    form = {
+        row.team_id: row.form
+        for row in db.query(TeamForm).filter(TeamForm.venue == "all", TeamForm.window_size == 5)
+    }
+    assert form[home].startswith("W") and form[away].startswith("L")
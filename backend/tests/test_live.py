@@ -0,0 +1,41 @@
+"""Distribuição dos eventos ao vivo entre as conexões (LiveFeed.dispatch)"""
+
+import pytest
+
+from app.services import live
+
+@pytest.fixture
+def feed(monkeypatch):
+    """Feed sem a inscrição no Redis: os eventos entram direto por ``dispatch``"""
+    monkeypatch.setattr(live.LiveFeed, "_ensure_listening", lambda self: None)
+    return live.LiveFeed()
+
+def event(match_id, league):
+    return {"id": match_id, "league_name": league, "status": "live"}
+
+def received(subscription):
+    return sorted(subscription.pending)
+
+def test_league_filter_is_case_insensitive_substring(feed):
+    premier = feed.subscribe(leagues=["premier league"])
+    partial = feed.subscribe(leagues=["Liga"])
+    feed.dispatch([event(1, "Premier League"), event(2, "La Liga"), event(3, "Liga Portugal"), event(4, None)])
+    assert received(premier) == [1]
+    assert received(partial) == [2, 3]
+
+def test_unfiltered_and_match_subscriptions(feed):
+    everything = feed.subscribe()
+    one = feed.subscribe(match_ids=[2])
+    feed.dispatch([event(1, "Serie A"), event(2, "Serie B")])
+    assert received(everything) == [1, 2]
+    assert received(one) == [2]
+
+def test_unsubscribe_stops_delivery(feed):
+    first = feed.subscribe(leagues=["serie"])
+    feed.dispatch([event(1, "Serie A")])
+    feed.unsubscribe(first)
+    # Termo novo depois do cache da liga já montado
+    second = feed.subscribe(leagues=["a"])
+    feed.dispatch([event(2, "Serie A")])
+    assert received(first) == [1]
+    assert received(second) == [2]
@@ -0,0 +1,41 @@
+"""Armazenamento colunar das partidas finalizadas (carga inicial concorrente)"""
+
+import asyncio
+
+from app.core.database import AsyncSessionLocal
+from app.services import match_store
+
+async def test_concurrent_callers_wait_for_cold_load(seed):
+    store = match_store._store
+    assert not store.loaded
+    # A segunda chamada chega enquanto a primeira aguarda o banco (mesmo loop)
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        sizes = await asyncio.gather(
+            first.run_sync(lambda db: len(match_store.get_match_store(db))),
+            second.run_sync(lambda db: len(match_store.get_match_store(db))),
+        )
+    # As duas chamadas recebem o armazenamento carregado, nunca vazio
+    assert sizes == [30, 30]
+    assert store.loaded
+
+async def test_failed_cold_load_is_retried_by_waiter(seed, monkeypatch):
+    store = match_store._store
+    calls = []
+    merge = store._merge
+
+    def flaky(rows, replace):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise RuntimeError("falha simulada")
+        merge(rows, replace)
+
+    monkeypatch.setattr(store, "_merge", flaky)
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        results = await asyncio.gather(
+            first.run_sync(lambda db: len(match_store.get_match_store(db))),
+            second.run_sync(lambda db: len(match_store.get_match_store(db))),
+            return_exceptions=True,
+        )
+    # A primeira carga falha; quem esperava faz a carga de novo
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] == 30
@@ -0,0 +1,45 @@
+"""Atualização de partidas (PUT /matches/{id}) e estatísticas dos times"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.team import Team
+
+def put(client, match_id, **fields):
+    response = client.put(f"/api/v1/matches/{match_id}", json=fields)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def wins(db, team_id):
+    db.expire_all()
+    return db.get(Team, team_id).wins
+
+def test_update_locks_the_match_row(client, seed):
+    locked = []
+
+    def record(state):
+        if state.is_select and state.statement._for_update_arg is not None:
+            locked.append(state.statement)
+
+    # O SQLite ignora FOR UPDATE; o lock é conferido na consulta do ORM
+    event.listen(Session, "do_orm_execute", record)
+    try:
+        put(client, seed["scheduled"], round="Rodada 1")
+    finally:
+        event.remove(Session, "do_orm_execute", record)
+    assert len(locked) == 1
+
+def test_repeated_result_is_applied_once(client, seed, db):
+    home = seed["teams"][0]
+    before = wins(db, home)
+    for _ in range(2):
+        put(client, seed["scheduled"], status="finished", home_goals=2, away_goals=0)
+    assert wins(db, home) == before + 1
+
+def test_score_correction_moves_the_win(client, seed, db):
+    home, away = seed["teams"][:2]
+    home_wins, away_wins = wins(db, home), wins(db, away)
+    put(client, seed["scheduled"], status="finished", home_goals=2, away_goals=0)
+    match = put(client, seed["scheduled"], home_goals=0, away_goals=1)
+    assert match["winner"] == "away"
+    assert (wins(db, home), wins(db, away)) == (home_wins, away_wins + 1)
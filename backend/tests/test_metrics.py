@@ -0,0 +1,72 @@
+"""Métricas do Prometheus (GET /metrics)"""
+
+import os
+import socket
+import sqlite3
+
+from app.core import metrics
+from app.core.cache import get_sync_cache_client
+from app.core.pool_metrics import InstrumentedQueuePool, get_metrics
+from app.tasks import test_task
+from app.worker import celery_app
+
+WORKER = f'worker="{os.getpid()}"'
+
+def scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    return response.text.splitlines()
+
+def series(lines, name):
+    return [line for line in lines if line.startswith(name) and not line.startswith("#")]
+
+def test_process_series_have_worker_label(client, seed):
+    client.get("/api/v1/teams/")
+    client.get("/api/v1/teams/")
+    lines = scrape(client)
+    for name in ("bet_http_request_duration_seconds_count", "bet_http_request_db_seconds_total",
+                 "bet_cache_requests_total", "bet_cache_hit_ratio", "bet_db_pool_"):
+        found = series(lines, name)
+        assert found, name
+        assert all(WORKER in line for line in found), name
+    assert any('route="/api/v1/teams/"' in line and 'status="200"' in line
+               for line in series(lines, "bet_http_request_duration_seconds_count"))
+
+def test_celery_series_are_aggregated_without_worker(client):
+    metrics.record_task_duration(get_sync_cache_client(), "app.tasks.test_task", "SUCCESS", 0.3)
+    found = series(scrape(client), "bet_celery_task_duration_seconds_count")
+    assert found == ['bet_celery_task_duration_seconds_count{task="app.tasks.test_task",state="SUCCESS"} 1']
+
+def test_worker_pool_is_published_through_redis(client):
+    client_sync = get_sync_cache_client()
+    metrics.record_worker_pool(client_sync, "celery-1:42", {"pool_class": "QueuePool", "size": 2, "checked_out": 1, "checkouts": 7})
+    pools = client.get("/metrics/pool").json()
+    assert set(pools) == {"api", "api_sync", "worker"}
+    assert pools["worker"] == {"celery-1:42": {"size": 2.0, "checked_out": 1.0, "checkouts": 7.0}}
+    lines = scrape(client)
+    assert 'bet_db_pool_checkouts_total{pool="worker",worker="celery-1:42"} 7.0' in lines
+
+def test_expired_worker_pool_is_dropped(client):
+    client_sync = get_sync_cache_client()
+    metrics.record_worker_pool(client_sync, "celery-1:43", {"checkouts": 1})
+    client_sync.delete("bet:metrics:pool:celery-1:43")
+    assert client.get("/metrics/pool").json()["worker"] == {}
+    assert client_sync.smembers("bet:metrics:pools") == set()
+
+def test_task_publishes_worker_pool(monkeypatch):
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    test_task.apply()
+    assert get_sync_cache_client().smembers("bet:metrics:pools") == {f"{socket.gethostname()}:{os.getpid()}".encode()}
+
+def test_overflow_counts_only_new_connections_past_pool_size():
+    pool = InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=2, logging_name="teste_overflow"
+    )
+    first, second = pool.connect(), pool.connect()  # a segunda abre uma conexão de overflow
+    second.close()
+    third = pool.connect()  # reaproveita a conexão ociosa: não é um novo overflow
+    stats = get_metrics("teste_overflow").snapshot()
+    assert (stats["checkouts"], stats["overflow_events"]) == (3, 1)
+    for connection in (first, third):
+        connection.close()
+    pool.dispose()
@@ -0,0 +1,72 @@
+"""Histórico de odds e odd atual das partidas"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.models.match import Match
+from app.models.odds import OddsSnapshot
+from app.services import odds
+
+T0 = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+def snapshot(match_id, price, minutes=0, selection="home", bookmaker="casa"):
+    return {
+        "match_id": match_id, "market": "1x2", "selection": selection, "bookmaker": bookmaker,
+        "price": price, "recorded_at": T0 + timedelta(minutes=minutes),
+    }
+
+def current(db, match_id, column="home_odds"):
+    db.expire_all()
+    return getattr(db.get(Match, match_id), column)
+
+def test_newest_price_becomes_current(db, seed):
+    match_id = seed["scheduled"]
+    result = odds.append_snapshots(db, [snapshot(match_id, 2.1, 0), snapshot(match_id, 2.3, 5), snapshot(match_id, 2.2, 3)])
+    db.commit()
+    assert result == {"received": 3, "appended": 3, "updated": 1}
+    assert current(db, match_id) == 2.3
+
+def test_backfill_does_not_overwrite_current(db, seed):
+    match_id = seed["scheduled"]
+    odds.append_snapshots(db, [snapshot(match_id, 2.3, 10)])
+    db.commit()
+    # Preços antigos chegando depois só entram no histórico
+    result = odds.append_snapshots(db, [snapshot(match_id, 1.9, 0), snapshot(match_id, 1.8, 5, bookmaker="outra")])
+    db.commit()
+    assert result == {"received": 2, "appended": 2, "updated": 0}
+    assert current(db, match_id) == 2.3
+
+def test_same_price_is_not_an_update(db, seed):
+    match_id = seed["scheduled"]
+    # home_odds já é 2.0 na partida
+    result = odds.append_snapshots(db, [snapshot(match_id, 2.0, 0), snapshot(match_id, 3.4, 0, selection="draw")])
+    db.commit()
+    assert result["updated"] == 0
+
+def test_unknown_selection_only_goes_to_history(db, seed):
+    match_id = seed["scheduled"]
+    result = odds.append_snapshots(db, [{**snapshot(match_id, 5.0), "market": "correct_score", "selection": "1-0"}])
+    db.commit()
+    assert result == {"received": 1, "appended": 1, "updated": 0}
+
+def test_endpoint_keeps_cache_when_no_current_price_changes(client, seed):
+    match_id = seed["scheduled"]
+    body = [{**snapshot(match_id, 2.0), "recorded_at": T0.isoformat()}]
+    client.get("/api/v1/matches/", params={"limit": 5})
+    response = client.post("/api/v1/matches/odds", json=body)
+    assert response.json() == {"received": 1, "appended": 1, "updated": 0}
+    assert client.get("/api/v1/matches/", params={"limit": 5}).headers["X-Cache"] == "HIT"
+
+    body = [{**snapshot(match_id, 2.4, 1), "recorded_at": (T0 + timedelta(minutes=1)).isoformat()}]
+    assert client.post("/api/v1/matches/odds", json=body).json()["updated"] == 1
+    assert client.get("/api/v1/matches/", params={"limit": 5}).headers["X-Cache"] == "MISS"
+
+def test_unknown_match_is_rejected_before_writing(client, seed, db):
+    body = [{**snapshot(seed["scheduled"], 2.6), "recorded_at": T0.isoformat()},
+            {**snapshot(9998, 2.0), "recorded_at": T0.isoformat()},
+            {**snapshot(9999, 2.0), "recorded_at": T0.isoformat()}]
+    response = client.post("/api/v1/matches/odds", json=body)
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Partidas não encontradas: 9998, 9999"
+    # Nada do lote foi gravado
+    assert db.query(OddsSnapshot).count() == 0
+    assert current(db, seed["scheduled"]) == 2.0
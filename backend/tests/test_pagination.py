@@ -0,0 +1,24 @@
+"""Cursores da paginação keyset (X-Next-Cursor)"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+@pytest.mark.parametrize("path, cursor", [
+    ("/api/v1/matches/", encode_cursor("ontem", 10)),
+    ("/api/v1/matches/", encode_cursor(datetime.now(timezone.utc), "10")),
+    ("/api/v1/teams/", encode_cursor(5, 10)),
+    ("/api/v1/teams/", encode_cursor("Time 1", True)),
+    ("/api/v1/teams/", "não-é-base64"),
+])
+def test_tampered_cursor_is_rejected(client, seed, path, cursor):
+    response = client.get(path, params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
+
+def test_cursor_round_trip():
+    when = datetime(2030, 1, 1, 15, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(when, 7), datetime, int) == (when, 7)
+    assert decode_cursor(encode_cursor("Time 1", 7), str, int) == ("Time 1", 7)
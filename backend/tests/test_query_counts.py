@@ -0,0 +1,63 @@
+"""Número de comandos SQL por requisição (consultas em lote, sem N+1)"""
+
+from app.core import cache
+from app.core.config import settings
+from app.services import match_analysis
+
+def get(client, queries, path, cached=False, **params):
+    """GET contando os comandos SQL (com o cache de respostas limpo, salvo ``cached``)"""
+    if not cached:
+        cache.get_sync_cache_client().flushall()
+    queries.reset()
+    response = client.get(f"/api/v1{path}", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+def test_list_matches_single_query(client, seed, queries):
+    response = get(client, queries, "/matches/", limit=20)
+    assert len(response.json()) == 20
+    assert queries.count == 1
+
+def test_list_teams_single_query(client, seed, queries):
+    response = get(client, queries, "/teams/", limit=50)
+    assert len(response.json()) == 6
+    assert queries.count == 1
+
+def test_analyze_match_with_stored_prediction(client, seed, db, queries):
+    match_analysis.analyze_upcoming(db)
+    # Partida, times e previsão gravada em uma única consulta
+    response = get(client, queries, f"/analysis/match/{seed['scheduled']}")
+    assert response.json()["home_team"]["name"] == "Time 0"
+    assert response.json()["predicted_at"] is not None
+    assert queries.count == 1
+
+def test_analyze_match_without_prediction(client, seed, queries):
+    get(client, queries, f"/analysis/match/{seed['scheduled']}")
+    # Partida com os times + leitura incremental do armazenamento colunar
+    response = get(client, queries, f"/analysis/match/{seed['scheduled']}")
+    assert response.json()["predicted_at"] is None
+    assert queries.count == 2
+
+def test_analyze_unknown_match(client, seed, queries):
+    queries.reset()
+    assert client.get("/api/v1/analysis/match/9999").status_code == 404
+    assert queries.count == 1
+
+def test_team_form_does_not_query_per_match(client, seed, queries):
+    get(client, queries, f"/analysis/team/{seed['teams'][0]}/form")
+    # Time + nomes dos adversários, independente do número de partidas
+    response = get(client, queries, f"/analysis/team/{seed['teams'][1]}/form")
+    assert len(response.json()["recent_form"]) == 5
+    # Time + leitura incremental do armazenamento + nomes dos adversários
+    assert queries.count == 3
+
+def test_trends_single_query(client, seed, queries):
+    get(client, queries, "/analysis/trends")
+    assert queries.count == 1
+
+def test_cached_response_skips_database(client, seed, queries):
+    assert settings.CACHE_ENABLED
+    get(client, queries, "/matches/", limit=5)
+    response = get(client, queries, "/matches/", cached=True, limit=5)
+    assert response.headers["X-Cache"] == "HIT"
+    assert queries.count == 0
@@ -0,0 +1,50 @@
+"""Trends materializados por time (sequências de vitórias)"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.models.match import Match
+from app.models.team import Team
+from app.services import trends
+
+@pytest.fixture
+def streaks(db):
+    """Time A com 4 vitórias seguidas (3 em casa) após uma derrota; time B sem sequência"""
+    a, b = Team(name="Time A", league_name="Liga S"), Team(name="Time B", league_name="Liga S")
+    db.add_all([a, b])
+    db.commit()
+    now = datetime.now(timezone.utc)
+    # Da mais recente para a mais antiga: (A em casa, gols de A, gols de B)
+    results = [(True, 2, 0), (False, 1, 0), (True, 3, 1), (True, 1, 0), (True, 0, 2), (False, 2, 2)]
+    for days, (a_home, a_goals, b_goals) in enumerate(results, start=1):
+        home, away = (a, b) if a_home else (b, a)
+        home_goals, away_goals = (a_goals, b_goals) if a_home else (b_goals, a_goals)
+        db.add(Match(
+            home_team_id=home.id, away_team_id=away.id, league_name="Liga S", status="finished",
+            match_date=now - timedelta(days=days), home_goals=home_goals, away_goals=away_goals,
+        ))
+    db.commit()
+    return a.id, b.id
+
+def streak_rows(db, team_id):
+    return {row["trend_type"]: row for row in trends.team_trend_rows(db, [team_id]) if row["streak"] is not None}
+
+def test_streaks_below_minimum_are_skipped(db, streaks):
+    a, b = streaks
+    assert settings.TRENDS_MIN_STREAK == 3
+    assert streak_rows(db, b) == {}
+    # A: 4 seguidas no total, 3 em casa, 1 fora (abaixo do mínimo)
+    assert {k: row["streak"] for k, row in streak_rows(db, a).items()} == {"win_streak": 4, "home_win_streak": 3}
+
+def test_streak_confidence_grows_with_length(db, streaks):
+    rows = streak_rows(db, streaks[0])
+    overall, home = rows["win_streak"], rows["home_win_streak"]
+    assert (overall["matches_count"], overall["successes"], overall["success_rate"]) == (4, 4, 1.0)
+    assert overall["confidence"] == round(trends.wilson_lower_bound(4, 4), 4)
+    assert overall["confidence"] > home["confidence"]
+
+def test_minimum_streak_is_configurable(db, streaks, monkeypatch):
+    monkeypatch.setattr(settings, "TRENDS_MIN_STREAK", 1)
+    assert set(streak_rows(db, streaks[0])) == {"win_streak", "home_win_streak", "away_win_streak"}
@@ -0,0 +1,53 @@
+"""Marcas d'água e execução única das tarefas incrementais"""
+
+from datetime import timedelta
+
+import pytest
+
+from app import tasks
+from app.core.locks import job_lock
+from app.models.job_watermark import JobWatermark
+from app.services import team_form, trends, watermarks
+
+JOBS = [
+    (tasks.refresh_trends, trends, "refresh_trends"),
+    (tasks.refresh_team_form, team_form, "refresh_team_form"),
+]
+
+def stored_mark(db, job):
+    db.expire_all()
+    mark = db.get(JobWatermark, job)
+    return mark and watermarks._utc(mark.watermark)
+
+def test_now_comes_from_database(db):
+    value = watermarks.now(db)
+    assert value.tzinfo is not None
+    assert value.utcoffset() == timedelta(0)
+
+def test_concurrent_run_is_skipped(seed, db):
+    with job_lock("refresh_trends", 60) as acquired:
+        assert acquired
+        assert tasks.refresh_trends()["status"] == "skipped"
+    assert stored_mark(db, "refresh_trends") is None
+
+@pytest.mark.parametrize("task, module, job", JOBS)
+def test_successful_run_advances_watermark(task, module, job, seed, db):
+    before = watermarks.now(db)
+    assert task()["status"] == "success"
+    # Segundos inteiros no SQLite (CURRENT_TIMESTAMP)
+    assert stored_mark(db, job) >= before.replace(microsecond=0)
+
+@pytest.mark.parametrize("task, module, job", JOBS)
+def test_failed_run_keeps_watermark(task, module, job, seed, db, monkeypatch):
+    mark = watermarks.now(db) - timedelta(hours=1)
+    watermarks.advance(db, job, mark)
+    db.commit()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("falha simulada")
+
+    monkeypatch.setattr(module, job, fail)
+    assert task() == {"status": "error", "message": "falha simulada"}
+    assert stored_mark(db, job) == mark
+    # A próxima execução refaz o mesmo intervalo
+    assert watermarks.changes_since(db, job, 0) < mark
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Backtest das previsões e estratégias de aposta sobre as partidas finalizadas
+
+Reproduz o histórico em ordem de data, prevendo cada partida apenas com os
+dados anteriores ao início, e aposta com a estratégia escolhida usando as
+odds gravadas. Com --synthetic N roda sobre N partidas sintéticas (sem
+banco), útil para medir o tempo em históricos grandes.
+
+Uso:
+    python scripts/backtest.py --strategy kelly --date-from 2023-08-01
+    python scripts/backtest.py --synthetic 500000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Adicionar o diretório backend ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.services import backtest, value_bets
+
+def synthetic_history(matches: int, teams: int, seed: int = 42) -> dict:
+    """Histórico sintético: times com forças fixas e odds com margem de ~5%"""
+    rng = np.random.default_rng(seed)
+    attack = rng.lognormal(0, 0.25, teams)
+    defence = rng.lognormal(0, 0.2, teams)
+    home = rng.integers(0, teams, matches)
+    away = (home + rng.integers(1, teams, matches)) % teams
+    home_lambda = 1.5 * attack[home] * defence[away]
+    away_lambda = 1.15 * attack[away] * defence[home]
+
+    # Odds a partir das probabilidades verdadeiras com ruído e margem
+    true = backtest._model_probabilities(home_lambda, away_lambda)
+    noisy = true * rng.lognormal(0, 0.08, true.shape)
+    odds = np.empty(true.shape)
+    for columns in value_bets.MARKETS.values():
+        market = noisy[:, columns]
+        odds[:, columns] = 1 / (market / market.sum(axis=1, keepdims=True) * 1.05)
+
+    start = np.datetime64("2010-01-01T00:00", "us")
+    return {
+        "match_id": np.arange(1, matches + 1),
+        "match_date": start + np.arange(matches) * np.timedelta64(20, "m"),
+        "home_team_id": home + 1,
+        "away_team_id": away + 1,
+        "home_goals": rng.poisson(home_lambda).astype(float),
+        "away_goals": rng.poisson(away_lambda).astype(float),
+        "odds": np.round(odds, 2),
+    }
+
+def print_report(report: dict):
+    print(f"\n📊 {report['evaluated']} de {report['matches']} partidas avaliadas", end="")
+    print(f" ({report['period'][0][:10]} a {report['period'][1][:10]})" if report["period"] else "")
+    print(f"🎯 Apostas: {report['bets']} | acertos: {report['wins']} | taxa de acerto: {report['hit_rate']}")
+    print(f"💰 Apostado: {report['staked']} | lucro: {report['profit']} | ROI: {report['roi']}")
+    print(f"🏦 Banca final: {report['final_bankroll']} | drawdown máximo: {report['max_drawdown']:.1%}")
+    if report["ruined_at"]:
+        print(f"💥 Banca zerada em {report['ruined_at'][:10]}")
+    print("📐 Brier: " + ", ".join(f"{name}={value}" for name, value in report["brier"].items()))
+    for market, values in report["markets"].items():
+        print(f"   {market:<16} apostas={values['bets']:<7} lucro={values['profit']:<10} ROI={values['roi']}")
+    print(f"⏱️  {report['elapsed_seconds']}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--strategy", choices=sorted(backtest.STRATEGIES), default="flat", help="Estratégia de aposta")
+    parser.add_argument("--league", help="Filtrar por liga")
+    parser.add_argument("--date-from", type=datetime.fromisoformat, help="Início do período apostado")
+    parser.add_argument("--date-to", type=datetime.fromisoformat, help="Fim do período apostado")
+    parser.add_argument("--market", action="append", choices=sorted(value_bets.MARKETS), help="Mercados apostados (repetível)")
+    parser.add_argument("--min-edge", type=float, default=0.02, help="Valor esperado mínimo")
+    parser.add_argument("--min-games", type=int, default=5, help="Jogos anteriores mínimos de cada time no mando")
+    parser.add_argument("--window", type=int, help="Considerar apenas os últimos N jogos de cada time no mando")
+    parser.add_argument("--unit", type=float, default=0.01, help="Fração da banca por aposta (flat/best)")
+    parser.add_argument("--compound", action="store_true", help="Apostas proporcionais à banca atual")
+    parser.add_argument("--margin-method", choices=value_bets.MARGIN_METHODS, default="proportional")
+    parser.add_argument("--kelly-fraction", type=float, default=0.25)
+    parser.add_argument("--max-stake", type=float, default=0.05)
+    parser.add_argument("--synthetic", type=int, help="Usar N partidas sintéticas em vez do banco")
+    parser.add_argument("--teams", type=int, default=500, help="Times sintéticos")
+    parser.add_argument("--json", action="store_true", help="Imprimir o relatório em JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.synthetic:
+        print(f"🌱 Gerando {args.synthetic} partidas sintéticas...")
+        history = synthetic_history(args.synthetic, args.teams)
+    else:
+        from app.core.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            history = backtest.load_history(db, league=args.league)
+        finally:
+            db.close()
+    print(f"📥 {history['match_id'].size} partidas carregadas em {time.perf_counter() - start:.2f}s")
+
+    report = backtest.run_backtest(
+        history,
+        strategy=args.strategy,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        min_edge=args.min_edge,
+        min_games=args.min_games,
+        window=args.window,
+        unit=args.unit,
+        compound=args.compound,
+        markets=args.market,
+        margin_method=args.margin_method,
+        kelly_fraction=args.kelly_fraction,
+        max_stake=args.max_stake,
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concorrência: sessão síncrona vs sessão assíncrona
+
+Dispara N requisições simultâneas, cada uma executando uma consulta lenta
+(pg_sleep), primeiro com a Session síncrona chamada dentro de corrotinas
+(comportamento antigo dos endpoints, que bloqueia o event loop) e depois com
+a AsyncSession. Requer PostgreSQL em DATABASE_URL.
+
+Uso:
+    python scripts/benchmark_async_db.py --concurrency 1 5 10 20 --delay 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from sqlalchemy import text
+
+# Adicionar o diretório backend ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.database import AsyncSessionLocal, SessionLocal, engine
+
+async def sync_request(delay: float):
+    """Requisição no caminho antigo (Session síncrona dentro de async def)"""
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT pg_sleep(:delay)"), {"delay": delay})
+    finally:
+        db.close()
+
+async def async_request(delay: float):
+    """Requisição no caminho novo (AsyncSession)"""
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SELECT pg_sleep(:delay)"), {"delay": delay})
+
+async def run(handler, concurrency: int, delay: float) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*[handler(delay) for _ in range(concurrency)])
+    return time.perf_counter() - start
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--delay", type=float, default=0.05, help="Duração da consulta (s)")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("❌ Este benchmark requer PostgreSQL (pg_sleep)")
+        return
+
+    # Aquecer os pools de conexão
+    await run(sync_request, 1, 0)
+    await run(async_request, max(args.concurrency), 0)
+
+    print(f"{'concorrência':>12} {'sync (s)':>10} {'async (s)':>10} {'ganho':>8}")
+    for concurrency in args.concurrency:
+        sync_time = await run(sync_request, concurrency, args.delay)
+        async_time = await run(async_request, concurrency, args.delay)
+        print(f"{concurrency:>12} {sync_time:>10.3f} {async_time:>10.3f} {sync_time / async_time:>7.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória: objetos Match do ORM vs armazenamento colunar
+
+Carrega as partidas finalizadas das duas formas, medindo a memória alocada
+(tracemalloc) e o tempo de carga, e em seguida roda uma análise de liga
+inteira (forças dos times + forma de todos os times) sobre o armazenamento.
+Por padrão usa um banco SQLite temporário com partidas sintéticas; com
+--use-database usa o banco de DATABASE_URL.
+
+Uso:
+    python scripts/benchmark_match_store.py --matches 200000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+# Adicionar o diretório backend ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.database import Base, SessionLocal
+from app.models.match import Match
+from app.models.team import Team
+from app.services import prediction
+from app.services.match_store import MatchStore
+
+def synthetic_session(matches: int, teams: int):
+    """Sessão em um SQLite temporário com partidas finalizadas aleatórias"""
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    db.execute(Team.__table__.insert(), [{"name": f"Team {i}"} for i in range(teams)])
+    start = datetime(2015, 1, 1)
+    rows = []
+    for i in range(matches):
+        home, away = random.sample(range(1, teams + 1), 2)
+        hg, ag = random.randint(0, 5), random.randint(0, 4)
+        rows.append({
+            "home_team_id": home, "away_team_id": away,
+            "league_name": f"League {home % 20}", "season": "2024-25", "round": "Matchday 1",
+            "match_date": start + timedelta(minutes=15 * i), "status": "finished",
+            "home_goals": hg, "away_goals": ag, "total_goals": hg + ag,
+            "both_teams_scored": hg > 0 and ag > 0, "winner": "home" if hg > ag else "away" if hg < ag else "draw",
+            "home_odds": 2.1, "draw_odds": 3.3, "away_odds": 3.6,
+            "statistics": {"possession": [55, 45], "shots": [12, 9], "corners": [6, 3]},
+        })
+    db.execute(Match.__table__.insert(), rows)
+    db.commit()
+    return db
+
+def measure(label: str, load):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:>9.2f}s {current / 2**20:>12.1f} MB {peak / 2**20:>10.1f} MB")
+    return result, current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=200_000, help="Partidas sintéticas")
+    parser.add_argument("--teams", type=int, default=400, help="Times sintéticos")
+    parser.add_argument("--use-database", action="store_true", help="Usar o banco de DATABASE_URL")
+    args = parser.parse_args()
+
+    if args.use_database:
+        db = SessionLocal()
+    else:
+        print(f"🌱 Gerando {args.matches} partidas sintéticas...")
+        db = synthetic_session(args.matches, args.teams)
+
+    print(f"\n{'carga':<28} {'tempo':>10} {'retido':>15} {'pico':>13}")
+    objects, orm_bytes = measure("ORM (objetos Match)", lambda: db.execute(
+        select(Match).where(Match.status == "finished")
+    ).scalars().all())
+    count = len(objects)
+    del objects
+    db.expunge_all()
+
+    store, store_bytes = measure("Colunar (MatchStore)", lambda: _load_store(db))
+    print(f"\n{count} partidas; colunas: {store.nbytes / 2**20:.1f} MB; "
+          f"ORM retém {orm_bytes / max(store_bytes, 1):.0f}x mais memória")
+
+    start = time.perf_counter()
+    strengths = prediction.fit_team_strengths(*store.results())
+    fitted = time.perf_counter() - start
+    start = time.perf_counter()
+    for team_id in strengths.team_ids.tolist():
+        store.team_results(team_id, limit=20)
+    form = time.perf_counter() - start
+    print(f"Forças de {strengths.team_ids.size} times: {fitted * 1000:.1f} ms; "
+          f"forma (20 jogos) de todos os times: {form * 1000:.1f} ms")
+    db.close()
+
+def _load_store(db) -> MatchStore:
+    store = MatchStore()
+    store.refresh(db)
+    return store
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark da serialização das listas da API
+
+Compara, para páginas de N partidas (MatchResponse), o caminho padrão do
+FastAPI (objetos do ORM validados pelo response_model e codificados pelo
+JSONResponse) com o caminho rápido (linhas com apenas as colunas da
+resposta, validadas e serializadas pelo TypeAdapter da lista). Com o
+orjson instalado, mede também a codificação final pelo orjson.
+
+Uso:
+    python scripts/benchmark_serialization.py --rows 10 100 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import List
+
+# Adicionar o diretório backend ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_response_field
+
+from app.core.serialization import dump_list, list_adapter
+from app.models.match import Match
+from app.schemas.match import MatchResponse
+
+COLUMNS = list(MatchResponse.model_fields)
+
+def synthetic_matches(rows: int) -> List[Match]:
+    """Partidas finalizadas com odds, estatísticas e previsão"""
+    start = datetime(2024, 1, 1, 15, 0)
+    return [
+        Match(
+            id=i + 1, external_id=f"ext-{i}", home_team_id=i % 40 + 1, away_team_id=(i + 7) % 40 + 1,
+            match_date=start + timedelta(hours=i), league_name="Premier League", season="2023/2024",
+            round=f"Rodada {i % 38 + 1}", status="finished", home_goals=i % 4, away_goals=i % 3,
+            winner="home" if i % 4 > i % 3 else "draw" if i % 4 == i % 3 else "away",
+            total_goals=i % 4 + i % 3, both_teams_scored=bool(i % 4 and i % 3),
+            home_odds=2.1, draw_odds=3.4, away_odds=3.6, over_2_5_odds=1.9, under_2_5_odds=1.95,
+            btts_yes_odds=1.8, btts_no_odds=2.0,
+            statistics={"possession": [55, 45], "shots": [14, 9], "corners": [6, 3], "cards": [2, 1]},
+            prediction_confidence=0.52, predicted_result="home", analysis_notes="Placar mais provável 1-1",
+            created_at=start, updated_at=start,
+        )
+        for i in range(rows)
+    ]
+
+def orm_path(field, matches) -> bytes:
+    """Caminho padrão: response_model (etapas do serialize_response) + JSONResponse"""
+    value, errors = field.validate(matches, {}, loc=("response",))
+    if errors:
+        raise ValueError(errors)
+    return JSONResponse(field.serialize(value, mode="json")).body
+
+def fast_path(rows) -> bytes:
+    return dump_list(MatchResponse, rows)
+
+def orjson_path(rows) -> bytes:
+    import orjson
+
+    adapter = list_adapter(MatchResponse)
+    return orjson.dumps(adapter.dump_python(adapter.validate_python(rows, from_attributes=True)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    paths = [("orm + response_model", orm_path), ("typeadapter", fast_path)]
+    try:
+        import orjson  # noqa: F401
+        paths.append(("typeadapter + orjson", orjson_path))
+    except ImportError:
+        pass
+
+    field = create_response_field(name="response", type_=List[MatchResponse])
+    Row = namedtuple("Row", COLUMNS)
+
+    print(f"{'linhas':>8} {'caminho':>22} {'µs/linha':>10} {'bytes':>10}")
+    for rows in args.rows:
+        matches = synthetic_matches(rows)
+        selected = [Row(*(getattr(match, column) for column in COLUMNS)) for match in matches]
+        for name, path in paths:
+            content = path(field, matches) if path is orm_path else path(selected)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                path(field, matches) if path is orm_path else path(selected)
+            elapsed = (time.perf_counter() - start) / args.repeat
+            print(f"{rows:>8} {name:>22} {elapsed / rows * 1e6:>10.1f} {len(content):>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark da vazão das tarefas do Celery conforme o número de workers
+
+Distribui N IDs sintéticos em faixas (app.fanout) e mede o tempo até o
+callback do chord terminar, com 1, 2, 4... workers. Cada ID simula um tempo
+de espera fixo (consulta ao banco, chamada HTTP), então a vazão deve crescer
+perto do linear com os workers. Por padrão usa broker e backend em memória
+(sem Redis) e os workers são threads de um worker no próprio processo.
+
+Uso:
+    python scripts/benchmark_workers.py --workers 1 2 4 8
+    python scripts/benchmark_workers.py --broker redis://localhost:6379/1 --backend redis://localhost:6379/1
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Adicionar o diretório backend ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from celery.contrib.testing.worker import start_worker
+
+from app.fanout import fan_out, id_ranges
+from app.worker import celery_app
+
+@celery_app.task(name="benchmark.process_range")
+def process_range(first_id: int, last_id: int, work_ms: float):
+    """Faixa sintética: ``work_ms`` de espera por ID"""
+    time.sleep((last_id - first_id + 1) * work_ms / 1000)
+    return last_id - first_id + 1
+
+@celery_app.task(name="benchmark.collect")
+def collect(results: list):
+    return sum(results)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--ids", type=int, default=2000, help="IDs sintéticos distribuídos")
+    parser.add_argument("--chunk-size", type=int, default=50, help="IDs por tarefa")
+    parser.add_argument("--work-ms", type=float, default=1.0, help="Espera simulada por ID (ms)")
+    parser.add_argument("--broker", default="memory://")
+    parser.add_argument("--backend", default="cache+memory://")
+    args = parser.parse_args()
+
+    ranges = id_ranges(1, args.ids, args.chunk_size)
+    celery_app.conf.update(
+        broker_url=args.broker,
+        result_backend=args.backend,
+        task_always_eager=False,
+        broker_transport_options={"polling_interval": 0.01},
+    )
+    if args.broker.startswith("memory://"):
+        # O transporte em memória só busca novas mensagens a cada 2s quando o
+        # limite de prefetch é atingido: buscar todas de uma vez
+        celery_app.conf.worker_prefetch_multiplier = len(ranges) + 1
+
+    print(f"🧮 {args.ids} IDs em {len(ranges)} tarefas de {args.chunk_size} ({args.work_ms} ms por ID)")
+    print(f"{'workers':>8} {'tempo (s)':>10} {'tarefas/s':>10} {'IDs/s':>10} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        with start_worker(celery_app, pool="threads", concurrency=workers, perform_ping_check=False):
+            start = time.perf_counter()
+            total = fan_out(process_range, ranges, callback=collect.s(), work_ms=args.work_ms).get(
+                timeout=600, interval=0.01
+            )
+            elapsed = time.perf_counter() - start
+        assert total == args.ids
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>8} {elapsed:>10.2f} {len(ranges) / elapsed:>10.1f} "
+            f"{args.ids / elapsed:>10.0f} {baseline / elapsed:>7.2f}x"
+        )
+
+if __name__ == "__main__":
+    main()
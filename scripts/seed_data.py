@@ -11,9 +11,13 @@ from sqlalchemy.orm import Session
 # Adicionar o diretório backend ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
-from app.core.database import SessionLocal, engine, Base
+from alembic import command
+from alembic.config import Config
+
+from app.core.database import SessionLocal
 from app.models.team import Team
 from app.models.match import Match
+from app.services import team_form
 
 def create_sample_teams(db: Session):
     """Criar times de exemplo"""
@@ -152,15 +156,15 @@ def create_sample_teams(db: Session):
         }
     ]
     
-    created_teams = []
-    for team_data in teams_data:
-        # Verificar se o time já existe
-        existing_team = db.query(Team).filter(Team.name == team_data["name"]).first()
-        if not existing_team:
-            team = Team(**team_data)
-            db.add(team)
-            created_teams.append(team)
+    # Verificar de uma vez quais times já existem
+    names = [team_data["name"] for team_data in teams_data]
+    existing_names = {name for (name,) in db.query(Team.name).filter(Team.name.in_(names)).all()}
     
+    created_teams = [
+        Team(**team_data) for team_data in teams_data
+        if team_data["name"] not in existing_names
+    ]
+    db.add_all(created_teams)
     db.commit()
     
     # Refresh para obter IDs
@@ -264,8 +268,9 @@ def main():
     """Função principal"""
     print("🌱 Iniciando seed do banco de dados...")
     
-    # Criar tabelas
-    Base.metadata.create_all(bind=engine)
+    # Aplicar migrações (cria as tabelas e índices)
+    backend_dir = os.path.join(os.path.dirname(__file__), '..', 'backend')
+    command.upgrade(Config(os.path.join(backend_dir, 'alembic.ini')), "head")
     
     # Criar sessão
     db = SessionLocal()
@@ -275,6 +280,10 @@ def main():
         teams = create_sample_teams(db)
         matches = create_sample_matches(db)
         
+        # Forma pré-calculada dos times (/analysis/form)
+        team_form.refresh_team_form(db)
+        db.commit()
+        
         print("✅ Seed concluído com sucesso!")
         print(f"📊 Resumo:")
         print(f"   - Times criados: {len(teams)}")